@@ -8,7 +8,11 @@ Start: streamlit run app.py
 import streamlit as st
 from pathlib import Path
 import tempfile
+import hashlib
 import os
+import threading
+
+from src.telemetrie import telemetrie
 
 # Seitenkonfiguration
 st.set_page_config(
@@ -27,8 +31,551 @@ if "template_pfad" not in st.session_state:
     st.session_state.template_pfad = None
 if "generiertes_docx" not in st.session_state:
     st.session_state.generiertes_docx = None
+if "generierter_dateiname" not in st.session_state:
+    st.session_state.generierter_dateiname = None
+    # Artefakt-Cache-Schlüssel für das PDF zum aktuellen Dokument
+    st.session_state.pdf_schluessel = None
 if "generiertes_pdf" not in st.session_state:
     st.session_state.generiertes_pdf = None
+if "extraktionen" not in st.session_state:
+    # Text-Hash → extrahiertes Kandidatenprofil (wird pro Kandidat wiederverwendet)
+    st.session_state.extraktionen = {}
+if "letzter_lauf" not in st.session_state:
+    st.session_state.letzter_lauf = None
+if "projekt_zip" not in st.session_state:
+    st.session_state.projekt_zip = None
+    st.session_state.projekt_zip_name = None
+if "jobs" not in st.session_state:
+    # Job-IDs der Hintergrund-Aufträge dieser Sitzung (neueste zuerst)
+    st.session_state.jobs = []
+    st.session_state.jobs_uebernommen = set()
+if "letztes_tailoring" not in st.session_state:
+    st.session_state.letztes_tailoring = None
+if "template_upload_hash" not in st.session_state:
+    # (Dateiname, Inhalts-Hash) des zuletzt gespeicherten Uploads
+    st.session_state.template_upload_hash = None
+
+
+# ------------------------------------------------------------------
+# Geteilte Ressourcen (überleben Reruns und gelten für alle Sitzungen)
+# ------------------------------------------------------------------
+@st.cache_resource
+def _extraktions_cache():
+    from src.ai.extraktions_cache import ExtraktionsCache
+    return ExtraktionsCache()
+
+
+@st.cache_resource
+def _artefakt_cache():
+    from src.generator.artefakt_cache import ArtefaktCache
+    return ArtefaktCache()
+
+
+@st.cache_resource
+def _pdf_converter():
+    from src.generator.pdf_converter import PdfConverter
+    return PdfConverter(dauerbetrieb=True)
+
+
+@st.cache_resource
+def _upload_texte() -> dict:
+    """
+    Geparste Kandidatendateien: Inhalts-Hash → Text bzw. Seiten (begrenzt,
+    älteste fliegen). Mehrere Worker greifen zu, daher mit Lock.
+    """
+    return {"texte": {}, "lock": threading.Lock()}
+
+
+def _geteilte_ressourcen() -> dict:
+    """
+    Die geteilten Ressourcen für einen Hintergrund-Auftrag. Wird im
+    Skript-Thread aufgerufen: Worker-Threads haben keinen ScriptRunContext
+    und bekommen die Objekte deshalb als Argument.
+    """
+    return {
+        "extraktion": _extraktions_cache(),
+        "artefakte": _artefakt_cache(),
+        "uploads": _upload_texte(),
+    }
+
+
+def _speichere_template(name: str, inhalt: bytes) -> tuple[Path, str]:
+    """
+    Legt einen Upload unter templates/ ab — nur einmal pro Inhalt, nicht bei
+    jedem Rerun. Eine vorhandene Datei mit gleichem Inhalt bleibt unberührt.
+    Daneben entsteht der Template-Index, aus dem Analyse und Liste lesen.
+
+    Returns:
+        (Pfad, Inhalts-Hash)
+    """
+    from src.generator.template_index import erstelle_index, hole_index
+    ziel = Path("templates") / name
+    inhalt_hash = hashlib.sha256(inhalt).hexdigest()
+    if st.session_state.template_upload_hash != (name, inhalt_hash):
+        if ziel.exists() and hashlib.sha256(ziel.read_bytes()).hexdigest() == inhalt_hash:
+            hole_index(ziel)
+        else:
+            ziel.parent.mkdir(exist_ok=True)
+            ziel.write_bytes(inhalt)
+            # Metadaten einmal beim Speichern erzeugen (templates/<name>.meta.json)
+            erstelle_index(ziel)
+        st.session_state.template_upload_hash = (name, inhalt_hash)
+    return ziel, inhalt_hash
+
+
+def _neues_tailoring(cache=None):
+    """
+    ProfilTailoring, optional mit persistentem Extraktions-Cache (.cache/extraktion).
+    Der Anthropic-Client wird prozessweit geteilt (siehe tailoring.py).
+    """
+    from src.ai.tailoring import ProfilTailoring
+    return ProfilTailoring(cache=cache)
+
+
+def _extraktions_schluessel(tailoring, rohtext: str) -> str:
+    from src.ai.extraktions_cache import ExtraktionsCache
+    basis = f"{tailoring.modell}\n{ExtraktionsCache.normalisiere(rohtext)}"
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+
+def _hole_extraktion(tailoring, rohtext: str, extraktionen: dict):
+    """
+    Extrahiertes Profil pro Kandidat wiederverwenden:
+    Session (Kopie von st.session_state.extraktionen) → Festplatten-Cache → Claude.
+
+    Returns:
+        (Kandidatenprofil, Quelle) mit Quelle "Session", "Cache" oder "Claude"
+    """
+    profil = extraktionen.get(_extraktions_schluessel(tailoring, rohtext))
+    if profil is not None:
+        return profil, "Session"
+    profil, cache_treffer = tailoring.extrahiere_profil_mit_status(rohtext)
+    return profil, "Cache" if cache_treffer else "Claude"
+
+
+def _normalisiere_eingabe(seiten, hinweise: list[str]) -> str:
+    """Rohtext bzw. Seiten bereinigen (Kopf-/Fußzeilen, Duplikate), Ersparnis als Hinweis."""
+    from src.parser.normalisierung import normalisiere
+    text, bericht = normalisiere(seiten)
+    if bericht["tokens_gespart"] > 0:
+        hinweise.append(
+            f"Normalisierung: ~{bericht['tokens_gespart']} von {bericht['tokens_vorher']} "
+            "Eingabe-Tokens eingespart"
+        )
+    return text
+
+
+def _lies_upload(dateiname: str, inhalt: bytes, uploads: dict):
+    """
+    Text (DOCX) bzw. Seiten (PDF) einer hochgeladenen Kandidatendatei.
+    uploads ist der geteilte Cache aus _upload_texte() — dieselbe Datei wird
+    nur einmal geparst.
+    """
+    texte, lock = uploads["texte"], uploads["lock"]
+    schluessel = (Path(dateiname).suffix.lower(), hashlib.sha256(inhalt).hexdigest())
+    with lock:
+        if schluessel in texte:
+            return texte[schluessel]
+
+    with tempfile.NamedTemporaryFile(suffix=Path(dateiname).suffix, delete=False) as tmp:
+        tmp.write(inhalt)
+        tmp_pfad = tmp.name
+    try:
+        if dateiname.endswith(".docx"):
+            from src.parser.docx_parser import DocxParser
+            ergebnis = DocxParser(tmp_pfad).extrahiere_text()
+        else:
+            from src.parser.pdf_parser import PdfParser
+            ergebnis = PdfParser(tmp_pfad).extrahiere_seiten()
+    finally:
+        os.unlink(tmp_pfad)
+
+    with lock:
+        texte[schluessel] = ergebnis
+        while len(texte) > 32:
+            texte.pop(next(iter(texte)))
+    return ergebnis
+
+
+def _dokument_ergebnis(template_pfad: str, profil, artefakt_cache) -> dict:
+    """
+    Rendert das Profil im Speicher (DOCX-Bytes und Dateiname für die Übernahme).
+    Gleiches Template + gleiches Profil kommen aus dem Artefakt-Cache.
+    """
+    from src.generator.docx_generator import DocxGenerator
+    generator = DocxGenerator(template_pfad, artefakt_cache=artefakt_cache)
+    docx = generator.generiere_bytes(profil)
+    return {
+        "profil": profil,
+        "docx": docx,
+        "dateiname": generator.dateiname(profil),
+        "pdf_schluessel": generator.artefakt_schluessel(profil, "pdf"),
+        "warnungen": generator.warnungen,
+    }
+
+
+# ------------------------------------------------------------------
+# Hintergrund-Aufträge
+# Die _job_*-Funktionen laufen im Worker-Thread: kein Zugriff auf
+# st.session_state oder st.cache_resource, alles Nötige (auch die
+# geteilten Ressourcen) kommt als Argument, das Ergebnis
+# übernimmt _uebernehme_ergebnis() im Skript-Thread.
+# ------------------------------------------------------------------
+@st.cache_resource
+def _job_queue():
+    """Prozessweite Warteschlange — überlebt Reruns, Aufträge laufen weiter."""
+    from src.pipeline.jobs import JobQueue
+    return JobQueue(max_worker=4)
+
+
+def _reiche_ein(name: str, funktion, *args, **kwargs) -> None:
+    """Auftrag einreichen, der Sitzung zuordnen und die Seite neu aufbauen."""
+    st.session_state.jobs.insert(0, _job_queue().einreichen(name, funktion, *args, **kwargs))
+    st.rerun()
+
+
+def _job_transfer(
+    job, ressourcen: dict, template_pfad: str, extraktionen: dict, profil_text=None, datei=None
+) -> dict:
+    """1:1 Transfer: (Datei lesen →) Normalisieren → Extraktion → Rendern."""
+    hinweise = []
+    if datei is not None:
+        job.melde(0.05, "Lese Datei...")
+        seiten = _lies_upload(*datei, ressourcen["uploads"])
+    else:
+        seiten = profil_text
+    rohtext = _normalisiere_eingabe(seiten, hinweise)
+
+    tailoring = _neues_tailoring(ressourcen["extraktion"])
+    schluessel = _extraktions_schluessel(tailoring, rohtext)
+    profil = extraktionen.get(schluessel)
+    if profil is None:
+        job.melde(0.15, "Claude extrahiert Profildaten...")
+        for profil in tailoring.extrahiere_profil_stream(rohtext):
+            job.melde(vorschau=profil)
+
+    job.melde(0.9, "Rendere Dokument...")
+    return {
+        **_dokument_ergebnis(template_pfad, profil, ressourcen["artefakte"]),
+        "extraktion": (schluessel, profil),
+        "hinweise": hinweise,
+        "erfolg": "Profil erfolgreich generiert!",
+    }
+
+
+def _job_tailoring(
+    job, ressourcen: dict, template_pfad: str, extraktionen: dict, profil_text: str, anforderungen,
+    persistent: bool, kombiniert: bool, modus: str,
+) -> dict:
+    """Projekt-Tailoring (modus: "voll", "patch" oder "schnell") und Rendern."""
+    hinweise = []
+    tailoring = _neues_tailoring(ressourcen["extraktion"] if persistent else None)
+    rohtext = _normalisiere_eingabe(profil_text, hinweise)
+    schluessel = _extraktions_schluessel(tailoring, rohtext)
+
+    if kombiniert and modus == "voll" and schluessel not in extraktionen:
+        job.melde(0.1, "Claude extrahiert und schneidet zu...")
+        # Festplatten-Cache prüft extrahiere_und_tailore_stream selbst
+        for profil_tailored in tailoring.extrahiere_und_tailore_stream(rohtext, anforderungen):
+            job.melde(vorschau=profil_tailored)
+        profil = tailoring.letzte_extraktion
+        hinweise.append("Extraktion und Tailoring in einer Anfrage (Extraktion wird wiederverwendet)")
+    else:
+        job.melde(0.1, "Extraktion...")
+        profil, quelle = _hole_extraktion(tailoring, rohtext, extraktionen)
+        if quelle == "Claude":
+            hinweise.append("Extraktion: neu durch Claude (wird für weitere Projekte wiederverwendet)")
+        else:
+            hinweise.append(f"Extraktion: Cache-Treffer ({quelle}) — nur ein Claude-Aufruf für das Tailoring")
+
+        job.melde(0.4, "Schneide Profil zu...")
+        if modus == "schnell":
+            from src.matching.skill_matcher import SkillMatcher
+            profil_tailored = SkillMatcher().schnell_zuschneiden(profil, anforderungen)
+        elif modus == "patch":
+            profil_tailored = tailoring.tailore_profil_patch(profil, anforderungen)
+        else:
+            for profil_tailored in tailoring.tailore_profil_stream(profil, anforderungen):
+                job.melde(vorschau=profil_tailored)
+
+    job.melde(0.9, "Rendere Dokument...")
+    return {
+        **_dokument_ergebnis(template_pfad, profil_tailored, ressourcen["artefakte"]),
+        "extraktion": (schluessel, profil),
+        "original": profil,
+        "anforderungen": anforderungen,
+        "nutzung": tailoring.nutzung(),
+        "hinweise": hinweise,
+        "erfolg": "Profil erfolgreich auf das Projekt zugeschnitten!",
+    }
+
+
+def _job_projekte(
+    job, ressourcen: dict, template_pfad: str, extraktionen: dict, profil_text: str,
+    abschnitte: list[str], patch: bool, mit_pdf: bool,
+) -> dict:
+    """Ein Kandidat, mehrere Projekte → ZIP."""
+    from src.models.profile import ProjektAnforderungen
+    from src.pipeline.projekte import ProjektFanout
+
+    hinweise = []
+    tailoring = _neues_tailoring(ressourcen["extraktion"])
+    rohtext = _normalisiere_eingabe(profil_text, hinweise)
+    job.melde(0.1, "Extraktion...")
+    profil, quelle = _hole_extraktion(tailoring, rohtext, extraktionen)
+
+    projekte = []
+    for abschnitt in abschnitte:
+        titel = abschnitt.strip("-").strip().partition("\n")[0].strip()
+        projekte.append(ProjektAnforderungen(titel=titel, rohe_ausschreibung=abschnitt))
+
+    job.melde(0.3, f"Claude schneidet das Profil auf {len(projekte)} Projekte zu...")
+    fanout = ProjektFanout(template_pfad, tailoring=tailoring, patch=patch, mit_pdf=mit_pdf)
+    zip_bytes, bericht = fanout.erstelle_zip(profil, projekte)
+
+    nutzung = bericht["nutzung"]
+    hinweise.append(
+        f"Extraktion: {quelle} · Tokens: {nutzung['input_tokens']} Eingabe, "
+        f"{nutzung['output_tokens']} Ausgabe, "
+        f"{nutzung['cache_read_input_tokens']} aus dem Prompt-Cache"
+    )
+    return {
+        "zip": zip_bytes,
+        "zip_name": f"{profil.vollname().replace(' ', '_') or 'profil'}_projekte.zip",
+        "extraktion": (_extraktions_schluessel(tailoring, rohtext), profil),
+        "hinweise": hinweise,
+        "warnungen": [f"{name}: {meldung}" for name, meldung in bericht["fehler"].items()],
+        "erfolg": f"{bericht['erfolgreich']} von {bericht['projekte']} Dokumenten erstellt.",
+    }
+
+
+def _job_pdf(job, converter, cache, schluessel: str | None, docx_bytes: bytes, dateiname: str) -> dict:
+    pdf = cache.hole(schluessel) if schluessel else None
+    if pdf is None:
+        job.melde(0.1, "Konvertiere zu PDF...")
+        pdf = converter.konvertiere_bytes(docx_bytes, dateiname)
+        if schluessel:
+            cache.lege_ab(schluessel, pdf)
+    return {
+        "pdf": pdf,
+        "pdf_fuer": hashlib.sha256(docx_bytes).hexdigest(),
+        "erfolg": "PDF erstellt!",
+    }
+
+
+def _uebernehme_ergebnis(job) -> None:
+    """Ergebnis eines fertigen Auftrags in den Session State übernehmen (einmalig)."""
+    ergebnis = job.ergebnis
+    st.session_state.letzter_lauf = job.id
+    if "extraktion" in ergebnis:
+        schluessel, profil = ergebnis["extraktion"]
+        st.session_state.extraktionen[schluessel] = profil
+    if "docx" in ergebnis:
+        st.session_state.profil = ergebnis["profil"]
+        st.session_state.generiertes_docx = ergebnis["docx"]
+        st.session_state.generierter_dateiname = ergebnis["dateiname"]
+        st.session_state.pdf_schluessel = ergebnis.get("pdf_schluessel")
+        st.session_state.generiertes_pdf = None
+        st.session_state.letztes_tailoring = ergebnis if "anforderungen" in ergebnis else None
+    if "zip" in ergebnis:
+        st.session_state.projekt_zip = ergebnis["zip"]
+        st.session_state.projekt_zip_name = ergebnis["zip_name"]
+    if "pdf" in ergebnis:
+        aktuell = st.session_state.generiertes_docx
+        # Nur übernehmen, wenn inzwischen kein anderes Dokument generiert wurde
+        if aktuell and hashlib.sha256(aktuell).hexdigest() == ergebnis["pdf_fuer"]:
+            st.session_state.generiertes_pdf = ergebnis["pdf"]
+
+
+def _zeige_job_download(job):
+    """Download direkt am Auftrag — auch wenn inzwischen ein anderes Ergebnis aktiv ist."""
+    ergebnis = job.ergebnis
+    if "docx" in ergebnis:
+        st.download_button(
+            "DOCX herunterladen",
+            data=ergebnis["docx"],
+            file_name=ergebnis["dateiname"],
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            key=f"job_docx_{job.id}",
+        )
+    elif "zip" in ergebnis:
+        st.download_button(
+            "ZIP herunterladen",
+            data=ergebnis["zip"],
+            file_name=ergebnis["zip_name"],
+            mime="application/zip",
+            key=f"job_zip_{job.id}",
+        )
+
+
+def _zeige_auftraege():
+    """Aufträge dieser Sitzung; fragt alle 2 s ab, solange einer läuft."""
+    laufend = any(not j.abgeschlossen for j in _job_queue().jobs(st.session_state.jobs))
+    st.fragment(_auftrags_liste, run_every=2 if laufend else None)()
+
+
+def _auftrags_liste():
+    from src.pipeline.jobs import ABGEBROCHEN, FEHLER, FERTIG, LAEUFT, WARTEND
+
+    queue = _job_queue()
+    jobs = queue.jobs(st.session_state.jobs)
+    if not jobs:
+        return
+    # Nicht mehr vorhandene Aufträge (z.B. nach Neustart) vergessen
+    st.session_state.jobs = [j.id for j in jobs]
+
+    neu_uebernommen = False
+    laufend = sum(not j.abgeschlossen for j in jobs)
+    with st.expander(f"Aufträge ({laufend} laufend)" if laufend else "Aufträge", expanded=bool(laufend)):
+        for job in jobs:
+            if job.status == LAEUFT:
+                st.progress(job.fortschritt, text=f"{job.name} — {job.meldung or 'läuft...'}")
+                if job.vorschau is not None:
+                    _zeige_teilprofil(st.empty(), job.vorschau)
+                continue
+            if job.status == WARTEND:
+                col_text, col_btn = st.columns([4, 1])
+                col_text.caption(f"{job.name} — wartet")
+                if col_btn.button("Abbrechen", key=f"job_abbrechen_{job.id}"):
+                    queue.abbrechen(job.id)
+                    st.rerun()
+                continue
+
+            col_text, col_btn = st.columns([4, 1])
+            with col_text:
+                if job.status == FERTIG:
+                    st.success(f"{job.name} — {job.ergebnis.get('erfolg', 'fertig')} ({job.dauer_s:.1f} s)")
+                    for hinweis in job.ergebnis.get("hinweise", []):
+                        st.caption(hinweis)
+                    for warnung in job.ergebnis.get("warnungen", []):
+                        st.warning(warnung)
+                    _zeige_job_download(job)
+                elif job.status == FEHLER:
+                    st.error(f"{job.name} — Fehler: {job.fehler}")
+                elif job.status == ABGEBROCHEN:
+                    st.caption(f"{job.name} — abgebrochen")
+            if col_btn.button("Entfernen", key=f"job_entfernen_{job.id}"):
+                queue.entferne(job.id)
+                st.session_state.jobs.remove(job.id)
+                st.rerun()
+
+            if job.status == FERTIG and job.id not in st.session_state.jobs_uebernommen:
+                st.session_state.jobs_uebernommen.add(job.id)
+                _uebernehme_ergebnis(job)
+                neu_uebernommen = True
+
+    if neu_uebernommen:
+        # Download-Bereiche der Tabs zeigen das neue Ergebnis
+        st.rerun()
+
+
+def _zeige_teilprofil(platzhalter, profil):
+    """Live-Vorschau eines (teilweise) extrahierten Profils während des Streamings."""
+    zeilen = []
+    if profil.vollname():
+        zeilen.append(f"**Name:** {profil.vollname()}")
+    if profil.titel:
+        zeilen.append(f"**Titel:** {profil.titel}")
+    if profil.kernkompetenzen:
+        zeilen.append(f"**Kernkompetenzen:** {', '.join(profil.kernkompetenzen)}")
+    if profil.zusammenfassung:
+        zeilen.append(f"**Zusammenfassung:** {profil.zusammenfassung}")
+    if profil.berufserfahrung:
+        zeilen.append(f"**Berufserfahrung:** {len(profil.berufserfahrung)} Einträge")
+    platzhalter.markdown("  \n".join(zeilen))
+
+
+def _zeige_abdeckung(profil, anforderungen):
+    """Abdeckung pro gefordertem Skill (lokaler SkillMatcher, ohne API-Aufruf)."""
+    from src.matching.skill_matcher import SkillMatcher
+    abdeckung = SkillMatcher().abdeckung(profil, anforderungen)
+    if not abdeckung["skills"]:
+        return
+    with st.expander(f"Skill-Abdeckung: {abdeckung['gesamt']:.0%}", expanded=True):
+        st.dataframe(
+            [
+                {
+                    "Skill": s["skill"],
+                    "Gewicht": s["gewicht"],
+                    "Abdeckung": f"{s['abdeckung']:.0%}",
+                    "Belegt in": ", ".join(s["fundstellen"]) or "—",
+                }
+                for s in abdeckung["skills"]
+            ],
+            use_container_width=True,
+        )
+
+
+def _zeige_zeitmessung(bereich: str):
+    """Stufen des letzten Laufs (Dauer, Tokens, Größen) als Tabelle."""
+    if not st.session_state.zeitmessung or not st.session_state.letzter_lauf:
+        return
+    eintraege = telemetrie.eintraege(st.session_state.letzter_lauf)
+    if not eintraege:
+        return
+    with st.expander("Zeitmessung des letzten Laufs"):
+        st.dataframe(
+            [{k: v for k, v in e.items() if k not in ("lauf", "zeitpunkt")} for e in eintraege],
+            use_container_width=True,
+        )
+        st.caption(f"Gesamt: {sum(e['dauer_s'] for e in eintraege):.2f} s")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "Lauf als JSONL",
+                data=telemetrie.als_jsonl(st.session_state.letzter_lauf),
+                file_name=f"lauf_{st.session_state.letzter_lauf}.jsonl",
+                mime="application/x-ndjson",
+                key=f"{bereich}_telemetrie_jsonl",
+            )
+        with col2:
+            st.download_button(
+                "Metriken (Prometheus)",
+                data=telemetrie.als_prometheus(),
+                file_name="profil_metriken.prom",
+                mime="text/plain",
+                key=f"{bereich}_telemetrie_prometheus",
+            )
+
+
+def _zeige_download_bereich(bereich: str):
+    """Zeigt DOCX und PDF Download-Buttons an (bereich: Key-Präfix je Tab)."""
+    st.markdown("---")
+    st.subheader("Dokument herunterladen")
+
+    docx_name = Path(st.session_state.generierter_dateiname)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.download_button(
+            label="DOCX herunterladen",
+            data=st.session_state.generiertes_docx,
+            file_name=docx_name.name,
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            key=f"{bereich}_docx_download",
+        )
+
+    with col2:
+        if st.button("PDF generieren", key=f"{bereich}_pdf_generieren"):
+            _reiche_ein(
+                f"PDF: {docx_name.name}",
+                _job_pdf,
+                _pdf_converter(),
+                _artefakt_cache(),
+                st.session_state.pdf_schluessel,
+                st.session_state.generiertes_docx,
+                docx_name.name,
+            )
+
+    if st.session_state.generiertes_pdf:
+        st.download_button(
+            label="PDF herunterladen",
+            data=st.session_state.generiertes_pdf,
+            file_name=docx_name.with_suffix(".pdf").name,
+            mime="application/pdf",
+            key=f"{bereich}_pdf_download",
+        )
 
 
 # ------------------------------------------------------------------
@@ -45,6 +592,11 @@ seite = st.sidebar.radio(
 
 st.sidebar.markdown("---")
 
+# Pro Sitzung (und deren Aufträge); Startwert aus PROFIL_TELEMETRIE
+telemetrie.aktiviere_im_kontext(
+    st.sidebar.checkbox("Zeitmessung anzeigen", value=telemetrie.standard_aktiv, key="zeitmessung")
+)
+
 # Aktives Template anzeigen
 if st.session_state.template_pfad:
     st.sidebar.success(f"Template aktiv:\n`{Path(st.session_state.template_pfad).name}`")
@@ -79,31 +631,37 @@ if seite == "Template verwalten":
         )
 
         if template_datei:
-            # Template speichern
-            template_ordner = Path("templates")
-            template_ordner.mkdir(exist_ok=True)
-            template_ziel = template_ordner / template_datei.name
-
-            with open(template_ziel, "wb") as f:
-                f.write(template_datei.getbuffer())
+            # Template speichern (nur einmal pro Inhalt)
+            template_ziel, _ = _speichere_template(template_datei.name, template_datei.getvalue())
 
             st.session_state.template_pfad = str(template_ziel)
             st.success(f"Template gespeichert: `{template_datei.name}`")
 
-            # Analyse anzeigen
+            # Analyse anzeigen (aus dem Template-Index, ohne die DOCX zu öffnen)
             with st.expander("Template-Analyse anzeigen", expanded=True):
                 try:
-                    from src.parser.docx_parser import DocxParser
-                    parser = DocxParser(template_ziel)
+                    from src.generator.docx_generator import DocxGenerator
+                    generator = DocxGenerator(template_ziel)
+                    analyse = generator.metadaten
 
                     st.markdown("**Dokument-Struktur:**")
-                    struktur = parser.extrahiere_struktur()
-                    for abschnitt, inhalt in struktur.items():
-                        if abschnitt != "_header":
-                            st.markdown(f"- **{abschnitt}** ({len(inhalt)} Einträge)")
+                    for abschnitt, anzahl in analyse["struktur"].items():
+                        st.markdown(f"- **{abschnitt}** ({anzahl} Einträge)")
+
+                    st.markdown("**Platzhalter:**")
+                    if analyse["platzhalter"]:
+                        st.markdown(", ".join(f"`{name}`" for name in analyse["platzhalter"]))
+                        for schleife in analyse["schleifen"]:
+                            felder = ", ".join(schleife["felder"]) or "–"
+                            st.caption(f"Schleife `{schleife['variable']}` über `{schleife['liste']}`: {felder}")
+                    else:
+                        st.caption("Noch keine Jinja2-Platzhalter im Template.")
+                    for problem in generator.validiere():
+                        st.warning(problem)
 
                     st.markdown("**Style-Informationen:**")
-                    styles = parser.extrahiere_style_info()
+                    styles = analyse["styles"]
+                    seitenraender = analyse["seitenraender"]
                     col_a, col_b = st.columns(2)
                     with col_a:
                         st.metric("Tabellen im Dokument", styles["anzahl_tabellen"])
@@ -111,15 +669,15 @@ if seite == "Template verwalten":
                     with col_b:
                         if styles["schriftarten"]:
                             st.markdown(f"**Schriftart(en):** {', '.join(styles['schriftarten'])}")
-                        if styles["seitenraender"]["links_cm"]:
+                        if seitenraender["links_cm"]:
                             st.markdown(
-                                f"**Seitenränder:** L {styles['seitenraender']['links_cm']} cm | "
-                                f"R {styles['seitenraender']['rechts_cm']} cm"
+                                f"**Seitenränder:** L {seitenraender['links_cm']} cm | "
+                                f"R {seitenraender['rechts_cm']} cm"
                             )
 
                     st.markdown("**Extrahierter Text (Vorschau):**")
-                    rohtext = parser.extrahiere_text()
-                    st.text_area("Rohtext", rohtext[:1500] + "..." if len(rohtext) > 1500 else rohtext, height=200)
+                    vorschau = analyse["vorschau"]
+                    st.text_area("Rohtext", vorschau + "..." if analyse["zeichen"] > len(vorschau) else vorschau, height=200)
 
                 except Exception as e:
                     st.error(f"Fehler bei der Template-Analyse: {e}")
@@ -130,11 +688,22 @@ if seite == "Template verwalten":
         if template_ordner.exists():
             templates = list(template_ordner.glob("*.docx"))
             if templates:
+                from src.generator.template_index import hole_index
                 for t in templates:
                     col_name, col_btn = st.columns([3, 1])
                     with col_name:
                         aktiv = "✅ " if str(t) == st.session_state.template_pfad else ""
                         st.markdown(f"{aktiv}`{t.name}`")
+                        # Metadaten aus <name>.meta.json (nur bei fehlendem/veraltetem Index wird die DOCX gelesen)
+                        try:
+                            index = hole_index(t)
+                            st.caption(
+                                f"{len(index['platzhalter'])} Platzhalter · "
+                                f"{index['styles']['anzahl_tabellen']} Tabellen · "
+                                f"{index['inhalt_hash'][:8]}"
+                            )
+                        except Exception as e:
+                            st.caption(f"Index nicht lesbar: {e}")
                     with col_btn:
                         if st.button("Laden", key=f"load_{t.name}"):
                             st.session_state.template_pfad = str(t)
@@ -153,8 +722,11 @@ elif seite == "Profil erstellen":
         st.error("Bitte zuerst ein Template unter **Template verwalten** hochladen.")
         st.stop()
 
+    # Laufende und fertige Hintergrund-Aufträge dieser Sitzung
+    _zeige_auftraege()
+
     # Tabs: Modus auswählen
-    tab1, tab2 = st.tabs(["1:1 Transfer", "Projekt-Tailoring"])
+    tab1, tab2, tab3 = st.tabs(["1:1 Transfer", "Projekt-Tailoring", "Mehrere Projekte"])
 
     # ----------------------------------------------------------------
     # TAB 1: 1:1 Transfer
@@ -177,24 +749,14 @@ elif seite == "Profil erstellen":
             )
 
             if st.button("Profil extrahieren und generieren", type="primary", disabled=not profil_text):
-                with st.spinner("Claude extrahiert Profildaten..."):
-                    try:
-                        from src.ai.tailoring import ProfilTailoring
-                        from src.generator.docx_generator import DocxGenerator
-                        from src.generator.pdf_converter import PdfConverter
-
-                        tailoring = ProfilTailoring()
-                        profil = tailoring.extrahiere_profil(profil_text)
-                        st.session_state.profil = profil
-
-                        generator = DocxGenerator(st.session_state.template_pfad)
-                        docx_pfad = generator.generiere(profil)
-                        st.session_state.generiertes_docx = docx_pfad
-
-                        st.success("Profil erfolgreich generiert!")
-
-                    except Exception as e:
-                        st.error(f"Fehler: {e}")
+                _reiche_ein(
+                    "1:1 Transfer (Text)",
+                    _job_transfer,
+                    _geteilte_ressourcen(),
+                    st.session_state.template_pfad,
+                    dict(st.session_state.extraktionen),
+                    profil_text=profil_text,
+                )
 
         elif eingabe_methode == "DOCX/PDF hochladen":
             kandidaten_datei = st.file_uploader(
@@ -204,46 +766,22 @@ elif seite == "Profil erstellen":
             )
 
             if kandidaten_datei and st.button("Profil übertragen", type="primary"):
-                with st.spinner("Profil wird verarbeitet..."):
-                    try:
-                        with tempfile.NamedTemporaryFile(
-                            suffix=Path(kandidaten_datei.name).suffix, delete=False
-                        ) as tmp:
-                            tmp.write(kandidaten_datei.getbuffer())
-                            tmp_pfad = tmp.name
-
-                        if kandidaten_datei.name.endswith(".docx"):
-                            from src.parser.docx_parser import DocxParser
-                            parser = DocxParser(tmp_pfad)
-                        else:
-                            from src.parser.pdf_parser import PdfParser
-                            parser = PdfParser(tmp_pfad)
-
-                        rohtext = parser.extrahiere_text()
-                        os.unlink(tmp_pfad)
-
-                        from src.ai.tailoring import ProfilTailoring
-                        from src.generator.docx_generator import DocxGenerator
-
-                        tailoring = ProfilTailoring()
-                        profil = tailoring.extrahiere_profil(rohtext)
-                        st.session_state.profil = profil
-
-                        generator = DocxGenerator(st.session_state.template_pfad)
-                        docx_pfad = generator.generiere(profil)
-                        st.session_state.generiertes_docx = docx_pfad
-
-                        st.success("Profil erfolgreich übertragen!")
-
-                    except Exception as e:
-                        st.error(f"Fehler: {e}")
+                _reiche_ein(
+                    f"1:1 Transfer: {kandidaten_datei.name}",
+                    _job_transfer,
+                    _geteilte_ressourcen(),
+                    st.session_state.template_pfad,
+                    dict(st.session_state.extraktionen),
+                    datei=(kandidaten_datei.name, kandidaten_datei.getvalue()),
+                )
 
         elif eingabe_methode == "Formular ausfüllen":
             st.info("Formular-Eingabe wird nach der Template-Analyse finalisiert.")
 
         # Download-Bereich
         if st.session_state.generiertes_docx:
-            _zeige_download_bereich()
+            _zeige_download_bereich("transfer")
+        _zeige_zeitmessung("transfer")
 
     # ----------------------------------------------------------------
     # TAB 2: Projekt-Tailoring
@@ -275,48 +813,147 @@ elif seite == "Profil erstellen":
                 key="projekt_tailoring",
                 placeholder="Vollständige Projektbeschreibung einfügen...",
             )
+            pflicht_text = st.text_input(
+                "Pflicht-Skills (kommagetrennt, optional)",
+                help="Ohne Angabe werden die Skills des Kandidaten gesucht, die in der Ausschreibung vorkommen.",
+            )
+            wunsch_text = st.text_input("Wunsch-Skills (kommagetrennt, optional)")
+
+        extraktion_persistent = st.checkbox(
+            "Extrahierte Profile auf der Festplatte cachen",
+            value=True,
+            help="Die Extraktion wird pro Kandidat (Text-Hash) wiederverwendet. "
+                 "Ohne Festplatten-Cache gilt das nur für diese Sitzung.",
+        )
+        kombiniert = st.checkbox(
+            "Extraktion und Tailoring in einer Anfrage",
+            value=False,
+            help="Spart einen Claude-Aufruf, wenn der Kandidat noch nicht extrahiert wurde. "
+                 "Claude schreibt dabei beide Profile aus (etwa doppelte Ausgabe), die "
+                 "Generierung dauert also nicht kürzer. Das extrahierte Profil wird "
+                 "trotzdem für weitere Projekte gemerkt.",
+        )
+        tailoring_modus = st.radio(
+            "Tailoring-Modus",
+            ["Vollständig", "Nur Änderungen (schneller)", "Sofort ohne Claude (nur sortieren)"],
+            horizontal=True,
+            help="'Nur Änderungen': Claude liefert Reihenfolge, Zusammenfassung und geänderte "
+                 "Highlights, alles andere bleibt unverändert. 'Sofort': lokale Sortierung nach "
+                 "Skill-Relevanz ohne API-Aufruf (Texte bleiben wie extrahiert).",
+        )
+        if tailoring_modus.startswith("Nur"):
+            modus = "patch"
+        elif tailoring_modus.startswith("Sofort"):
+            modus = "schnell"
+        else:
+            modus = "voll"
 
         if st.button(
             "Profil zuschneiden und generieren",
             type="primary",
             disabled=not (profil_text_t and projekt_text),
         ):
-            with st.spinner("Claude analysiert und schneidet das Profil zu..."):
-                try:
-                    from src.ai.tailoring import ProfilTailoring
-                    from src.models.profile import ProjektAnforderungen
-                    from src.generator.docx_generator import DocxGenerator
+            from src.models.profile import ProjektAnforderungen
 
-                    tailoring = ProfilTailoring()
-                    profil = tailoring.extrahiere_profil(profil_text_t)
+            anforderungen = ProjektAnforderungen(
+                titel=projekt_titel,
+                rohe_ausschreibung=projekt_text,
+                pflicht_skills=[s.strip() for s in pflicht_text.split(",") if s.strip()],
+                wunsch_skills=[s.strip() for s in wunsch_text.split(",") if s.strip()],
+            )
+            _reiche_ein(
+                f"Tailoring: {projekt_titel or 'Projekt'}",
+                _job_tailoring,
+                _geteilte_ressourcen(),
+                st.session_state.template_pfad,
+                dict(st.session_state.extraktionen),
+                profil_text_t,
+                anforderungen,
+                persistent=extraktion_persistent,
+                kombiniert=kombiniert,
+                modus=modus,
+            )
 
-                    anforderungen = ProjektAnforderungen(
-                        titel=projekt_titel,
-                        rohe_ausschreibung=projekt_text,
-                    )
+        letztes = st.session_state.letztes_tailoring
+        if letztes:
+            profil_tailored = letztes["profil"]
+            nutzung = letztes["nutzung"]
+            st.caption(
+                f"Tokens: {nutzung['input_tokens']} Eingabe, {nutzung['output_tokens']} Ausgabe, "
+                f"{nutzung['cache_read_input_tokens']} aus dem Prompt-Cache gelesen, "
+                f"{nutzung['cache_creation_input_tokens']} in den Cache geschrieben"
+            )
 
-                    profil_tailored = tailoring.tailore_profil(profil, anforderungen)
-                    st.session_state.profil = profil_tailored
+            # Änderungen anzeigen
+            with st.expander("Was wurde angepasst?"):
+                st.markdown(f"**Profil-Version:** {profil_tailored.version}")
+                st.markdown(f"**Modus:** {profil_tailored.modus}")
+                if profil_tailored.zusammenfassung:
+                    st.markdown("**Angepasste Zusammenfassung:**")
+                    st.info(profil_tailored.zusammenfassung)
 
-                    generator = DocxGenerator(st.session_state.template_pfad)
-                    docx_pfad = generator.generiere(profil_tailored)
-                    st.session_state.generiertes_docx = docx_pfad
+            _zeige_abdeckung(letztes["original"], letztes["anforderungen"])
 
-                    st.success("Profil erfolgreich auf das Projekt zugeschnitten!")
+        if st.session_state.generiertes_docx:
+            _zeige_download_bereich("tailoring")
+        _zeige_zeitmessung("tailoring")
 
-                    # Änderungen anzeigen
-                    with st.expander("Was wurde angepasst?"):
-                        st.markdown(f"**Profil-Version:** {profil_tailored.version}")
-                        st.markdown(f"**Modus:** {profil_tailored.modus}")
-                        if profil_tailored.zusammenfassung:
-                            st.markdown("**Angepasste Zusammenfassung:**")
-                            st.info(profil_tailored.zusammenfassung)
+    # ----------------------------------------------------------------
+    # TAB 3: Mehrere Projekte (ein Kandidat → viele Projekte → ZIP)
+    # ----------------------------------------------------------------
+    with tab3:
+        st.subheader("Mehrere Projekte")
+        st.markdown(
+            "Ein Kandidat, mehrere Projekte: Claude schneidet das Profil parallel "
+            "auf jedes Projekt zu, alle Dokumente kommen als ein ZIP."
+        )
 
-                except Exception as e:
-                    st.error(f"Fehler: {e}")
+        profil_text_m = st.text_area(
+            "Profiltext",
+            height=200,
+            key="profil_mehrfach",
+            placeholder="Vollständigen Profiltext einfügen...",
+        )
+        projekte_text = st.text_area(
+            "Projektbeschreibungen — getrennt durch eine Zeile mit ---",
+            height=300,
+            key="projekte_mehrfach",
+            placeholder="Senior Java Developer bei Kunde XY\nBeschreibung...\n---\nCloud Architect bei Kunde Z\nBeschreibung...",
+            help="Die erste Zeile jedes Abschnitts ist der Projekttitel.",
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            patch_mehrfach = st.checkbox("Nur Änderungen generieren (schneller)", key="patch_mehrfach")
+        with col2:
+            pdf_mehrfach = st.checkbox("PDFs beilegen", key="pdf_mehrfach")
 
-        if st.session_state.generiertes_docx:
-            _zeige_download_bereich()
+        abschnitte = [a.strip() for a in projekte_text.split("\n---") if a.strip().strip("-")]
+        if st.button(
+            f"Für {len(abschnitte)} Projekte generieren",
+            type="primary",
+            disabled=not (profil_text_m and abschnitte),
+        ):
+            _reiche_ein(
+                f"{len(abschnitte)} Projekte",
+                _job_projekte,
+                _geteilte_ressourcen(),
+                st.session_state.template_pfad,
+                dict(st.session_state.extraktionen),
+                profil_text_m,
+                abschnitte,
+                patch=patch_mehrfach,
+                mit_pdf=pdf_mehrfach,
+            )
+
+        if st.session_state.projekt_zip:
+            st.download_button(
+                "ZIP herunterladen",
+                data=st.session_state.projekt_zip,
+                file_name=st.session_state.projekt_zip_name,
+                mime="application/zip",
+                key="projekte_zip_download",
+            )
+        _zeige_zeitmessung("projekte")
 
 
 # ==================================================================
@@ -339,6 +976,10 @@ elif seite == "Uber das Tool":
     **Wichtig:** Es werden keine Fakten erfunden — nur vorhandene Informationen
     werden neu gewichtet und formuliert.
 
+    ### Mehrere Projekte
+    Ein Kandidat wird parallel auf mehrere Projekte zugeschnitten. Alle Dokumente
+    (optional mit PDF) werden gesammelt als ZIP heruntergeladen.
+
     ---
 
     ## Setup
@@ -355,49 +996,3 @@ elif seite == "Uber das Tool":
     - **LibreOffice / docx2pdf** — PDF-Export
     - **Claude API (Anthropic)** — AI Tailoring
     """)
-
-
-# ==================================================================
-# Hilfsfunktionen
-# ==================================================================
-def _zeige_download_bereich():
-    """Zeigt DOCX und PDF Download-Buttons an."""
-    st.markdown("---")
-    st.subheader("Dokument herunterladen")
-
-    docx_pfad = Path(st.session_state.generiertes_docx)
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        if docx_pfad.exists():
-            with open(docx_pfad, "rb") as f:
-                st.download_button(
-                    label="DOCX herunterladen",
-                    data=f.read(),
-                    file_name=docx_pfad.name,
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                )
-
-    with col2:
-        if st.button("PDF generieren"):
-            with st.spinner("Konvertiere zu PDF..."):
-                try:
-                    from src.generator.pdf_converter import PdfConverter
-                    converter = PdfConverter()
-                    pdf_pfad = converter.konvertiere(docx_pfad)
-                    st.session_state.generiertes_pdf = pdf_pfad
-                    st.success("PDF erstellt!")
-                except RuntimeError as e:
-                    st.error(str(e))
-
-    if st.session_state.generiertes_pdf:
-        pdf_pfad = Path(st.session_state.generiertes_pdf)
-        if pdf_pfad.exists():
-            with open(pdf_pfad, "rb") as f:
-                st.download_button(
-                    label="PDF herunterladen",
-                    data=f.read(),
-                    file_name=pdf_pfad.name,
-                    mime="application/pdf",
-                )
@@ -0,0 +1,85 @@
+"""
+Profil-Dokument-Generator — Batch-Modus (ohne UI)
+
+Konvertiert alle DOCX/PDF-Kandidatenprofile eines Ordners in das Template-Layout.
+Abgebrochene Läufe können einfach neu gestartet werden; fertige Dateien
+werden übersprungen.
+
+Start: python batch.py <eingabe_ordner> --template templates/vorlage.docx
+"""
+
+from pathlib import Path
+import argparse
+import json
+
+from dotenv import load_dotenv
+
+
+def _melde_datei(eingabe: Path, docx_pfad: Path | None, fehler: str | None) -> None:
+    if fehler:
+        print(f"FEHLER {eingabe.name}: {fehler}", flush=True)
+    else:
+        print(f"OK     {eingabe.name} → {docx_pfad.name}", flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Kandidatenprofile im Batch konvertieren")
+    parser.add_argument("eingabe_ordner", help="Ordner mit DOCX/PDF-Profilen")
+    parser.add_argument("--template", required=True, help="DOCX-Template")
+    parser.add_argument("--ausgabe", default="output/batch", help="Zielordner (Standard: output/batch)")
+    parser.add_argument("--prozesse", type=int, default=None, help="Prozesse für Parsen/Rendern (Standard: CPUs)")
+    parser.add_argument("--parallel", type=int, default=5, help="Gleichzeitige Claude-Anfragen (Standard: 5)")
+    parser.add_argument("--kein-pdf", action="store_true", help="Nur DOCX erzeugen")
+    parser.add_argument("--kein-cache", action="store_true", help="Extraktions-Cache nicht verwenden")
+    parser.add_argument(
+        "--telemetrie", action="store_true",
+        help="Stufen messen und als telemetrie.jsonl / metriken.prom in den Zielordner schreiben",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    from src.ai.extraktions_cache import ExtraktionsCache
+    from src.ai.tailoring import ProfilTailoring
+    from src.pipeline.batch import BatchVerarbeitung
+    from src.telemetrie import telemetrie
+
+    if args.telemetrie:
+        telemetrie.aktiviere()
+
+    tailoring = ProfilTailoring(cache=None if args.kein_cache else ExtraktionsCache())
+    batch = BatchVerarbeitung(
+        template_pfad=args.template,
+        ausgabe_ordner=args.ausgabe,
+        max_prozesse=args.prozesse,
+        max_parallel_llm=args.parallel,
+        mit_pdf=not args.kein_pdf,
+        tailoring=tailoring,
+        bei_datei=_melde_datei,
+    )
+    zusammenfassung = batch.verarbeite_ordner(args.eingabe_ordner)
+
+    if telemetrie.aktiv:
+        ausgabe = Path(args.ausgabe)
+        (ausgabe / "telemetrie.jsonl").write_text(telemetrie.als_jsonl(), encoding="utf-8")
+        (ausgabe / "metriken.prom").write_text(telemetrie.als_prometheus(), encoding="utf-8")
+
+    print("\n--- Zusammenfassung ---")
+    print(
+        f"{zusammenfassung['verarbeitet']} verarbeitet, "
+        f"{zusammenfassung['uebersprungen']} übersprungen, "
+        f"{len(zusammenfassung['fehler'])} Fehler "
+        f"in {zusammenfassung['dauer_s']} s "
+        f"({zusammenfassung['dateien_pro_minute']} Dateien/min)"
+    )
+    for stufe, werte in zusammenfassung["stufen"].items():
+        print(
+            f"  {stufe:<24} n={werte['anzahl']:<4} "
+            f"p50 {werte['p50_s']:.3f} s  p95 {werte['p95_s']:.3f} s  max {werte['max_s']:.3f} s"
+        )
+    if zusammenfassung["fehler"]:
+        print(json.dumps(zusammenfassung["fehler"], ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
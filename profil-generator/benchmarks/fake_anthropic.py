@@ -0,0 +1,221 @@
+"""
+Lokaler Fake-Endpunkt für die Anthropic Messages API
+
+Beantwortet POST /v1/messages mit vorgefertigtem JSON — wahlweise als
+normale Antwort oder als SSE-Stream (stream=true). Latenz bis zum ersten
+Token und Ausgabegeschwindigkeit sind einstellbar, damit Benchmarks
+reproduzierbar ohne API-Key und ohne Netzwerk laufen.
+
+Prompt-Caching wird nachgebildet: Präfixe bis zu einem Block mit
+cache_control werden gemerkt; spätere Anfragen mit gleichem Präfix melden
+cache_read_input_tokens statt input_tokens und antworten um
+cache_ersparnis_s schneller.
+
+Mit max_ausgabe_tokens werden längere Antworten mit stop_reason
+"max_tokens" abgeschnitten. Endet die Anfrage mit einer Assistant-Nachricht
+(Prefill), liefert der Fake nur den Rest nach diesem Anfang.
+
+Verwendung:
+    with FakeAnthropic(antwort=profil_json, latenz_s=0.5) as fake:
+        tailoring = ProfilTailoring(api_key="test", base_url=fake.url)
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+import json
+import threading
+import time
+
+
+class FakeAnthropic:
+    def __init__(
+        self,
+        antwort: str | Callable[[dict], str],
+        latenz_s: float = 0.0,
+        tokens_pro_s: float | None = None,
+        min_cache_tokens: int = 1024,
+        cache_ersparnis_s: float = 0.0,
+        max_ausgabe_tokens: int | None = None,
+    ):
+        """
+        Args:
+            antwort: Antworttext oder Funktion Anfrage-JSON → Antworttext
+            latenz_s: Wartezeit vor dem ersten Token
+            tokens_pro_s: Simulierte Ausgabegeschwindigkeit (None = sofort)
+            min_cache_tokens: Kürzere Präfixe werden (wie bei der API) nicht gecacht
+            cache_ersparnis_s: Verkürzung der Latenz bei einem Cache-Treffer
+            max_ausgabe_tokens: Antworten darüber werden abgeschnitten (stop_reason "max_tokens")
+        """
+        self.antwort = antwort
+        self.latenz_s = latenz_s
+        self.tokens_pro_s = tokens_pro_s
+        self.min_cache_tokens = min_cache_tokens
+        self.cache_ersparnis_s = cache_ersparnis_s
+        self.max_ausgabe_tokens = max_ausgabe_tokens
+        self.anfragen: list[dict] = []
+        self._prompt_cache: set[str] = set()
+        self._cache_lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def starte(self) -> "FakeAnthropic":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                laenge = int(self.headers.get("Content-Length", 0))
+                anfrage = json.loads(self.rfile.read(laenge) or b"{}")
+                fake.anfragen.append(anfrage)
+                fake._beantworte(self, anfrage)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stoppe(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeAnthropic":
+        return self.starte()
+
+    def __exit__(self, *exc) -> None:
+        self.stoppe()
+
+    # ------------------------------------------------------------------
+    # Antworten
+    # ------------------------------------------------------------------
+
+    def _text_fuer(self, anfrage: dict) -> tuple[str, str]:
+        """Antworttext (ggf. ohne Prefill, ggf. abgeschnitten) und stop_reason."""
+        text = self.antwort(anfrage) if callable(self.antwort) else self.antwort
+        nachrichten = anfrage.get("messages", [])
+        if nachrichten and nachrichten[-1].get("role") == "assistant":
+            prefill = nachrichten[-1].get("content")
+            if isinstance(prefill, str) and text.startswith(prefill):
+                text = text[len(prefill):]
+        grenze = min(anfrage.get("max_tokens") or 1 << 30, self.max_ausgabe_tokens or 1 << 30)
+        if len(text) // 4 > grenze:
+            return text[:grenze * 4], "max_tokens"
+        return text, "end_turn"
+
+    @staticmethod
+    def _bloecke(anfrage: dict) -> list[dict]:
+        """System- und Nachrichtenblöcke in Präfix-Reihenfolge."""
+        def als_bloecke(inhalt) -> list[dict]:
+            if isinstance(inhalt, str):
+                return [{"type": "text", "text": inhalt}]
+            return list(inhalt or [])
+
+        bloecke = als_bloecke(anfrage.get("system"))
+        for nachricht in anfrage.get("messages", []):
+            bloecke.extend(als_bloecke(nachricht.get("content")))
+        return bloecke
+
+    def _nutzung(self, anfrage: dict, text: str) -> dict:
+        # Grobe Schätzung: ~4 Zeichen pro Token
+        gesamt = len(json.dumps(anfrage, ensure_ascii=False)) // 4
+        gelesen = geschrieben = 0
+        praefix = ""
+        with self._cache_lock:
+            for block in self._bloecke(anfrage):
+                praefix += json.dumps(block.get("text", ""), ensure_ascii=False)
+                if "cache_control" not in block:
+                    continue
+                tokens = len(praefix) // 4
+                if tokens < self.min_cache_tokens:
+                    continue
+                if praefix in self._prompt_cache:
+                    gelesen, geschrieben = tokens, 0
+                else:
+                    self._prompt_cache.add(praefix)
+                    geschrieben = tokens - gelesen
+        return {
+            "input_tokens": max(0, gesamt - gelesen - geschrieben),
+            "output_tokens": max(1, len(text) // 4),
+            "cache_read_input_tokens": gelesen,
+            "cache_creation_input_tokens": geschrieben,
+        }
+
+    def _beantworte(self, handler: BaseHTTPRequestHandler, anfrage: dict) -> None:
+        text, stop_reason = self._text_fuer(anfrage)
+        nutzung = self._nutzung(anfrage, text)
+        if nutzung["cache_read_input_tokens"]:
+            time.sleep(max(0.0, self.latenz_s - self.cache_ersparnis_s))
+        else:
+            time.sleep(self.latenz_s)
+
+        if not anfrage.get("stream"):
+            if self.tokens_pro_s:
+                time.sleep(nutzung["output_tokens"] / self.tokens_pro_s)
+            inhalt = json.dumps(
+                {
+                    "id": "msg_fake",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": anfrage.get("model", "fake"),
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": stop_reason,
+                    "stop_sequence": None,
+                    "usage": nutzung,
+                }
+            ).encode("utf-8")
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(inhalt)))
+            handler.end_headers()
+            handler.wfile.write(inhalt)
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+
+        def sende(ereignis: str, daten: dict) -> None:
+            handler.wfile.write(
+                f"event: {ereignis}\ndata: {json.dumps(daten)}\n\n".encode("utf-8")
+            )
+            handler.wfile.flush()
+
+        sende("message_start", {
+            "type": "message_start",
+            "message": {
+                "id": "msg_fake", "type": "message", "role": "assistant",
+                "model": anfrage.get("model", "fake"), "content": [],
+                "stop_reason": None, "stop_sequence": None,
+                "usage": {**nutzung, "output_tokens": 1},
+            },
+        })
+        sende("content_block_start", {
+            "type": "content_block_start", "index": 0,
+            "content_block": {"type": "text", "text": ""},
+        })
+        # Ein Delta pro ~4 Tokens
+        for start in range(0, len(text), 16):
+            stueck = text[start:start + 16]
+            if self.tokens_pro_s:
+                time.sleep(len(stueck) / 4 / self.tokens_pro_s)
+            sende("content_block_delta", {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": stueck},
+            })
+        sende("content_block_stop", {"type": "content_block_stop", "index": 0})
+        sende("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+            "usage": {"output_tokens": nutzung["output_tokens"]},
+        })
+        sende("message_stop", {"type": "message_stop"})
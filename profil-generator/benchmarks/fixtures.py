@@ -0,0 +1,216 @@
+"""
+Benchmark-Fixtures
+
+Erzeugt synthetische Kandidatenprofile in wachsender Größe:
+  - DOCX: Varianten "runs" (viele kleine formatierte Runs) und
+          "tabellen" (tabellenlastige Projekthistorie)
+  - PDF:  Varianten "text" und "tabellen" (mit Rahmenlinien, damit
+          pdfplumber die Tabellen erkennt) — ohne zusätzliche Abhängigkeit
+  - Ein DOCX-Template mit Jinja2-Platzhaltern für den DocxGenerator
+  - Ein passendes Kandidatenprofil als JSON (Antwort des Fake-Endpunkts)
+"""
+
+from pathlib import Path
+import json
+
+from docx import Document
+from docx.shared import Pt, RGBColor
+
+ZEILEN_PRO_SEITE = 45
+TECHNOLOGIEN = ["Python", "Java", "Kubernetes", "AWS", "PostgreSQL", "React", "Terraform", "Kafka"]
+
+
+def _zeile(seite: int, nr: int) -> str:
+    tech = TECHNOLOGIEN[(seite + nr) % len(TECHNOLOGIEN)]
+    return f"Projekt {seite}-{nr}: Entwicklung und Betrieb einer Plattform mit {tech} im Team."
+
+
+# ------------------------------------------------------------------
+# DOCX
+# ------------------------------------------------------------------
+
+def erzeuge_docx(pfad: Path, seiten: int, variante: str) -> Path:
+    """Kandidatenprofil mit ungefähr `seiten` Seiten (Variante "runs" oder "tabellen")."""
+    doc = Document()
+    doc.add_heading("Max Mustermann", level=1)
+    doc.add_paragraph("Senior Software Engineer")
+
+    for seite in range(seiten):
+        doc.add_heading(f"Berufserfahrung {seite + 1}", level=2)
+        if variante == "tabellen":
+            tabelle = doc.add_table(rows=0, cols=3)
+            tabelle.style = "Table Grid"
+            for nr in range(ZEILEN_PRO_SEITE // 3):
+                zellen = tabelle.add_row().cells
+                zellen[0].text = f"20{10 + nr % 15} – 20{11 + nr % 15}"
+                zellen[1].text = _zeile(seite, nr)
+                zellen[2].text = ", ".join(TECHNOLOGIEN[nr % 4: nr % 4 + 3])
+        else:
+            for nr in range(ZEILEN_PRO_SEITE):
+                absatz = doc.add_paragraph()
+                # Jedes Wort als eigener, unterschiedlich formatierter Run
+                for i, wort in enumerate(_zeile(seite, nr).split()):
+                    run = absatz.add_run(wort + " ")
+                    run.bold = i % 5 == 0
+                    run.font.name = "Arial" if i % 2 else "Calibri"
+                    run.font.size = Pt(10 + i % 2)
+                    if i % 7 == 0:
+                        run.font.color.rgb = RGBColor(0x1F, 0x4E, 0x79)
+        if seite < seiten - 1:
+            doc.add_page_break()
+
+    doc.save(str(pfad))
+    return pfad
+
+
+def erzeuge_template(pfad: Path) -> Path:
+    """DOCX-Template mit den Platzhaltern aus DocxGenerator._erstelle_kontext."""
+    doc = Document()
+    doc.add_heading("{{ vollname }}", level=1)
+    doc.add_paragraph("{{ titel }} | {{ standort }} | {{ verfuegbarkeit }}")
+    doc.add_heading("Profil", level=2)
+    doc.add_paragraph("{{ zusammenfassung }}")
+    doc.add_heading("Kernkompetenzen", level=2)
+    doc.add_paragraph("{{ kernkompetenzen|join(', ') }}")
+    doc.add_heading("Berufserfahrung", level=2)
+    doc.add_paragraph("{%p for e in berufserfahrung %}")
+    doc.add_paragraph("{{ e.zeitraum }} — {{ e.titel }}, {{ e.unternehmen }}")
+    doc.add_paragraph("{{ e.beschreibung }}")
+    doc.add_paragraph("{%p for h in e.highlights %}")
+    doc.add_paragraph("• {{ h }}")
+    doc.add_paragraph("{%p endfor %}")
+    doc.add_paragraph("Technologien: {{ e.technologien|join(', ') }}")
+    doc.add_paragraph("{%p endfor %}")
+    doc.add_heading("Ausbildung", level=2)
+    doc.add_paragraph("{%p for a in ausbildung %}")
+    doc.add_paragraph("{{ a.abschluss }}, {{ a.institution }} ({{ a.zeitraum }})")
+    doc.add_paragraph("{%p endfor %}")
+    doc.add_heading("Sprachen", level=2)
+    doc.add_paragraph("{%p for s in sprachen %}")
+    doc.add_paragraph("{{ s.sprache }}: {{ s.niveau }}")
+    doc.add_paragraph("{%p endfor %}")
+    doc.add_paragraph("Stand: {{ erstellt_datum }}")
+    doc.save(str(pfad))
+    return pfad
+
+
+# ------------------------------------------------------------------
+# Profil-JSON (Antwort des Fake-Endpunkts)
+# ------------------------------------------------------------------
+
+def profil_daten(seiten: int) -> dict:
+    """Kandidatenprofil, dessen Umfang mit der Seitenzahl wächst."""
+    return {
+        "vorname": "Max",
+        "nachname": "Mustermann",
+        "titel": "Senior Software Engineer",
+        "standort": "Berlin",
+        "verfuegbarkeit": "Ab sofort",
+        "stundensatz": "",
+        "zusammenfassung": "Erfahrener Engineer mit Schwerpunkt Cloud und Datenplattformen. " * 3,
+        "kernkompetenzen": TECHNOLOGIEN,
+        "technische_skills": {"Sprachen": ["Python", "Java"], "Cloud": ["AWS", "Kubernetes"]},
+        "berufserfahrung": [
+            {
+                "titel": f"Senior Engineer {i}",
+                "unternehmen": f"Firma {i} GmbH",
+                "zeitraum": f"20{10 + i % 15} – 20{11 + i % 15}",
+                "beschreibung": _zeile(i, i),
+                "technologien": TECHNOLOGIEN[i % 4: i % 4 + 3],
+                "highlights": [_zeile(i, n) for n in range(3)],
+            }
+            for i in range(max(2, seiten * 3))
+        ],
+        "projekte": [],
+        "ausbildung": [
+            {"abschluss": "M.Sc. Informatik", "institution": "TU Berlin", "zeitraum": "2005 – 2010", "zusatz": ""}
+        ],
+        "zertifikate": [],
+        "sprachen": [{"sprache": "Deutsch", "niveau": "Muttersprache"}, {"sprache": "Englisch", "niveau": "C1"}],
+    }
+
+
+def profil_json(seiten: int) -> str:
+    return json.dumps(profil_daten(seiten), ensure_ascii=False)
+
+
+# ------------------------------------------------------------------
+# PDF (minimaler Writer, nur ASCII-Text und Linien)
+# ------------------------------------------------------------------
+
+def _pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _seiteninhalt(seite: int, variante: str) -> str:
+    befehle = []
+    if variante == "tabellen":
+        zeilen = ZEILEN_PRO_SEITE // 3
+        y_oben, hoehe = 780, 16
+        spalten = [50, 150, 450, 545]
+        befehle.append("0.5 w")
+        for i in range(zeilen + 1):
+            y = y_oben - i * hoehe
+            befehle.append(f"{spalten[0]} {y} m {spalten[-1]} {y} l S")
+        for x in spalten:
+            befehle.append(f"{x} {y_oben} m {x} {y_oben - zeilen * hoehe} l S")
+        for i in range(zeilen):
+            y = y_oben - i * hoehe - 12
+            werte = [f"{2010 + i % 15}-{2011 + i % 15}", _zeile(seite, i)[:55], TECHNOLOGIEN[i % len(TECHNOLOGIEN)]]
+            for x, wert in zip(spalten, werte):
+                befehle.append(f"BT /F1 8 Tf {x + 3} {y} Td ({_pdf_text(wert)}) Tj ET")
+    else:
+        befehle.append("BT /F1 10 Tf 50 800 Td 14 TL")
+        befehle.append(f"(Berufserfahrung {seite + 1}) Tj")
+        for nr in range(ZEILEN_PRO_SEITE):
+            befehle.append(f"T* ({_pdf_text(_zeile(seite, nr))}) Tj")
+        befehle.append("ET")
+    befehle.append(f"BT /F1 8 Tf 280 30 Td (Seite {seite + 1}) Tj ET")
+    return "\n".join(befehle)
+
+
+def erzeuge_pdf(pfad: Path, seiten: int, variante: str) -> Path:
+    """PDF mit `seiten` Seiten (Variante "text" oder "tabellen")."""
+    objekte: list[bytes] = []
+
+    def neues_objekt(inhalt: bytes) -> int:
+        objekte.append(inhalt)
+        return len(objekte)
+
+    katalog = neues_objekt(b"")          # Platzhalter, wird unten gesetzt
+    seiten_baum = neues_objekt(b"")
+    font = neues_objekt(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    kinder = []
+    for seite in range(seiten):
+        inhalt = _seiteninhalt(seite, variante).encode("latin-1")
+        stream = neues_objekt(
+            b"<< /Length %d >>\nstream\n" % len(inhalt) + inhalt + b"\nendstream"
+        )
+        kinder.append(neues_objekt(
+            (
+                f"<< /Type /Page /Parent {seiten_baum} 0 R /MediaBox [0 0 595 842] "
+                f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {stream} 0 R >>"
+            ).encode("ascii")
+        ))
+
+    objekte[katalog - 1] = f"<< /Type /Catalog /Pages {seiten_baum} 0 R >>".encode("ascii")
+    objekte[seiten_baum - 1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kinder)}] /Count {len(kinder)} >>"
+    ).encode("ascii")
+
+    ausgabe = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for nr, inhalt in enumerate(objekte, start=1):
+        offsets.append(len(ausgabe))
+        ausgabe += f"{nr} 0 obj\n".encode("ascii") + inhalt + b"\nendobj\n"
+    xref = len(ausgabe)
+    ausgabe += f"xref\n0 {len(objekte) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        ausgabe += f"{offset:010d} 00000 n \n".encode("ascii")
+    ausgabe += (
+        f"trailer\n<< /Size {len(objekte) + 1} /Root {katalog} 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode("ascii")
+    pfad.write_bytes(bytes(ausgabe))
+    return pfad
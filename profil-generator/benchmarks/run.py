@@ -0,0 +1,270 @@
+"""
+Benchmark-Suite für die Pipeline Parse → Extraktion → Render → Konvertierung
+
+Misst DocxParser, PdfParser, ProfilTailoring.extrahiere_profil (gegen einen
+lokalen Fake-Endpunkt), DocxGenerator.generiere und PdfConverter.konvertiere
+einzeln sowie End-to-End, dazu die Text-Normalisierung (inkl. gesparter
+Tokens), das Tailoring eines Kandidaten für mehrere Projekte mit und ohne
+Prompt-Caching, volles Tailoring gegen Patch-Tailoring sowie die
+Extraktion einer bei max_tokens abgeschnittenen Antwort. Ergebnisse
+landen als JSON in benchmarks/ergebnisse/ und lassen sich zwischen Commits
+vergleichen.
+
+Start (im Ordner profil-generator):
+    python -m benchmarks.run
+    python -m benchmarks.run --schnell --latenz-ms 200
+    python -m benchmarks.run --schnell --tokens-pro-s 80
+    python -m benchmarks.run --vergleiche benchmarks/ergebnisse/alt.json
+"""
+
+from pathlib import Path
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import fixtures
+from benchmarks.fake_anthropic import FakeAnthropic
+
+SEITEN = [1, 5, 20, 100]
+SEITEN_SCHNELL = [1, 5]
+ERGEBNIS_ORDNER = Path(__file__).parent / "ergebnisse"
+
+
+def messe(funktion, wiederholungen: int) -> dict:
+    """Führt die Funktion mehrfach aus und gibt Laufzeit-Statistiken zurück (Sekunden)."""
+    dauern = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        dauern.append(time.perf_counter() - start)
+    dauern.sort()
+    return {
+        "n": len(dauern),
+        "min_s": round(dauern[0], 5),
+        "median_s": round(statistics.median(dauern), 5),
+        "mittel_s": round(statistics.fmean(dauern), 5),
+        "p95_s": round(dauern[min(len(dauern) - 1, int(len(dauern) * 0.95))], 5),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def fuehre_aus(
+    seiten_liste: list[int],
+    wiederholungen: int,
+    latenz_s: float,
+    tokens_pro_s: float | None = None,
+) -> dict:
+    from src.ai.tailoring import ProfilTailoring
+    from src.generator.docx_generator import DocxGenerator
+    from src.generator.pdf_converter import PdfConverter
+    from src.models.profile import Kandidatenprofil, ProjektAnforderungen
+    from src.parser.docx_parser import DocxParser
+    from src.parser.normalisierung import normalisiere
+    from src.parser.pdf_parser import PdfParser
+
+    ergebnisse: dict[str, dict] = {}
+    converter = PdfConverter()
+    mit_pdf = converter.verfuegbare_methode() != "Keine"
+
+    def protokolliere(name: str, werte: dict) -> None:
+        ergebnisse[name] = werte
+        print(f"{name:<40} median {werte['median_s'] * 1000:9.1f} ms  (n={werte['n']})", flush=True)
+
+    with tempfile.TemporaryDirectory(prefix="profil_bench_") as tmp:
+        tmp = Path(tmp)
+        template = fixtures.erzeuge_template(tmp / "template.docx")
+
+        for seiten in seiten_liste:
+            # Große Fixtures seltener wiederholen
+            n = max(1, wiederholungen // (1 + seiten // 20))
+
+            for variante in ("runs", "tabellen"):
+                docx = fixtures.erzeuge_docx(tmp / f"profil_{seiten}_{variante}.docx", seiten, variante)
+
+                def parse_docx(p=docx):
+                    parser = DocxParser(p)
+                    parser.extrahiere_struktur()
+                    parser.extrahiere_style_info()
+                    parser.extrahiere_text()
+
+                protokolliere(f"docx_parser/{variante}/{seiten}s", messe(parse_docx, n))
+
+            for variante in ("text", "tabellen"):
+                pdf = fixtures.erzeuge_pdf(tmp / f"profil_{seiten}_{variante}.pdf", seiten, variante)
+
+                def parse_pdf(p=pdf):
+                    parser = PdfParser(p)
+                    parser.extrahiere_text()
+                    parser.extrahiere_tabellen()
+
+                protokolliere(f"pdf_parser/{variante}/{seiten}s", messe(parse_pdf, n))
+
+                seiten_text = PdfParser(pdf).extrahiere_seiten()
+                werte = messe(lambda: normalisiere(seiten_text), n)
+                werte["tokens_gespart"] = normalisiere(seiten_text)[1]["tokens_gespart"]
+                protokolliere(f"normalisierung/{variante}/{seiten}s", werte)
+
+            antwort = fixtures.profil_json(seiten)
+            profil = Kandidatenprofil.model_validate_json(antwort)
+            generator = DocxGenerator(template)
+            protokolliere(
+                f"generator/{seiten}s",
+                messe(lambda: generator.generiere(profil, tmp / f"gen_{seiten}.docx"), n),
+            )
+
+            if mit_pdf:
+                gen_docx = tmp / f"gen_{seiten}.docx"
+                protokolliere(
+                    f"converter/{seiten}s",
+                    messe(lambda: converter.konvertiere(gen_docx, tmp / f"gen_{seiten}.pdf"), min(n, 3)),
+                )
+
+            with FakeAnthropic(antwort, latenz_s=latenz_s, tokens_pro_s=tokens_pro_s) as fake:
+                tailoring = ProfilTailoring(api_key="benchmark", base_url=fake.url)
+                rohtext = DocxParser(tmp / f"profil_{seiten}_runs.docx").extrahiere_text()
+                protokolliere(
+                    f"extraktion/{seiten}s",
+                    messe(lambda: tailoring.extrahiere_profil(rohtext), n),
+                )
+
+                def ende_zu_ende(quelle=tmp / f"profil_{seiten}_runs.docx"):
+                    text = DocxParser(quelle).extrahiere_text()
+                    ergebnis = tailoring.extrahiere_profil(text)
+                    docx_pfad = generator.generiere(ergebnis, tmp / f"e2e_{seiten}.docx")
+                    if mit_pdf:
+                        converter.konvertiere(docx_pfad)
+
+                protokolliere(f"ende_zu_ende/{seiten}s", messe(ende_zu_ende, min(n, 3)))
+
+            # Abgeschnittene Antwort: nur der Rest wird nachgefordert
+            with FakeAnthropic(
+                antwort, latenz_s=latenz_s, tokens_pro_s=tokens_pro_s,
+                max_ausgabe_tokens=len(antwort) // 8 + 1,
+            ) as fake:
+                tailoring = ProfilTailoring(api_key="benchmark", base_url=fake.url)
+                werte = messe(lambda: tailoring.extrahiere_profil(rohtext), min(n, 3))
+                nutzung = tailoring.nutzung()
+                for feld in ("fortsetzungen", "antworten_fehlgeschlagen",
+                             "output_tokens", "verschwendete_output_tokens"):
+                    werte[feld] = nutzung[feld]
+                protokolliere(f"extraktion_abgeschnitten/{seiten}s", werte)
+
+            # Ein Kandidat, fünf Projekte — mit und ohne Prompt-Caching
+            projekte = [
+                ProjektAnforderungen(
+                    titel=f"Projekt {i}",
+                    pflicht_skills=fixtures.TECHNOLOGIEN[i:i + 3],
+                    rohe_ausschreibung=f"Plattform-Team sucht Verstärkung mit {fixtures.TECHNOLOGIEN[i]}.",
+                )
+                for i in range(5)
+            ]
+            for caching in (False, True):
+                with FakeAnthropic(
+                    antwort, latenz_s=latenz_s, tokens_pro_s=tokens_pro_s, cache_ersparnis_s=latenz_s / 2
+                ) as fake:
+                    nutzungen = []
+
+                    def tailoring_projekte(caching=caching, url=fake.url):
+                        # Neue Instanz pro Lauf: der Async-Client gehört zu seinem Event-Loop
+                        t = ProfilTailoring(api_key="benchmark", base_url=url, prompt_caching=caching)
+                        asyncio.run(t.tailore_profile_async([(profil, p) for p in projekte]))
+                        nutzungen.append(t.nutzung())
+
+                    werte = messe(tailoring_projekte, min(n, 3))
+                    werte["cache_read_tokens"] = sum(x["cache_read_input_tokens"] for x in nutzungen)
+                    werte["cache_write_tokens"] = sum(x["cache_creation_input_tokens"] for x in nutzungen)
+                    name = "mit_cache" if caching else "ohne_cache"
+                    protokolliere(f"tailoring_5_projekte/{name}/{seiten}s", werte)
+
+            # Volles Profil vs. Änderungsliste als Antwort (Ausgabe-Tokens)
+            patch = json.dumps({
+                "zusammenfassung": "Cloud-Engineer mit Fokus auf Kubernetes und AWS.",
+                "reihenfolge": {"berufserfahrung": [1, 0], "kernkompetenzen": ["Kubernetes", "AWS"]},
+                "eintraege": [{"liste": "berufserfahrung", "index": 1, "highlights": ["Migration nach AWS"]}],
+            })
+            with FakeAnthropic(
+                lambda anfrage: patch if anfrage["max_tokens"] <= 2048 else antwort,
+                latenz_s=latenz_s, tokens_pro_s=tokens_pro_s,
+            ) as fake:
+                tailoring = ProfilTailoring(api_key="benchmark", base_url=fake.url)
+                protokolliere(
+                    f"tailoring/voll/{seiten}s",
+                    messe(lambda: tailoring.tailore_profil(profil, projekte[0]), min(n, 3)),
+                )
+                protokolliere(
+                    f"tailoring/patch/{seiten}s",
+                    messe(lambda: tailoring.tailore_profil_patch(profil, projekte[0]), min(n, 3)),
+                )
+
+    return ergebnisse
+
+
+def vergleiche(alt: dict, neu: dict) -> None:
+    print(f"\nVergleich mit {alt.get('commit') or '?'} ({alt.get('zeitpunkt')}):")
+    for name, werte in neu["ergebnisse"].items():
+        vorher = alt["ergebnisse"].get(name)
+        if not vorher:
+            continue
+        faktor = werte["median_s"] / vorher["median_s"] if vorher["median_s"] else float("inf")
+        markierung = "  ← langsamer" if faktor > 1.1 else ""
+        print(f"{name:<40} {faktor:6.2f}x{markierung}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks der Profil-Pipeline")
+    parser.add_argument("--schnell", action="store_true", help="Nur 1 und 5 Seiten")
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--latenz-ms", type=float, default=0, help="Latenz des Fake-Endpunkts")
+    parser.add_argument(
+        "--tokens-pro-s", type=float, default=None,
+        help="Ausgabegeschwindigkeit des Fake-Endpunkts (Standard: sofort)",
+    )
+    parser.add_argument("--ausgabe", type=Path, default=None, help="Ergebnisdatei (JSON)")
+    parser.add_argument("--vergleiche", type=Path, default=None, help="Früheres Ergebnis zum Vergleich")
+    args = parser.parse_args()
+
+    ergebnisse = fuehre_aus(
+        SEITEN_SCHNELL if args.schnell else SEITEN,
+        args.wiederholungen,
+        args.latenz_ms / 1000,
+        args.tokens_pro_s,
+    )
+    jetzt = datetime.datetime.now()
+    commit = _git_commit()
+    lauf = {
+        "zeitpunkt": jetzt.isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "plattform": platform.platform(),
+        "latenz_ms": args.latenz_ms,
+        "tokens_pro_s": args.tokens_pro_s,
+        "ergebnisse": ergebnisse,
+    }
+
+    ausgabe = args.ausgabe or ERGEBNIS_ORDNER / f"{jetzt:%Y%m%d_%H%M%S}_{commit or 'unbekannt'}.json"
+    ausgabe.parent.mkdir(parents=True, exist_ok=True)
+    ausgabe.write_text(json.dumps(lauf, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nErgebnisse gespeichert: {ausgabe}")
+
+    if args.vergleiche:
+        vergleiche(json.loads(args.vergleiche.read_text(encoding="utf-8")), lauf)
+
+
+if __name__ == "__main__":
+    main()
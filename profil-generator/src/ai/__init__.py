@@ -1,3 +1,15 @@
 from .tailoring import ProfilTailoring
+from .extraktions_cache import ExtraktionsCache
+from .json_decoder import JsonDekodierFehler, dekodiere_json
+from .json_stream import JsonStreamFehler
+from .patch import PatchFehler, wende_patch_an
 
-__all__ = ["ProfilTailoring"]
+__all__ = [
+    "ProfilTailoring",
+    "ExtraktionsCache",
+    "JsonDekodierFehler",
+    "dekodiere_json",
+    "JsonStreamFehler",
+    "PatchFehler",
+    "wende_patch_an",
+]
@@ -0,0 +1,91 @@
+"""
+Extraktions-Cache
+
+Persistenter, inhaltsadressierter Cache für ProfilTailoring.extrahiere_profil.
+Schlüssel: SHA-256 über normalisierten Rohtext + Modellname + System-Prompt.
+Gespeichert wird das validierte Kandidatenprofil als JSON — eine erneute
+Extraktion desselben Profils kostet damit keinen Claude-Aufruf mehr.
+
+Eviction (siehe DateiCache):
+  - Einträge älter als max_alter_tage werden verworfen
+  - Übersteigt der Ordner max_megabyte, fliegen die am längsten
+    nicht genutzten Einträge zuerst (LRU über die Datei-mtime)
+
+HINWEIS: Der Cache enthält personenbezogene Daten und liegt deshalb
+standardmäßig in .cache/ (nicht eingecheckt).
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import re
+import time
+import unicodedata
+
+from src.datei_cache import DateiCache
+from src.models.profile import Kandidatenprofil
+
+
+class ExtraktionsCache(DateiCache):
+    def __init__(
+        self,
+        ordner: str | Path = ".cache/extraktion",
+        max_megabyte: float = 50,
+        max_alter_tage: float = 30,
+    ):
+        """
+        Args:
+            ordner: Verzeichnis für die Cache-Dateien
+            max_megabyte: Maximale Gesamtgröße des Caches
+            max_alter_tage: Maximales Alter eines Eintrags
+        """
+        super().__init__(ordner, (".json",), max_megabyte, max_alter_tage)
+
+    # ------------------------------------------------------------------
+    # Öffentliche Methoden
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalisiere(rohtext: str) -> str:
+        """Vereinheitlicht Unicode, Zeilenenden und Leerraum (ändert keine Inhalte)."""
+        text = unicodedata.normalize("NFC", rohtext).replace("\r\n", "\n").replace("\r", "\n")
+        zeilen = [re.sub(r"[ \t\u00a0]+", " ", zeile).strip() for zeile in text.split("\n")]
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(zeilen)).strip()
+
+    def schluessel(self, rohtext: str, modell: str, system_prompt: str) -> str:
+        """Content-Hash für Rohtext + Modell + System-Prompt."""
+        basis = json.dumps(
+            [modell, system_prompt, self.normalisiere(rohtext)], ensure_ascii=False
+        )
+        return hashlib.sha256(basis.encode("utf-8")).hexdigest()
+
+    def hole(self, schluessel: str) -> Kandidatenprofil | None:
+        """Gibt das gecachte Profil zurück oder None (Fehlschlag)."""
+        pfad = self._pfad(schluessel)
+        daten = self._lies(pfad)
+        if daten is None:
+            return self._zaehle(None)
+        try:
+            eintrag = json.loads(daten)
+            # Alter ab Erstellung (die mtime zählt nur die letzte Nutzung)
+            if time.time() - eintrag["erstellt"] > self.max_alter_s:
+                pfad.unlink(missing_ok=True)
+                return self._zaehle(None)
+            profil = Kandidatenprofil.model_validate(eintrag["profil"])
+        except (ValueError, KeyError, TypeError):
+            # Beschädigter Eintrag — verwerfen
+            pfad.unlink(missing_ok=True)
+            return self._zaehle(None)
+        return self._zaehle(profil)
+
+    def lege_ab(self, schluessel: str, profil: Kandidatenprofil) -> None:
+        """Speichert ein validiertes Profil (atomar) und räumt ggf. auf."""
+        eintrag = {"erstellt": time.time(), "profil": profil.model_dump(mode="json")}
+        self._schreibe(self._pfad(schluessel), json.dumps(eintrag, ensure_ascii=False).encode("utf-8"))
+
+    # ------------------------------------------------------------------
+    # Private Hilfsmethoden
+    # ------------------------------------------------------------------
+
+    def _pfad(self, schluessel: str) -> Path:
+        return self.ordner / f"{schluessel}.json"
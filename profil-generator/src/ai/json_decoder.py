@@ -0,0 +1,204 @@
+"""
+Toleranter JSON-Decoder für Claude-Antworten
+
+Eine kleine Formabweichung soll keine teure Anfrage kosten. Der Decoder
+  1. sucht das äußerste JSON-Objekt (Text/Markdown davor und danach wird ignoriert)
+  2. repariert typische Fehler: Kommentare, Kommas vor } bzw. ],
+     Python-Literale (True/False/None), abgeschnittenes Ende
+  3. validiert gegen Kandidatenprofil und lässt dabei nur ungültige
+     Einzelfelder bzw. Listeneinträge weg
+
+Jede Reparatur wird benannt zurückgegeben, damit sie gezählt werden kann.
+Ein abgeschnittenes Ende wird nur als letzter Ausweg geschlossen — bei
+stop_reason "max_tokens" fordert ProfilTailoring vorher den fehlenden
+Rest an. Der angefangene letzte Wert bzw. Listeneintrag fällt dabei weg
+(aus "Py" wird kein Skill).
+"""
+
+import json
+import re
+
+from pydantic import ValidationError
+
+from src.ai.json_stream import InkrementellerJsonParser, JsonStreamFehler
+from src.models.profile import Kandidatenprofil
+
+_PYTHON_LITERALE = {"True": "true", "False": "false", "None": "null"}
+_BEZEICHNER = re.compile(r"[^\W\d]\w*")
+
+
+class JsonDekodierFehler(ValueError):
+    """Aus der Antwort ließ sich auch mit Reparaturen kein JSON-Objekt gewinnen."""
+
+
+def dekodiere_json(text: str) -> tuple[dict, list[str]]:
+    """
+    Liest das äußerste JSON-Objekt aus einer Antwort.
+
+    Returns:
+        (Objekt, angewendete Reparaturen) — z.B. ["text_davor", "komma_am_ende"]
+
+    Raises:
+        JsonDekodierFehler: wenn kein Objekt zu retten ist
+    """
+    start = text.find("{")
+    if start < 0:
+        raise JsonDekodierFehler("Die Antwort enthält kein JSON-Objekt.")
+
+    reparaturen = []
+    if text[:start].strip().strip("`").removeprefix("json").strip():
+        reparaturen.append("text_davor")
+
+    ende = _objekt_ende(text, start)
+    kandidat = text[start:ende]
+    if ende < len(text) and text[ende:].strip().strip("`").strip():
+        reparaturen.append("text_danach")
+
+    try:
+        return json.loads(kandidat, strict=False), reparaturen
+    except json.JSONDecodeError:
+        pass
+
+    kandidat, bereinigt = _bereinige(kandidat)
+    reparaturen.extend(bereinigt)
+    try:
+        return json.loads(kandidat, strict=False), reparaturen
+    except json.JSONDecodeError as e:
+        fehler = e
+
+    # Abgeschnittenes Ende: bis zum letzten vollständigen Wert. Nur wenn der
+    # Parser den ganzen Kandidaten ohne Fehler gelesen hat — ein Defekt
+    # mitten im Objekt (z.B. ungeschütztes Anführungszeichen) würde das
+    # Profil sonst stillschweigend an dieser Stelle abschneiden.
+    parser = InkrementellerJsonParser()
+    try:
+        parser.fuettere(kandidat)
+    except JsonStreamFehler as e:
+        raise JsonDekodierFehler(f"JSON nicht reparierbar: {e}") from e
+    if not parser.fertig:
+        daten = parser.snapshot_vollstaendig()
+        if daten:
+            reparaturen.append("abgeschnitten")
+            return daten, reparaturen
+    raise JsonDekodierFehler(f"JSON nicht reparierbar: {fehler}") from fehler
+
+
+def validiere_profil(daten: dict) -> tuple[Kandidatenprofil, list[str]]:
+    """
+    Validiert gegen Kandidatenprofil. Ungültige Felder und Listeneinträge
+    (z.B. eine Erfahrung ohne Titel) werden weggelassen statt alles zu verwerfen.
+
+    Returns:
+        (Profil, entfernte Stellen wie "berufserfahrung[3]" oder "sprachen")
+
+    Raises:
+        JsonDekodierFehler: wenn auch nach dem Weglassen kein Profil entsteht
+    """
+    if not isinstance(daten, dict):
+        raise JsonDekodierFehler("Profil-JSON ist kein Objekt.")
+    entfernt: list[str] = []
+    for _ in range(50):
+        try:
+            return Kandidatenprofil.model_validate(daten), entfernt
+        except ValidationError as e:
+            vorher = len(entfernt)
+            listen_indizes: dict[str, set[int]] = {}
+            for fehler in e.errors():
+                loc = fehler["loc"]
+                if len(loc) >= 2 and isinstance(loc[1], int) and isinstance(daten.get(loc[0]), list):
+                    listen_indizes.setdefault(loc[0], set()).add(loc[1])
+                elif loc and loc[0] in daten:
+                    daten.pop(loc[0])
+                    entfernt.append(str(loc[0]))
+            for feld, indizes in listen_indizes.items():
+                for index in sorted(indizes, reverse=True):
+                    del daten[feld][index]
+                    entfernt.append(f"{feld}[{index}]")
+            if len(entfernt) == vorher:
+                # z.B. fehlendes Pflichtfeld — Weglassen hilft nicht
+                break
+    raise JsonDekodierFehler("Profil-JSON lässt sich nicht validieren.")
+
+
+# ------------------------------------------------------------------
+# Private Hilfsfunktionen
+# ------------------------------------------------------------------
+
+def _objekt_ende(text: str, start: int) -> int:
+    """Position hinter der schließenden Klammer des Objekts (len(text), wenn sie fehlt)."""
+    tiefe = 0
+    in_string = escape = False
+    for pos in range(start, len(text)):
+        c = text[pos]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            tiefe += 1
+        elif c in "}]":
+            tiefe -= 1
+            if tiefe == 0:
+                return pos + 1
+    return len(text)
+
+
+def _bereinige(text: str) -> tuple[str, list[str]]:
+    """Entfernt Kommentare und Kommas vor Schließern, ersetzt Python-Literale (außerhalb von Strings)."""
+    ergebnis: list[str] = []
+    reparaturen: set[str] = set()
+    in_string = escape = False
+    pos = 0
+    while pos < len(text):
+        c = text[pos]
+        if in_string:
+            ergebnis.append(c)
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+            pos += 1
+            continue
+
+        if c == '"':
+            in_string = True
+        elif text.startswith("//", pos):
+            zeilenende = text.find("\n", pos)
+            pos = len(text) if zeilenende < 0 else zeilenende
+            reparaturen.add("kommentar")
+            continue
+        elif text.startswith("/*", pos):
+            ende = text.find("*/", pos + 2)
+            pos = len(text) if ende < 0 else ende + 2
+            reparaturen.add("kommentar")
+            continue
+        elif c in "}]":
+            # Komma (ggf. mit Leerraum) direkt vor dem Schließer entfernen
+            i = len(ergebnis) - 1
+            while i >= 0 and ergebnis[i] in " \t\r\n":
+                i -= 1
+            if i >= 0 and ergebnis[i] == ",":
+                del ergebnis[i]
+                reparaturen.add("komma_am_ende")
+        elif c.isalpha():
+            treffer = _BEZEICHNER.match(text, pos)
+            if treffer is None:
+                raise JsonDekodierFehler(f"Unerwartetes Zeichen {c!r} an Position {pos}.")
+            wort = treffer.group()
+            if wort in _PYTHON_LITERALE:
+                ergebnis.append(_PYTHON_LITERALE[wort])
+                reparaturen.add("python_literal")
+            else:
+                ergebnis.append(wort)
+            pos = treffer.end()
+            continue
+        ergebnis.append(c)
+        pos += 1
+    return "".join(ergebnis), sorted(reparaturen)
@@ -0,0 +1,249 @@
+"""
+Inkrementeller JSON-Parser
+
+Verarbeitet eine Claude-Antwort Token für Token, während sie gestreamt
+wird. Liefert jederzeit einen parsebaren Zwischenstand (offene Strings,
+Listen und Objekte werden geschlossen) und erkennt strukturell
+kaputte Ausgaben sofort — statt erst nach dem letzten Token.
+
+Text vor dem ersten "{" (z.B. ```json) und nach dem Ende des
+Objekts wird ignoriert.
+"""
+
+import json
+import re
+
+_SCHLIESSER = {"{": "}", "[": "]"}
+_LITERAL = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?|true|false|null")
+_ESCAPES = set('"\\/bfnrt')
+
+
+class JsonStreamFehler(ValueError):
+    """Die Antwort ist erkennbar kein valides JSON-Objekt."""
+
+
+class InkrementellerJsonParser:
+    def __init__(self, max_vorlauf: int = 200):
+        """
+        Args:
+            max_vorlauf: Maximale Anzahl Zeichen vor dem ersten "{".
+                         Danach wird die Antwort als fehlerhaft abgebrochen.
+        """
+        self.max_vorlauf = max_vorlauf
+        self.fertig = False
+        self.felder_fertig = 0          # abgeschlossene Felder auf oberster Ebene
+
+        self._teile: list[str] = []     # JSON-Text ab dem ersten "{"
+        self._laenge = 0
+        self._vorlauf = 0
+        self._gestartet = False
+
+        # Stapel offener Container: [typ, modus, leer]
+        # modus: "schluessel" | "doppelpunkt" | "wert" | "komma"
+        self._stapel: list[list] = []
+        self._in_string = False
+        self._string_ist_schluessel = False
+        self._escape = False
+        self._escape_start = 0
+        self._unicode_rest = 0
+        self._literal: list[str] | None = None
+
+        # Position nach dem letzten vollständigen Wert + passende Schließer
+        self._sicher = (0, "")
+
+    # ------------------------------------------------------------------
+    # Öffentliche Methoden
+    # ------------------------------------------------------------------
+
+    def fuettere(self, text: str) -> int:
+        """
+        Verarbeitet den nächsten Textabschnitt.
+
+        Returns:
+            Anzahl der dadurch neu abgeschlossenen Felder auf oberster Ebene
+
+        Raises:
+            JsonStreamFehler: sobald die Ausgabe kein valides JSON-Objekt mehr sein kann
+        """
+        vorher = self.felder_fertig
+        for zeichen in text:
+            if self.fertig:
+                break
+            if not self._gestartet:
+                if zeichen != "{":
+                    self._vorlauf += 1
+                    if self._vorlauf > self.max_vorlauf:
+                        raise JsonStreamFehler(
+                            f"Kein JSON-Objekt in den ersten {self.max_vorlauf} Zeichen."
+                        )
+                    continue
+                self._gestartet = True
+            self._verarbeite(zeichen, self._laenge)
+            self._teile.append(zeichen)
+            self._laenge += 1
+        return self.felder_fertig - vorher
+
+    def snapshot(self) -> dict | None:
+        """
+        Parsebarer Zwischenstand: alle bisher vollständigen Werte, plus ein
+        gerade laufender String-Wert (abgeschnitten). None vor dem ersten "{".
+        """
+        if not self._gestartet:
+            return None
+        text = "".join(self._teile)
+        if self.fertig:
+            return json.loads(text, strict=False)
+
+        if self._in_string and not self._string_ist_schluessel:
+            ende = self._escape_start if (self._escape or self._unicode_rest) else self._laenge
+            kandidat = text[:ende] + '"' + self._schliesser()
+        else:
+            position, schliesser = self._sicher
+            kandidat = text[:position] + schliesser
+        try:
+            return json.loads(kandidat, strict=False)
+        except json.JSONDecodeError:
+            position, schliesser = self._sicher
+            return json.loads(text[:position] + schliesser, strict=False)
+
+    def snapshot_vollstaendig(self) -> dict | None:
+        """
+        Wie snapshot(), aber nur mit abgeschlossenen Werten: ein angefangener
+        String, eine angefangene Zahl und ein angefangener Listeneintrag
+        (z.B. eine halbe Erfahrung) fallen ganz weg. Für die Reparatur
+        abgeschnittener Antworten — "Py" soll nicht als Skill übrig bleiben.
+        """
+        if not self._gestartet:
+            return None
+        position, schliesser = self._sicher
+        daten = json.loads("".join(self._teile)[:position] + schliesser, strict=False)
+        if self.fertig:
+            return daten
+
+        # Entlang der offenen Container absteigen; der erste, der selbst
+        # Listeneintrag ist, ist unvollständig
+        knoten = daten
+        for eltern_typ, _, _ in self._stapel[:-1]:
+            if eltern_typ == "[":
+                if knoten:
+                    knoten.pop()
+                break
+            if not knoten:
+                break
+            knoten = knoten[next(reversed(knoten))]
+        return daten
+
+    def ergebnis(self) -> dict:
+        """
+        Das vollständige Objekt.
+
+        Raises:
+            JsonStreamFehler: wenn das Objekt (noch) nicht abgeschlossen ist
+        """
+        if not self.fertig:
+            raise JsonStreamFehler("JSON-Antwort ist unvollständig.")
+        return json.loads("".join(self._teile), strict=False)
+
+    # ------------------------------------------------------------------
+    # Zustandsautomat
+    # ------------------------------------------------------------------
+
+    def _verarbeite(self, c: str, pos: int) -> None:
+        if self._in_string:
+            self._verarbeite_string(c)
+            return
+
+        if self._literal is not None:
+            if c in " \t\r\n,}]":
+                literal = "".join(self._literal)
+                if not _LITERAL.fullmatch(literal):
+                    raise JsonStreamFehler(f"Ungültiger Wert: {literal!r}")
+                self._literal = None
+                self._wert_fertig(pos)
+            else:
+                self._literal.append(c)
+                return
+
+        if c in " \t\r\n":
+            return
+
+        oben = self._stapel[-1] if self._stapel else None
+        modus = oben[1] if oben else "wert"
+
+        if c in "{[":
+            if modus != "wert" or (oben is None and c != "{"):
+                raise JsonStreamFehler(f"Unerwartetes {c!r} an Position {pos}.")
+            self._wert_beginnt()
+            self._stapel.append([c, "schluessel" if c == "{" else "wert", True])
+            self._sicher = (pos + 1, self._schliesser())
+        elif c == '"':
+            if oben is not None and oben[0] == "{" and modus == "schluessel":
+                self._string_ist_schluessel = True
+            elif modus == "wert" and oben is not None:
+                self._string_ist_schluessel = False
+            else:
+                raise JsonStreamFehler(f"Unerwarteter String an Position {pos}.")
+            self._wert_beginnt()
+            self._in_string = True
+        elif c == ":":
+            if oben is None or oben[0] != "{" or modus != "doppelpunkt":
+                raise JsonStreamFehler(f"Unerwarteter Doppelpunkt an Position {pos}.")
+            oben[1] = "wert"
+        elif c == ",":
+            if oben is None or modus != "komma":
+                raise JsonStreamFehler(f"Unerwartetes Komma an Position {pos}.")
+            oben[1] = "schluessel" if oben[0] == "{" else "wert"
+        elif c in "}]":
+            erwartet = "{" if c == "}" else "["
+            leer_erlaubt = "schluessel" if c == "}" else "wert"
+            if (
+                oben is None
+                or oben[0] != erwartet
+                or not (modus == "komma" or (modus == leer_erlaubt and oben[2]))
+            ):
+                raise JsonStreamFehler(f"Unerwartetes {c!r} an Position {pos}.")
+            self._stapel.pop()
+            self._wert_fertig(pos + 1)
+        elif modus == "wert" and oben is not None and c in "-0123456789tfn":
+            self._wert_beginnt()
+            self._literal = [c]
+        else:
+            raise JsonStreamFehler(f"Unerwartetes Zeichen {c!r} an Position {pos}.")
+
+    def _verarbeite_string(self, c: str) -> None:
+        if self._escape:
+            self._escape = False
+            if c == "u":
+                self._unicode_rest = 4
+            elif c not in _ESCAPES:
+                raise JsonStreamFehler(f"Ungültige Escape-Sequenz \\{c}.")
+        elif self._unicode_rest:
+            if c not in "0123456789abcdefABCDEF":
+                raise JsonStreamFehler("Ungültige \\u-Escape-Sequenz.")
+            self._unicode_rest -= 1
+        elif c == "\\":
+            self._escape = True
+            self._escape_start = self._laenge
+        elif c == '"':
+            self._in_string = False
+            if self._string_ist_schluessel:
+                self._stapel[-1][1] = "doppelpunkt"
+            else:
+                self._wert_fertig(self._laenge + 1)
+
+    def _wert_beginnt(self) -> None:
+        if self._stapel:
+            self._stapel[-1][2] = False
+
+    def _wert_fertig(self, ende: int) -> None:
+        if not self._stapel:
+            self.fertig = True
+            self._sicher = (ende, "")
+            return
+        self._stapel[-1][1] = "komma"
+        self._sicher = (ende, self._schliesser())
+        if len(self._stapel) == 1:
+            self.felder_fertig += 1
+
+    def _schliesser(self) -> str:
+        return "".join(_SCHLIESSER[typ] for typ, _, _ in reversed(self._stapel))
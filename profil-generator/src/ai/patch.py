@@ -0,0 +1,178 @@
+"""
+Patch-basiertes Tailoring
+
+Statt das komplette Profil neu zu generieren, liefert Claude nur eine
+kompakte Änderungsliste, die lokal auf das Original angewendet wird:
+
+{
+  "zusammenfassung": "Neu formulierte Zusammenfassung",
+  "reihenfolge": {
+    "berufserfahrung": [2, 0, 1],            // Original-Indizes (_index)
+    "projekte": [1, 0],
+    "kernkompetenzen": ["Kubernetes", "Python"],
+    "skill_kategorien": ["Cloud", "Sprachen"]
+  },
+  "eintraege": [
+    {"liste": "berufserfahrung", "index": 0,
+     "beschreibung": "...", "highlights": ["...", "..."]}
+  ]
+}
+
+Änderbar sind nur Zusammenfassung, Beschreibungen, Highlights und die
+Reihenfolge. Titel, Firmen, Zeiträume, Technologien und Skills selbst
+bleiben unangetastet — sie können nicht "wegdriften". Nicht genannte
+Einträge bleiben in Originalreihenfolge hinten erhalten.
+
+Mit einer lokalen Relevanz-Bewertung (SkillMatcher.relevanz) wird die
+Eingabe fokussiert: relevante Einträge zuerst, irrelevante nur mit Titel,
+Firma und Zeitraum. Deren Texte darf der Patch dann nicht ändern.
+"""
+
+import json
+
+from src.models.profile import Kandidatenprofil
+
+ERFAHRUNGS_LISTEN = ("berufserfahrung", "projekte")
+
+
+class PatchFehler(ValueError):
+    """Die Änderungsliste passt nicht zum Profil (z.B. unbekannter Index)."""
+
+
+def patch_eingabe(profil: Kandidatenprofil, relevanz: dict[str, list[float]] | None = None) -> str:
+    """
+    Kompaktes Profil-JSON für die Patch-Anfrage: ohne Einrückung, ohne
+    interne Metadaten, Erfahrungen mit ihrem Original-Index (_index).
+
+    Args:
+        relevanz: Optional Relevanz pro Eintrag (SkillMatcher.relevanz) —
+                  sortiert die Erfahrungen und kürzt irrelevante Einträge
+    """
+    daten = profil.model_dump(exclude={"erstellt_am", "version", "modus", "projekt_referenz"})
+    gekuerzt = gekuerzte_eintraege(relevanz)
+    for liste in ERFAHRUNGS_LISTEN:
+        eintraege = [{"_index": i, **eintrag} for i, eintrag in enumerate(daten[liste])]
+        if relevanz is not None:
+            werte = relevanz[liste]
+            eintraege.sort(key=lambda e: -werte[e["_index"]])
+            eintraege = [
+                {k: e[k] for k in ("_index", "titel", "unternehmen", "zeitraum")}
+                if e["_index"] in gekuerzt[liste] else e
+                for e in eintraege
+            ]
+        daten[liste] = eintraege
+    return json.dumps(daten, ensure_ascii=False, separators=(",", ":"))
+
+
+def gekuerzte_eintraege(relevanz: dict[str, list[float]] | None) -> dict[str, set[int]]:
+    """
+    Einträge ohne jede Relevanz — aber nur, wenn es in der Liste überhaupt
+    relevante gibt (sonst fehlt der Maßstab, und nichts wird gekürzt).
+    """
+    gekuerzt = {liste: set() for liste in ERFAHRUNGS_LISTEN}
+    if relevanz is None:
+        return gekuerzt
+    for liste in ERFAHRUNGS_LISTEN:
+        werte = relevanz.get(liste, [])
+        if any(werte):
+            gekuerzt[liste] = {i for i, wert in enumerate(werte) if not wert}
+    return gekuerzt
+
+
+def wende_patch_an(
+    profil: Kandidatenprofil,
+    patch: dict,
+    gesperrt: dict[str, set[int]] | None = None,
+) -> Kandidatenprofil:
+    """
+    Wendet eine Änderungsliste auf eine Kopie des Profils an.
+
+    Args:
+        profil: Original-Kandidatenprofil (bleibt unverändert)
+        patch: Änderungsliste im oben beschriebenen Format
+        gesperrt: Einträge, deren Texte nicht geändert werden dürfen (z.B. weil
+                  Claude sie nur gekürzt gesehen hat); Umsortieren bleibt erlaubt
+
+    Returns:
+        Angepasstes Profil
+
+    Raises:
+        PatchFehler: bei strukturell ungültigen Änderungen
+    """
+    if not isinstance(patch, dict):
+        raise PatchFehler("Änderungsliste ist kein JSON-Objekt")
+
+    neu = profil.model_copy(deep=True)
+
+    zusammenfassung = patch.get("zusammenfassung")
+    if zusammenfassung:
+        if not isinstance(zusammenfassung, str):
+            raise PatchFehler("'zusammenfassung' muss ein Text sein")
+        neu.zusammenfassung = zusammenfassung
+
+    # Texte zuerst ändern — Indizes beziehen sich auf die Originalreihenfolge
+    for eintrag in patch.get("eintraege") or []:
+        _aendere_eintrag(neu, eintrag, gesperrt or {})
+
+    reihenfolge = patch.get("reihenfolge") or {}
+    if not isinstance(reihenfolge, dict):
+        raise PatchFehler("'reihenfolge' muss ein Objekt sein")
+    for liste in ERFAHRUNGS_LISTEN:
+        if liste in reihenfolge:
+            setattr(neu, liste, _sortiere_nach_index(getattr(neu, liste), reihenfolge[liste], liste))
+    if "kernkompetenzen" in reihenfolge:
+        neu.kernkompetenzen = _sortiere_nach_namen(neu.kernkompetenzen, reihenfolge["kernkompetenzen"])
+    if "skill_kategorien" in reihenfolge:
+        kategorien = _sortiere_nach_namen(list(neu.technische_skills), reihenfolge["skill_kategorien"])
+        neu.technische_skills = {k: neu.technische_skills[k] for k in kategorien}
+    return neu
+
+
+# ------------------------------------------------------------------
+# Private Hilfsfunktionen
+# ------------------------------------------------------------------
+
+def _aendere_eintrag(profil: Kandidatenprofil, eintrag: dict, gesperrt: dict[str, set[int]]) -> None:
+    if not isinstance(eintrag, dict):
+        raise PatchFehler("Eintrag in 'eintraege' ist kein Objekt")
+    liste = eintrag.get("liste", "berufserfahrung")
+    if liste not in ERFAHRUNGS_LISTEN:
+        raise PatchFehler(f"Unbekannte Liste: {liste!r}")
+    eintraege = getattr(profil, liste)
+    index = eintrag.get("index")
+    if not isinstance(index, int) or not 0 <= index < len(eintraege):
+        raise PatchFehler(f"Ungültiger Index {index!r} für {liste}")
+    if index in gesperrt.get(liste, ()):
+        return
+
+    ziel = eintraege[index]
+    if eintrag.get("beschreibung"):
+        ziel.beschreibung = str(eintrag["beschreibung"])
+    if "highlights" in eintrag:
+        highlights = eintrag["highlights"]
+        if not isinstance(highlights, list):
+            raise PatchFehler(f"'highlights' für {liste}[{index}] muss eine Liste sein")
+        ziel.highlights = [str(h) for h in highlights]
+
+
+def _sortiere_nach_index(eintraege: list, indizes, name: str) -> list:
+    """Genannte Indizes zuerst, fehlende in Originalreihenfolge dahinter."""
+    if not isinstance(indizes, list):
+        raise PatchFehler(f"Reihenfolge für {name} muss eine Liste sein")
+    gesehen: set[int] = set()
+    for i in indizes:
+        if not isinstance(i, int) or not 0 <= i < len(eintraege) or i in gesehen:
+            raise PatchFehler(f"Ungültiger oder doppelter Index {i!r} in Reihenfolge für {name}")
+        gesehen.add(i)
+    rest = [i for i in range(len(eintraege)) if i not in gesehen]
+    return [eintraege[i] for i in indizes + rest]
+
+
+def _sortiere_nach_namen(werte: list[str], namen) -> list[str]:
+    """Genannte Werte zuerst; unbekannte Namen werden ignoriert (keine neuen Skills)."""
+    if not isinstance(namen, list):
+        raise PatchFehler("Reihenfolge nach Namen muss eine Liste sein")
+    vorhanden = set(werte)
+    vorne = list(dict.fromkeys(n for n in namen if n in vorhanden))
+    genannt = set(vorne)
+    return vorne + [w for w in werte if w not in genannt]
@@ -7,12 +7,42 @@ Projekts an. Nutzt die Claude API (Anthropic).
 Funktionen:
   1. Profildaten aus Rohtext extrahieren (strukturieren)
   2. Profil auf Projektanforderungen zuschneiden
+  3. Beides in einer Anfrage (extrahiere_und_tailore) — liefert auch das
+     extrahierte Zwischenprofil, damit es gecacht werden kann (Kosten siehe dort)
+  4. Patch-Tailoring (tailore_profil_patch): Claude liefert nur eine
+     kompakte Änderungsliste, die lokal angewendet wird (patch.py)
+
+Extraktionen können über einen ExtraktionsCache (extraktions_cache.py)
+zwischengespeichert werden. Für die Massenverarbeitung gibt es async-
+Varianten auf Basis von AsyncAnthropic mit begrenzter Parallelität.
+Die Stream-Varianten liefern Zwischenstände, während Claude noch schreibt.
+
+Vor dem Tailoring sortiert ein lokaler SkillMatcher die Erfahrungen nach
+Relevanz vor (im Patch-Modus werden irrelevante Einträge zusätzlich gekürzt).
+
+Prompt-Caching: Die System-Prompts sind als cachebarer Präfix markiert;
+beim Tailoring mehrerer Projekte für denselben Kandidaten zusätzlich der
+Profil-JSON-Block. Verbrauchte Tokens (inkl. Cache-Lese-/Schreibanteil)
+liefert nutzung().
+
+Antworten werden tolerant dekodiert (json_decoder.py): kleine Formfehler
+werden repariert statt die Anfrage zu wiederholen, und bei stop_reason
+"max_tokens" wird nur der fehlende Rest nachgefordert.
 """
 
 import os
-import json
-from anthropic import Anthropic
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Iterator
+from anthropic import Anthropic, AsyncAnthropic, BadRequestError
+from src.ai.extraktions_cache import ExtraktionsCache
+from src.ai.json_decoder import JsonDekodierFehler, dekodiere_json, validiere_profil
+from src.ai.json_stream import InkrementellerJsonParser, JsonStreamFehler
+from src.ai.patch import gekuerzte_eintraege, patch_eingabe, wende_patch_an
+from src.matching.skill_matcher import SkillMatcher
 from src.models.profile import Kandidatenprofil, ProjektAnforderungen
+from src.telemetrie import telemetrie
 
 
 SYSTEM_PROMPT_EXTRAKTION = """Du bist ein erfahrener Recruiter-Assistent.
@@ -75,15 +105,150 @@ Regeln:
 - Antworte AUSSCHLIESSLICH mit einem validen JSON-Objekt (gleiche Struktur wie Eingabe)
 """
 
+SYSTEM_PROMPT_PATCH = """Du bist ein erfahrener Recruiter-Assistent und Texter.
+Deine Aufgabe ist es, ein Kandidatenprofil auf die Anforderungen eines
+bestimmten Projekts zuzuschneiden. Du gibst dafür NICHT das ganze Profil
+zurück, sondern nur eine kompakte Änderungsliste.
+
+Regeln:
+- Erfinde KEINE neuen Skills oder Erfahrungen — nutze nur was im Profil steht
+- Formuliere die Zusammenfassung gezielt auf das Projekt hin
+- Passe Beschreibungen und Highlights nur dort an, wo es für das Projekt zählt
+- Sortiere Berufserfahrung, Projekte, Kernkompetenzen und Skill-Kategorien nach Relevanz
+- Behalte den professionellen deutschen Stil bei
+- Lass alles weg, was unverändert bleibt
+
+Antworte AUSSCHLIESSLICH mit einem validen JSON-Objekt dieser Struktur:
+{
+  "zusammenfassung": "",
+  "reihenfolge": {
+    "berufserfahrung": [],
+    "projekte": [],
+    "kernkompetenzen": [],
+    "skill_kategorien": []
+  },
+  "eintraege": [
+    {"liste": "berufserfahrung", "index": 0, "beschreibung": "", "highlights": []}
+  ]
+}
+
+- "berufserfahrung"/"projekte" in "reihenfolge" und "index" in "eintraege"
+  sind die _index-Werte aus dem Profil
+- "kernkompetenzen" und "skill_kategorien" enthalten die Namen exakt wie im Profil
+- "highlights" ersetzt die Highlights des Eintrags vollständig
+- Einträge, die nur mit Titel, Unternehmen und Zeitraum im Profil stehen,
+  sind für das Projekt irrelevant: nur umsortieren, Texte nicht ändern
+"""
+
+SYSTEM_PROMPT_KOMBINIERT = SYSTEM_PROMPT_EXTRAKTION + """
+Anschließend schneidest du das extrahierte Profil auf die mitgelieferten
+Projektanforderungen zu.
+
+Regeln für das Zuschneiden:
+- Erfinde KEINE neuen Skills oder Erfahrungen — nutze nur was im Profil steht
+- Hebe relevante Skills und Erfahrungen stärker hervor
+- Passe Beschreibungen so an, dass sie die Projekt-Keywords aufgreifen
+- Sortiere Berufserfahrung und Skills nach Relevanz für das Projekt
+- Die Zusammenfassung soll das Profil gezielt auf das Projekt ausrichten
+- Behalte den professionellen deutschen Stil bei
+
+Antworte mit EINEM JSON-Objekt mit genau zwei Feldern in dieser Reihenfolge:
+{
+  "extrahiert": { ...das unveränderte, extrahierte Profil in obiger Struktur... },
+  "angepasst": { ...das auf das Projekt zugeschnittene Profil in derselben Struktur... }
+}
+"""
+
+# Markiert das Ende eines cachebaren Präfixes (Cache-Lebensdauer ~5 Minuten).
+# Präfixe unterhalb der Mindestlänge des Modells (z.B. 1024 Tokens) werden
+# von der API ohne Fehler einfach nicht gecacht.
+CACHE_MARKE = {"type": "ephemeral"}
+
+NUTZUNGS_FELDER = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_input_tokens",
+    "cache_creation_input_tokens",
+)
+
+# Zähler der Antwortverarbeitung (tolerantes JSON, Fortsetzungen)
+ANTWORT_ZAEHLER = (
+    "fortsetzungen",
+    "antworten_repariert",
+    "antworten_fehlgeschlagen",
+    "felder_verworfen",
+    "verschwendete_output_tokens",
+)
+
+# Wie oft bei stop_reason "max_tokens" der fehlende Rest nachgefordert wird
+MAX_FORTSETZUNGEN = 2
+
+
+@lru_cache(maxsize=8)
+def _gemeinsamer_client(api_key: str | None, base_url: str | None) -> Anthropic:
+    """
+    Ein Anthropic-Client pro (Key, Endpunkt) für den ganzen Prozess: Der
+    Verbindungspool bleibt warm, und ein neues ProfilTailoring kostet keinen
+    Client-Aufbau. Der synchrone Client ist threadsicher.
+    """
+    return Anthropic(api_key=api_key, base_url=base_url)
+
 
 class ProfilTailoring:
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: ExtraktionsCache | None = None,
+        base_url: str | None = None,
+        prompt_caching: bool = True,
+        vorsortieren: bool = True,
+    ):
         """
         Args:
             api_key: Anthropic API Key. Standard: ANTHROPIC_API_KEY Umgebungsvariable.
+            cache: Optionaler Cache für extrahierte Profile
+            base_url: Abweichender API-Endpunkt (z.B. lokaler Stub für Benchmarks)
+            prompt_caching: System-Prompts (und ggf. Profil-JSON) für das
+                            Anthropic Prompt-Caching markieren
+            vorsortieren: Profil vor dem Tailoring lokal nach Relevanz vorsortieren
         """
-        self.client = Anthropic(api_key=api_key or os.environ.get("ANTHROPIC_API_KEY"))
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+        self.base_url = base_url
+        self.client = _gemeinsamer_client(self.api_key, base_url)
         self.modell = "claude-sonnet-4-6"
+        self.cache = cache
+        self.prompt_caching = prompt_caching
+        self.matcher = SkillMatcher() if vorsortieren else None
+        self._async_client: AsyncAnthropic | None = None
+        # Zwischenprofil der letzten kombinierten Stream-Anfrage
+        self.letzte_extraktion: Kandidatenprofil | None = None
+        self._nutzung = dict.fromkeys(("anfragen",) + NUTZUNGS_FELDER + ANTWORT_ZAEHLER, 0)
+        self._nutzung_lock = threading.Lock()
+
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """
+        AsyncAnthropic-Client, wird beim ersten Zugriff erzeugt.
+        Der Verbindungspool gehört zum Event-Loop, in dem er zuerst benutzt wird.
+        """
+        if self._async_client is None:
+            self._async_client = AsyncAnthropic(api_key=self.api_key, base_url=self.base_url)
+        return self._async_client
+
+    def nutzung(self) -> dict:
+        """
+        Summierter Token-Verbrauch aller Anfragen dieser Instanz.
+
+        Returns:
+            Dict mit anfragen, input_tokens, output_tokens,
+            cache_read_input_tokens (aus dem Cache gelesen),
+            cache_creation_input_tokens (in den Cache geschrieben) sowie
+            fortsetzungen (nachgeforderte Reste bei max_tokens),
+            antworten_repariert, antworten_fehlgeschlagen, felder_verworfen
+            und verschwendete_output_tokens (Ausgabe unbrauchbarer Antworten)
+        """
+        with self._nutzung_lock:
+            return dict(self._nutzung)
 
     def extrahiere_profil(self, rohtext: str) -> Kandidatenprofil:
         """
@@ -96,32 +261,29 @@ class ProfilTailoring:
         Returns:
             Strukturiertes Kandidatenprofil
         """
-        antwort = self.client.messages.create(
-            model=self.modell,
-            max_tokens=4096,
-            system=SYSTEM_PROMPT_EXTRAKTION,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Extrahiere die Profildaten aus folgendem Text:\n\n{rohtext}",
-                }
-            ],
-        )
+        return self.extrahiere_profil_mit_status(rohtext)[0]
 
-        json_text = antwort.content[0].text.strip()
-        # JSON-Blöcke bereinigen falls Claude doch Markdown nutzt
-        if json_text.startswith("```"):
-            json_text = json_text.split("```")[1]
-            if json_text.startswith("json"):
-                json_text = json_text[4:]
+    def extrahiere_profil_mit_status(self, rohtext: str) -> tuple[Kandidatenprofil, bool]:
+        """
+        Wie extrahiere_profil(), meldet zusätzlich, ob das Ergebnis aus dem Cache kam.
 
-        daten = json.loads(json_text)
-        return Kandidatenprofil(**daten)
+        Returns:
+            (Kandidatenprofil, cache_treffer)
+        """
+        schluessel, profil = self._hole_aus_cache(rohtext)
+        if profil is not None:
+            return profil, True
+
+        profil = self._validiere(self._frage("claude_extraktion", self._anfrage_extraktion(rohtext)))
+        if schluessel is not None:
+            self.cache.lege_ab(schluessel, profil)
+        return profil, False
 
     def tailore_profil(
         self,
         profil: Kandidatenprofil,
         anforderungen: ProjektAnforderungen,
+        profil_cachen: bool = False,
     ) -> Kandidatenprofil:
         """
         Passt ein Profil an Projektanforderungen an.
@@ -129,42 +291,639 @@ class ProfilTailoring:
         Args:
             profil: Das Original-Kandidatenprofil
             anforderungen: Die Projektanforderungen
+            profil_cachen: Profil-JSON als Cache-Präfix markieren — lohnt sich,
+                           wenn derselbe Kandidat für weitere Projekte folgt
 
         Returns:
             Angepasstes Kandidatenprofil (neues Objekt, Original bleibt unverändert)
         """
-        profil_json = profil.model_dump_json(indent=2)
+        angepasst = self._validiere(
+            self._frage("claude_tailoring", self._anfrage_tailoring(profil, anforderungen, profil_cachen))
+        )
+        return self._als_tailored(angepasst, anforderungen)
+
+    def extrahiere_und_tailore(
+        self,
+        rohtext: str,
+        anforderungen: ProjektAnforderungen,
+    ) -> tuple[Kandidatenprofil, Kandidatenprofil]:
+        """
+        Extrahiert und schneidet zu in einer einzigen Anfrage (statt zwei
+        nacheinander). Ist die Extraktion bereits im Cache, wird nur noch
+        zugeschnitten.
+
+        Die Antwort enthält beide vollständigen Profile, die Ausgabe ist also
+        etwa doppelt so lang wie bei einer einzelnen Extraktion. Gespart wird
+        nur der zweite Roundtrip (Verbindungsaufbau, Eingabe-Verarbeitung) —
+        die Generierungszeit bleibt. Für das Tailoring mehrerer Projekte ist
+        extrahiere_profil() + tailore_profil_patch() meist schneller.
+
+        Args:
+            rohtext: Vollständiger Text des Kandidatenprofils
+            anforderungen: Die Projektanforderungen
+
+        Returns:
+            (extrahiertes Profil, angepasstes Profil) — das extrahierte Profil
+            landet außerdem im ExtraktionsCache
+        """
+        schluessel, profil = self._hole_aus_cache(rohtext)
+        if profil is not None:
+            return profil, self.tailore_profil(profil, anforderungen)
+
+        daten = self._frage("claude_kombiniert", self._anfrage_kombiniert(rohtext, anforderungen))
+        return self._verarbeite_kombiniert(daten, schluessel, anforderungen)
+
+    def tailore_profil_patch(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+        profil_cachen: bool = False,
+    ) -> Kandidatenprofil:
+        """
+        Wie tailore_profil(), aber Claude liefert nur eine Änderungsliste
+        (Reihenfolge, Zusammenfassung, Beschreibungen, Highlights), die lokal
+        auf eine Kopie des Profils angewendet wird. Deutlich weniger
+        Ausgabe-Tokens; Fakten wie Firmen oder Zeiträume bleiben unverändert.
+
+        Raises:
+            PatchFehler: wenn die Änderungsliste nicht zum Profil passt
+        """
+        fokus = self._fokus(profil, anforderungen, profil_cachen)
+        patch = self._frage(
+            "claude_tailoring",
+            self._anfrage_tailoring(profil, anforderungen, profil_cachen, patch=True, fokus=fokus),
+            patch=True,
+        )
+        return self._wende_patch_an(profil, patch, fokus, anforderungen)
+
+    # ------------------------------------------------------------------
+    # Streaming-Varianten (Zwischenstände für die UI)
+    # ------------------------------------------------------------------
+
+    def extrahiere_profil_stream(self, rohtext: str) -> Iterator[Kandidatenprofil]:
+        """
+        Wie extrahiere_profil(), liefert aber laufend teilweise gefüllte Profile
+        (Name, Titel, Skills zuerst), während Claude die Antwort streamt.
+        Das zuletzt gelieferte Profil ist das vollständige, validierte Ergebnis.
+
+        Raises:
+            JsonStreamFehler: sobald die Antwort erkennbar kein JSON ist (noch vor
+                              dem ersten Feld). Die Anfrage wird dann sofort abgebrochen.
+            JsonDekodierFehler: wenn auch der tolerante Decoder nichts retten kann
+        """
+        schluessel, profil = self._hole_aus_cache(rohtext)
+        if profil is not None:
+            yield profil
+            return
+
+        profil = yield from self._streame_profil(
+            self._anfrage_extraktion(rohtext), "claude_extraktion"
+        )
+        if schluessel is not None:
+            self.cache.lege_ab(schluessel, profil)
+        yield profil
+
+    def tailore_profil_stream(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+        profil_cachen: bool = False,
+    ) -> Iterator[Kandidatenprofil]:
+        """
+        Wie tailore_profil(), liefert aber laufend teilweise gefüllte Profile.
+        Das zuletzt gelieferte Profil ist das vollständige, angepasste Ergebnis.
+        """
+        angepasst = yield from self._streame_profil(
+            self._anfrage_tailoring(profil, anforderungen, profil_cachen), "claude_tailoring"
+        )
+        yield self._als_tailored(angepasst, anforderungen)
+
+    def extrahiere_und_tailore_stream(
+        self,
+        rohtext: str,
+        anforderungen: ProjektAnforderungen,
+    ) -> Iterator[Kandidatenprofil]:
+        """
+        Wie extrahiere_und_tailore(), liefert aber laufend Teilprofile — erst
+        das extrahierte, dann das angepasste. Das zuletzt gelieferte Profil ist
+        das vollständige, angepasste Ergebnis; das extrahierte Profil steht
+        danach in letzte_extraktion (und im Cache).
+        """
+        schluessel, profil = self._hole_aus_cache(rohtext)
+        if profil is not None:
+            self.letzte_extraktion = profil
+            yield from self.tailore_profil_stream(profil, anforderungen)
+            return
+
+        daten = yield from self._streame_json(
+            self._anfrage_kombiniert(rohtext, anforderungen),
+            "claude_kombiniert",
+            lambda d: d.get("angepasst") or d.get("extrahiert"),
+        )
+        _, angepasst = self._verarbeite_kombiniert(daten, schluessel, anforderungen)
+        yield angepasst
+
+    # ------------------------------------------------------------------
+    # Async-Varianten (Massenverarbeitung)
+    # ------------------------------------------------------------------
+
+    async def extrahiere_profil_async(self, rohtext: str) -> Kandidatenprofil:
+        """Wie extrahiere_profil(), aber nicht-blockierend über AsyncAnthropic."""
+        schluessel, profil = self._hole_aus_cache(rohtext)
+        if profil is not None:
+            return profil
+
+        profil = self._validiere(
+            await self._frage_async("claude_extraktion", self._anfrage_extraktion(rohtext))
+        )
+        if schluessel is not None:
+            self.cache.lege_ab(schluessel, profil)
+        return profil
+
+    async def tailore_profil_async(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+        profil_cachen: bool = False,
+        client: AsyncAnthropic | None = None,
+    ) -> Kandidatenprofil:
+        """
+        Wie tailore_profil(), aber nicht-blockierend über AsyncAnthropic.
+        client ersetzt async_client (z.B. ein Client pro Event-Loop).
+        """
+        angepasst = self._validiere(await self._frage_async(
+            "claude_tailoring", self._anfrage_tailoring(profil, anforderungen, profil_cachen), client=client
+        ))
+        return self._als_tailored(angepasst, anforderungen)
+
+    async def tailore_profil_patch_async(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+        profil_cachen: bool = False,
+        client: AsyncAnthropic | None = None,
+    ) -> Kandidatenprofil:
+        """Wie tailore_profil_patch(), aber nicht-blockierend (client wie bei tailore_profil_async)."""
+        fokus = self._fokus(profil, anforderungen, profil_cachen)
+        patch = await self._frage_async(
+            "claude_tailoring",
+            self._anfrage_tailoring(profil, anforderungen, profil_cachen, patch=True, fokus=fokus),
+            client=client,
+            patch=True,
+        )
+        return self._wende_patch_an(profil, patch, fokus, anforderungen)
+
+    async def extrahiere_und_tailore_async(
+        self,
+        rohtext: str,
+        anforderungen: ProjektAnforderungen,
+    ) -> tuple[Kandidatenprofil, Kandidatenprofil]:
+        """Wie extrahiere_und_tailore(), aber nicht-blockierend über AsyncAnthropic."""
+        schluessel, profil = self._hole_aus_cache(rohtext)
+        if profil is not None:
+            return profil, await self.tailore_profil_async(profil, anforderungen)
+
+        daten = await self._frage_async("claude_kombiniert", self._anfrage_kombiniert(rohtext, anforderungen))
+        return self._verarbeite_kombiniert(daten, schluessel, anforderungen)
+
+    def tailore_fuer_projekte(
+        self,
+        profil: Kandidatenprofil,
+        projekte: list[ProjektAnforderungen],
+        max_parallel: int = 5,
+        patch: bool = False,
+    ) -> list[Kandidatenprofil | Exception]:
+        """
+        Schneidet einen Kandidaten gleichzeitig auf mehrere Projekte zu
+        (blockierender Einstieg für UI und Skripte). Das Profil-JSON wird
+        dabei über das Prompt-Caching zwischen den Anfragen geteilt.
+
+        Returns:
+            Ergebnisse in Projektreihenfolge; fehlgeschlagene Einträge
+            enthalten die Exception statt eines Profils
+        """
+        async def ausfuehren():
+            # Eigener Client für diesen Event-Loop — lokal, damit parallele
+            # Aufrufe auf derselben Instanz sich nicht gegenseitig stören
+            client = AsyncAnthropic(api_key=self.api_key, base_url=self.base_url)
+            try:
+                return await self.tailore_profile_async(
+                    [(profil, projekt) for projekt in projekte], max_parallel, patch, client=client
+                )
+            finally:
+                await client.close()
+
+        return asyncio.run(ausfuehren())
+
+    async def extrahiere_profile_async(
+        self,
+        rohtexte: list[str],
+        max_parallel: int = 5,
+    ) -> list[Kandidatenprofil | Exception]:
+        """
+        Extrahiert viele Profile mit höchstens max_parallel gleichzeitigen Anfragen.
+
+        Returns:
+            Ergebnisse in Eingabereihenfolge; fehlgeschlagene Einträge
+            enthalten die Exception statt eines Profils
+        """
+        return await self._parallel(
+            [lambda t=t: self.extrahiere_profil_async(t) for t in rohtexte],
+            max_parallel,
+        )
+
+    async def tailore_profile_async(
+        self,
+        auftraege: list[tuple[Kandidatenprofil, ProjektAnforderungen]],
+        max_parallel: int = 5,
+        patch: bool = False,
+        client: AsyncAnthropic | None = None,
+    ) -> list[Kandidatenprofil | Exception]:
+        """
+        Schneidet viele (Profil, Anforderungen)-Paare mit begrenzter Parallelität zu
+        (mit patch=True über tailore_profil_patch_async; client wie dort).
+
+        Kommt ein Profil mehrfach vor, wird sein JSON-Block gecacht: Die erste
+        Anfrage pro Profil läuft vorab und legt den Cache an, die übrigen
+        lesen ihn anschließend parallel.
+
+        Returns:
+            Ergebnisse in Eingabereihenfolge; fehlgeschlagene Einträge
+            enthalten die Exception statt eines Profils
+        """
+        haeufigkeit: dict[int, int] = {}
+        for p, _ in auftraege:
+            haeufigkeit[id(p)] = haeufigkeit.get(id(p), 0) + 1
+
+        vorab: list[int] = []
+        gesehen: set[int] = set()
+        for i, (p, _) in enumerate(auftraege):
+            if self.prompt_caching and haeufigkeit[id(p)] > 1 and id(p) not in gesehen:
+                gesehen.add(id(p))
+                vorab.append(i)
+        vorab_indizes = set(vorab)
+        rest = [i for i in range(len(auftraege)) if i not in vorab_indizes]
+
+        tailore = self.tailore_profil_patch_async if patch else self.tailore_profil_async
+
+        def fabrik(i: int):
+            p, a = auftraege[i]
+            return lambda: tailore(p, a, profil_cachen=haeufigkeit[id(p)] > 1, client=client)
+
+        ergebnisse: list = [None] * len(auftraege)
+        for gruppe in (vorab, rest):
+            for i, ergebnis in zip(
+                gruppe, await self._parallel([fabrik(i) for i in gruppe], max_parallel)
+            ):
+                ergebnisse[i] = ergebnis
+        return ergebnisse
+
+    # ------------------------------------------------------------------
+    # Private Hilfsmethoden
+    # ------------------------------------------------------------------
+
+    def _hole_aus_cache(self, rohtext: str) -> tuple[str | None, Kandidatenprofil | None]:
+        if self.cache is None:
+            return None, None
+        with telemetrie.stufe("extraktion_cache") as stufe:
+            schluessel = self.cache.schluessel(rohtext, self.modell, SYSTEM_PROMPT_EXTRAKTION)
+            profil = self.cache.hole(schluessel)
+            stufe.setze(treffer=profil is not None)
+        return schluessel, profil
+
+    def _anfrage_extraktion(self, rohtext: str) -> dict:
+        return {
+            "model": self.modell,
+            "max_tokens": 4096,
+            "system": self._system(SYSTEM_PROMPT_EXTRAKTION),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"Extrahiere die Profildaten aus folgendem Text:\n\n{rohtext}",
+                }
+            ],
+        }
 
+    def _anfrage_tailoring(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+        profil_cachen: bool = False,
+        patch: bool = False,
+        fokus: dict[str, list[float]] | None = None,
+    ) -> dict:
+        if fokus is None:
+            fokus = self._fokus(profil, anforderungen, profil_cachen)
+        # Patch-Modus: kompaktes JSON mit _index statt eingerücktem Volltext
+        if patch:
+            profil_json = patch_eingabe(profil, fokus)
+        elif fokus is not None:
+            profil_json = self.matcher.schnell_zuschneiden(profil, anforderungen).model_dump_json(indent=2)
+        else:
+            profil_json = profil.model_dump_json(indent=2)
         anforderungs_text = self._formatiere_anforderungen(anforderungen)
+        if profil_cachen and self.matcher is not None:
+            # Profil-Block bleibt für den Cache unverändert → Rangfolge als Hinweis
+            anforderungs_text += self._rangfolge_hinweis(self.matcher.relevanz(profil, anforderungen))
+        auftrag = (
+            "Erstelle die Änderungsliste für dieses Projekt. Antworte nur mit dem JSON."
+            if patch else
+            "Passe das Profil optimal auf das Projekt an. Antworte nur mit dem angepassten JSON."
+        )
+        # Profil und Projekt als getrennte Blöcke: der Profil-Block ist pro
+        # Kandidat identisch und kann als Präfix gecacht werden
+        profil_block = {"type": "text", "text": f"KANDIDATENPROFIL (JSON):\n{profil_json}\n\n"}
+        if self.prompt_caching and profil_cachen:
+            profil_block["cache_control"] = CACHE_MARKE
+        return {
+            "model": self.modell,
+            "max_tokens": 2048 if patch else 8192,
+            "system": self._system(SYSTEM_PROMPT_PATCH if patch else SYSTEM_PROMPT_TAILORING),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        profil_block,
+                        {
+                            "type": "text",
+                            "text": f"PROJEKTANFORDERUNGEN:\n{anforderungs_text}\n\n{auftrag}",
+                        },
+                    ],
+                }
+            ],
+        }
+
+    def _fokus(
+        self, profil: Kandidatenprofil, anforderungen: ProjektAnforderungen, profil_cachen: bool
+    ) -> dict[str, list[float]] | None:
+        """
+        Relevanz pro Eintrag für die fokussierte Eingabe. Nicht bei gecachtem
+        Profil-Block — der muss für alle Projekte identisch bleiben.
+        """
+        if self.matcher is None or profil_cachen:
+            return None
+        return self.matcher.relevanz(profil, anforderungen)
+
+    @staticmethod
+    def _rangfolge_hinweis(relevanz: dict[str, list[float]]) -> str:
+        zeilen = []
+        for liste, werte in relevanz.items():
+            if any(werte):
+                reihenfolge = sorted(range(len(werte)), key=lambda i: -werte[i])
+                zeilen.append(f"{liste}: {', '.join(map(str, reihenfolge))}")
+        if not zeilen:
+            return ""
+        return "\n\nLokale Vorsortierung nach Relevanz (Original-Indizes):\n" + "\n".join(zeilen)
 
-        antwort = self.client.messages.create(
-            model=self.modell,
-            max_tokens=8192,
-            system=SYSTEM_PROMPT_TAILORING,
-            messages=[
+    def _wende_patch_an(
+        self, profil: Kandidatenprofil, patch: dict, fokus, anforderungen: ProjektAnforderungen
+    ) -> Kandidatenprofil:
+        angepasst = wende_patch_an(profil, patch, gekuerzte_eintraege(fokus))
+        return self._als_tailored(angepasst, anforderungen)
+
+    def _anfrage_kombiniert(self, rohtext: str, anforderungen: ProjektAnforderungen) -> dict:
+        anforderungs_text = self._formatiere_anforderungen(anforderungen)
+        return {
+            "model": self.modell,
+            "max_tokens": 16384,
+            "system": self._system(SYSTEM_PROMPT_KOMBINIERT),
+            "messages": [
                 {
                     "role": "user",
                     "content": (
-                        f"KANDIDATENPROFIL (JSON):\n{profil_json}\n\n"
+                        f"PROFILTEXT:\n{rohtext}\n\n"
                         f"PROJEKTANFORDERUNGEN:\n{anforderungs_text}\n\n"
-                        "Passe das Profil optimal auf das Projekt an. "
-                        "Antworte nur mit dem angepassten JSON."
+                        "Extrahiere das Profil und passe es optimal auf das Projekt an. "
+                        "Antworte nur mit dem JSON-Objekt."
                     ),
                 }
             ],
-        )
+        }
+
+    def _verarbeite_kombiniert(
+        self, daten: dict, schluessel: str | None, anforderungen: ProjektAnforderungen
+    ) -> tuple[Kandidatenprofil, Kandidatenprofil]:
+        """Validiert beide Teile der kombinierten Antwort und cacht die Extraktion."""
+        if "extrahiert" not in daten or "angepasst" not in daten:
+            raise ValueError("Antwort enthält nicht beide Felder 'extrahiert' und 'angepasst'")
+        extrahiert = self._validiere(daten["extrahiert"])
+        if schluessel is not None:
+            self.cache.lege_ab(schluessel, extrahiert)
+        self.letzte_extraktion = extrahiert
+        angepasst = self._als_tailored(self._validiere(daten["angepasst"]), anforderungen)
+        return extrahiert, angepasst
+
+    def _system(self, prompt: str) -> str | list[dict]:
+        """System-Prompt, bei aktivem Prompt-Caching als markierter Block."""
+        if not self.prompt_caching:
+            return prompt
+        return [{"type": "text", "text": prompt, "cache_control": CACHE_MARKE}]
+
+    def _frage(self, stufen_name: str, anfrage: dict, **attribute) -> dict:
+        """
+        Sendet die Anfrage und dekodiert die Antwort tolerant. Bricht Claude
+        bei max_tokens ab, wird nur der fehlende Rest nachgefordert.
+        """
+        with telemetrie.stufe(stufen_name, modell=self.modell, **attribute) as stufe:
+            antwort = self.client.messages.create(**anfrage)
+            werte = self._protokolliere(stufe, antwort)
+            text = antwort.content[0].text
+            for nr in range(1, MAX_FORTSETZUNGEN + 1):
+                if antwort.stop_reason != "max_tokens":
+                    break
+                try:
+                    antwort = self.client.messages.create(**self._fortsetzung(anfrage, text))
+                except BadRequestError:
+                    # Modell ohne Assistant-Prefill: abgeschnittenes Ende reparieren
+                    break
+                werte = self._protokolliere(stufe, antwort, werte)
+                stufe.setze(fortsetzungen=nr)
+                text = self._haenge_an(text, antwort.content[0].text)
+            return self._dekodiere(stufe, text, werte["output_tokens"])
+
+    async def _frage_async(
+        self, stufen_name: str, anfrage: dict, client: AsyncAnthropic | None = None, **attribute
+    ) -> dict:
+        """Wie _frage(), aber nicht-blockierend über client (Standard: async_client)."""
+        client = client or self.async_client
+        with telemetrie.stufe(stufen_name, modell=self.modell, **attribute) as stufe:
+            antwort = await client.messages.create(**anfrage)
+            werte = self._protokolliere(stufe, antwort)
+            text = antwort.content[0].text
+            for nr in range(1, MAX_FORTSETZUNGEN + 1):
+                if antwort.stop_reason != "max_tokens":
+                    break
+                try:
+                    antwort = await client.messages.create(**self._fortsetzung(anfrage, text))
+                except BadRequestError:
+                    break
+                werte = self._protokolliere(stufe, antwort, werte)
+                stufe.setze(fortsetzungen=nr)
+                text = self._haenge_an(text, antwort.content[0].text)
+            return self._dekodiere(stufe, text, werte["output_tokens"])
+
+    @staticmethod
+    def _fortsetzung(anfrage: dict, bisher: str) -> dict:
+        """
+        Anfrage für den fehlenden Rest: die bisherige Antwort als Assistant-
+        Prefill (ohne Leerraum am Ende, den lehnt die API ab). System-Prompt
+        und Nachricht bleiben gleich, ein gecachter Präfix wird also
+        wiederverwendet.
+        """
+        prefill = {"role": "assistant", "content": bisher.rstrip()}
+        return {**anfrage, "messages": anfrage["messages"] + [prefill]}
 
-        json_text = antwort.content[0].text.strip()
-        if json_text.startswith("```"):
-            json_text = json_text.split("```")[1]
-            if json_text.startswith("json"):
-                json_text = json_text[4:]
+    @staticmethod
+    def _haenge_an(bisher: str, rest: str) -> str:
+        """
+        Hängt einen nachgeforderten Rest an. Endete bisher auf Leerraum (z.B.
+        ein Leerzeichen mitten in einem String), fehlt er im Prefill — er
+        bleibt hier erhalten, vom Modell vorangestellter Leerraum fällt weg.
+        """
+        if bisher[-1:].isspace():
+            rest = rest.lstrip()
+        return bisher + rest
 
-        daten = json.loads(json_text)
-        angepasstes_profil = Kandidatenprofil(**daten)
-        angepasstes_profil.modus = "tailored"
-        angepasstes_profil.projekt_referenz = anforderungen.titel
-        return angepasstes_profil
+    def _dekodiere(self, stufe, text: str, ausgabe_tokens: int) -> dict:
+        """Toleranter JSON-Decoder; Reparaturen und verlorene Ausgabe-Tokens werden gezählt."""
+        try:
+            daten, reparaturen = dekodiere_json(text)
+        except JsonDekodierFehler:
+            with self._nutzung_lock:
+                self._nutzung["antworten_fehlgeschlagen"] += 1
+                self._nutzung["verschwendete_output_tokens"] += ausgabe_tokens
+            stufe.setze(verschwendete_tokens=ausgabe_tokens)
+            raise
+        if reparaturen:
+            with self._nutzung_lock:
+                self._nutzung["antworten_repariert"] += 1
+            stufe.setze(reparaturen=reparaturen)
+        return daten
+
+    def _validiere(self, daten: dict) -> Kandidatenprofil:
+        """Validiert gegen Kandidatenprofil; ungültige Einzelfelder werden verworfen und gezählt."""
+        try:
+            profil, entfernt = validiere_profil(daten)
+        except JsonDekodierFehler:
+            with self._nutzung_lock:
+                self._nutzung["antworten_fehlgeschlagen"] += 1
+            raise
+        if entfernt:
+            with self._nutzung_lock:
+                self._nutzung["felder_verworfen"] += len(entfernt)
+        return profil
+
+    def _streame_profil(self, anfrage: dict, stufen_name: str):
+        """
+        Streamt die Antwort durch den inkrementellen Parser und liefert
+        Teilprofile. Gibt (per return) das vollständige Profil zurück.
+        """
+        daten = yield from self._streame_json(anfrage, stufen_name, lambda d: d)
+        return self._validiere(daten)
+
+    def _streame_json(self, anfrage: dict, stufen_name: str, vorschau, min_zeichen: int = 400):
+        """
+        Streamt die Antwort durch den inkrementellen Parser. vorschau wählt aus
+        dem Zwischenstand die Profildaten für die Teilprofile aus.
+        Gibt (per return) das vollständige JSON-Objekt zurück.
+
+        Meldet der Parser einen Fehler, bevor das erste Feld fertig ist, wird
+        sofort abgebrochen. Spätere Fehler (z.B. ein Komma zu viel) beenden nur
+        die Vorschau; am Ende repariert der tolerante Decoder. Bei max_tokens
+        wird der Rest wie in _frage() nachgefordert.
+        """
+        parser = InkrementellerJsonParser()
+        text = ""
+        werte = None
+        seit_snapshot = 0
+        with telemetrie.stufe(stufen_name, modell=self.modell, stream=True) as stufe:
+            for nr in range(MAX_FORTSETZUNGEN + 1):
+                if nr:
+                    stufe.setze(fortsetzungen=nr)
+                naechste = self._fortsetzung(anfrage, text) if nr else anfrage
+                # Wie _haenge_an(): Leerraum am Anfang des Rests nicht doppelt
+                anfang_kuerzen = bool(nr) and text[-1:].isspace()
+                try:
+                    with self.client.messages.stream(**naechste) as stream:
+                        for stueck in stream.text_stream:
+                            if anfang_kuerzen:
+                                stueck = stueck.lstrip()
+                                if not stueck:
+                                    continue
+                                anfang_kuerzen = False
+                            text += stueck
+                            if parser is None or parser.fertig:
+                                # Vorschau beendet bzw. nur noch schließender Markdown-Block o.ä.
+                                continue
+                            try:
+                                neue_felder = parser.fuettere(stueck)
+                            except JsonStreamFehler:
+                                if not parser.felder_fertig:
+                                    with self._nutzung_lock:
+                                        self._nutzung["antworten_fehlgeschlagen"] += 1
+                                    raise
+                                parser = None
+                                continue
+                            seit_snapshot += len(stueck)
+                            if neue_felder or seit_snapshot >= min_zeichen:
+                                seit_snapshot = 0
+                                snapshot = parser.snapshot()
+                                teilprofil = _teilprofil(vorschau(snapshot) if snapshot else None)
+                                if teilprofil is not None:
+                                    yield teilprofil
+                        antwort = stream.get_final_message()
+                except BadRequestError:
+                    if not nr:
+                        raise
+                    break
+                werte = self._protokolliere(stufe, antwort, werte)
+                if antwort.stop_reason != "max_tokens":
+                    break
+            if parser is not None and parser.fertig:
+                return parser.ergebnis()
+            return self._dekodiere(stufe, text, werte["output_tokens"])
+
+    def _protokolliere(self, stufe, antwort, bisher: dict | None = None) -> dict:
+        """
+        Token-Verbrauch summieren und mit stop_reason an die Telemetrie-Stufe hängen.
+
+        Args:
+            bisher: Summen der vorherigen Teilantworten derselben Stufe (Fortsetzungen)
+
+        Returns:
+            Summierte Token-Werte der Stufe
+        """
+        werte = {feld: getattr(antwort.usage, feld, None) or 0 for feld in NUTZUNGS_FELDER}
+        with self._nutzung_lock:
+            self._nutzung["anfragen"] += 1
+            if bisher is not None:
+                self._nutzung["fortsetzungen"] += 1
+            for feld, wert in werte.items():
+                self._nutzung[feld] += wert
+        if bisher is not None:
+            werte = {feld: bisher[feld] + wert for feld, wert in werte.items()}
+        stufe.setze(stop_reason=antwort.stop_reason, **werte)
+        return werte
+
+    def _als_tailored(
+        self, profil: Kandidatenprofil, anforderungen: ProjektAnforderungen
+    ) -> Kandidatenprofil:
+        profil.modus = "tailored"
+        profil.projekt_referenz = anforderungen.titel
+        return profil
+
+    @staticmethod
+    async def _parallel(aufgaben: list, max_parallel: int) -> list:
+        """Führt Coroutine-Fabriken mit Semaphore aus; Fehler werden pro Eintrag zurückgegeben."""
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+        async def begrenzt(aufgabe):
+            async with semaphore:
+                return await aufgabe()
+
+        return await asyncio.gather(
+            *(begrenzt(aufgabe) for aufgabe in aufgaben), return_exceptions=True
+        )
 
     def _formatiere_anforderungen(self, anf: ProjektAnforderungen) -> str:
         teile = [f"Projekttitel: {anf.titel}"]
@@ -181,3 +940,16 @@ class ProfilTailoring:
         elif anf.beschreibung:
             teile.append(f"\nBeschreibung:\n{anf.beschreibung}")
         return "\n".join(teile)
+
+
+def _teilprofil(daten: dict | None) -> Kandidatenprofil | None:
+    """
+    Validiert einen Zwischenstand. Unvollständige Listeneinträge (z.B. eine
+    Erfahrung ohne Titel) und ungültige Felder werden weggelassen.
+    """
+    if not daten:
+        return None
+    try:
+        return validiere_profil(daten)[0]
+    except JsonDekodierFehler:
+        return None
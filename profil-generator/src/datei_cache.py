@@ -0,0 +1,159 @@
+"""
+Datei-Cache
+
+Gemeinsame Basis der inhaltsadressierten Festplatten-Caches
+(ExtraktionsCache, ArtefaktCache). Jeder Eintrag ist eine Datei
+<schluessel><endung> in einem Ordner; die Unterklassen legen nur fest,
+wie der Schlüssel entsteht und was in der Datei steht.
+
+  - Schreiben atomar (temporäre Datei + os.replace)
+  - Lesen setzt die mtime neu → mtime = letzte Nutzung (LRU)
+  - Einträge, die länger als max_alter_tage nicht genutzt wurden, verfallen
+  - Übersteigt der Ordner max_megabyte, fliegen die am längsten nicht
+    genutzten Einträge zuerst
+
+Aufräumen durchsucht den ganzen Ordner und läuft deshalb nicht bei jedem
+Schreiben, sondern wenn die mitgeführte Größe die Grenze überschreitet
+oder spätestens alle aufraeumen_alle Schreibvorgänge. Dabei werden auch
+liegengebliebene .tmp-Dateien abgebrochener Schreibvorgänge gelöscht.
+"""
+
+from pathlib import Path
+import os
+import threading
+import time
+
+# Temporäre Dateien, die so alt sind, stammen von abgebrochenen Schreibvorgängen
+TMP_MAX_ALTER_S = 3600
+
+
+class DateiCache:
+    def __init__(
+        self,
+        ordner: str | Path,
+        endungen: tuple[str, ...],
+        max_megabyte: float,
+        max_alter_tage: float,
+        aufraeumen_alle: int = 50,
+    ):
+        """
+        Args:
+            ordner: Verzeichnis für die Cache-Dateien
+            endungen: Dateiendungen der Einträge (z.B. (".json",))
+            max_megabyte: Maximale Gesamtgröße des Caches
+            max_alter_tage: Maximale Zeit seit der letzten Nutzung eines Eintrags
+            aufraeumen_alle: Spätestens nach so vielen Schreibvorgängen aufräumen
+        """
+        self.ordner = Path(ordner)
+        self.ordner.mkdir(parents=True, exist_ok=True)
+        self.endungen = endungen
+        self.max_bytes = int(max_megabyte * 1024 * 1024)
+        self.max_alter_s = max_alter_tage * 24 * 3600
+        self.aufraeumen_alle = aufraeumen_alle
+        self._lock = threading.Lock()
+        self.treffer = 0
+        self.fehlschlaege = 0
+        # Geschätzte Ordnergröße (None = noch nicht gemessen) und Schreibvorgänge seit dem Aufräumen
+        self._bytes: int | None = None
+        self._seit_aufraeumen = 0
+
+    # ------------------------------------------------------------------
+    # Öffentliche Methoden
+    # ------------------------------------------------------------------
+
+    def raeume_auf(self) -> None:
+        """Entfernt abgelaufene Einträge und hält die Größengrenze ein (LRU)."""
+        jetzt = time.time()
+        for pfad in self.ordner.glob("*.tmp"):
+            try:
+                if jetzt - pfad.stat().st_mtime > TMP_MAX_ALTER_S:
+                    pfad.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+        dateien = []
+        for pfad in self._dateien():
+            try:
+                stat = pfad.stat()
+            except FileNotFoundError:
+                continue
+            dateien.append((stat.st_mtime, stat.st_size, pfad))
+
+        gesamt = sum(groesse for _, groesse, _ in dateien)
+        for mtime, groesse, pfad in sorted(dateien):
+            # Ältester Zugriff zuerst
+            if gesamt <= self.max_bytes and jetzt - mtime <= self.max_alter_s:
+                break
+            pfad.unlink(missing_ok=True)
+            gesamt -= groesse
+        with self._lock:
+            self._bytes = gesamt
+            self._seit_aufraeumen = 0
+
+    def leeren(self) -> None:
+        for pfad in self._dateien():
+            pfad.unlink(missing_ok=True)
+        with self._lock:
+            self._bytes = 0
+
+    def statistik(self) -> dict:
+        """Treffer-/Fehlschlag-Zähler und aktuelle Größe des Caches."""
+        dateien = self._dateien()
+        with self._lock:
+            treffer, fehlschlaege = self.treffer, self.fehlschlaege
+        anfragen = treffer + fehlschlaege
+        return {
+            "treffer": treffer,
+            "fehlschlaege": fehlschlaege,
+            "trefferquote": round(treffer / anfragen, 3) if anfragen else 0.0,
+            "eintraege": len(dateien),
+            "bytes": sum(p.stat().st_size for p in dateien if p.exists()),
+        }
+
+    # ------------------------------------------------------------------
+    # Für Unterklassen
+    # ------------------------------------------------------------------
+
+    def _lies(self, pfad: Path) -> bytes | None:
+        """Inhalt eines Eintrags (und als genutzt markieren) oder None."""
+        try:
+            if time.time() - pfad.stat().st_mtime > self.max_alter_s:
+                pfad.unlink(missing_ok=True)
+                return None
+            daten = pfad.read_bytes()
+            os.utime(pfad)
+        except OSError:
+            return None
+        return daten
+
+    def _schreibe(self, pfad: Path, daten: bytes) -> None:
+        """Schreibt einen Eintrag atomar und räumt bei Bedarf auf."""
+        tmp_pfad = pfad.with_name(f"{pfad.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_pfad.write_bytes(daten)
+        try:
+            # Überschriebener Eintrag zählt nicht doppelt
+            alte_groesse = pfad.stat().st_size
+        except FileNotFoundError:
+            alte_groesse = 0
+        os.replace(tmp_pfad, pfad)
+        with self._lock:
+            self._seit_aufraeumen += 1
+            if self._bytes is not None:
+                self._bytes += len(daten) - alte_groesse
+            faellig = (
+                self._bytes is None
+                or self._bytes > self.max_bytes
+                or self._seit_aufraeumen >= self.aufraeumen_alle
+            )
+        if faellig:
+            self.raeume_auf()
+
+    def _zaehle(self, ergebnis):
+        with self._lock:
+            if ergebnis is None:
+                self.fehlschlaege += 1
+            else:
+                self.treffer += 1
+        return ergebnis
+
+    def _dateien(self) -> list[Path]:
+        return [pfad for endung in self.endungen for pfad in self.ordner.glob(f"*{endung}")]
@@ -1,4 +1,4 @@
-from .docx_generator import DocxGenerator
+from .docx_generator import DocxGenerator, FehlendeVariablenFehler
 from .pdf_converter import PdfConverter
 
-__all__ = ["DocxGenerator", "PdfConverter"]
+__all__ = ["DocxGenerator", "FehlendeVariablenFehler", "PdfConverter"]
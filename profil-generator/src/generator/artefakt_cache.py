@@ -0,0 +1,86 @@
+"""
+Artefakt-Cache
+
+Persistenter, inhaltsadressierter Cache für fertige Dokumente (DOCX/PDF).
+Schlüssel: SHA-256 über Template-Inhalts-Hash + kanonisches Profil-JSON +
+Ausgabeformat (+ Erstellungsdatum, siehe unten). Eine identische Anfrage —
+gleiches Template, gleiches Profil — liefert die vorhandenen Bytes zurück,
+ohne erneut zu rendern oder LibreOffice zu starten.
+
+Datum:
+  erstellt_datum ("Stand: 17.10.2026") wird beim Rendern auf heute gesetzt.
+  Verwendet das Template diese Variable, gehört das Datum zum Schlüssel —
+  ein Dokument von gestern wird also nicht wieder ausgeliefert. Templates
+  ohne Datum teilen sich den Eintrag über Tage hinweg.
+
+Nicht im Schlüssel: erstellt_am (interne Metadaten, nicht im Dokument).
+
+Eviction wie beim Extraktions-Cache (siehe DateiCache): Einträge, die
+länger als max_alter_tage nicht genutzt wurden, verfallen; über
+max_megabyte fliegen die am längsten nicht genutzten zuerst (LRU).
+
+HINWEIS: Die Dokumente enthalten personenbezogene Daten und liegen deshalb
+standardmäßig in .cache/ (nicht eingecheckt).
+"""
+
+from pathlib import Path
+import hashlib
+import json
+
+from src.datei_cache import DateiCache
+from src.models.profile import Kandidatenprofil
+
+# Erhöhen, wenn sich der Template-Kontext (DocxGenerator) ändert
+ARTEFAKT_VERSION = 1
+FORMATE = ("docx", "pdf")
+
+
+def profil_hash(profil: Kandidatenprofil) -> str:
+    """Hash über das kanonische Profil-JSON (sortierte Schlüssel, ohne erstellt_am)."""
+    daten = profil.model_dump(mode="json", exclude={"erstellt_am"})
+    kanonisch = json.dumps(daten, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(kanonisch.encode("utf-8")).hexdigest()
+
+
+def artefakt_schluessel(
+    template_hash: str,
+    profil: Kandidatenprofil,
+    format: str,
+    datum: str | None = None,
+) -> str:
+    """
+    Schlüssel für ein Dokument.
+
+    Args:
+        template_hash: SHA-256 des Template-Inhalts
+        format: "docx" oder "pdf"
+        datum: Gerendertes erstellt_datum, falls das Template es verwendet
+    """
+    if format not in FORMATE:
+        raise ValueError(f"Unbekanntes Format: {format}")
+    basis = json.dumps([ARTEFAKT_VERSION, template_hash, profil_hash(profil), format, datum])
+    return f"{hashlib.sha256(basis.encode('utf-8')).hexdigest()}.{format}"
+
+
+class ArtefaktCache(DateiCache):
+    def __init__(
+        self,
+        ordner: str | Path = ".cache/artefakte",
+        max_megabyte: float = 200,
+        max_alter_tage: float = 30,
+    ):
+        """
+        Args:
+            ordner: Verzeichnis für die Cache-Dateien
+            max_megabyte: Maximale Gesamtgröße des Caches
+            max_alter_tage: Maximale Zeit seit der letzten Nutzung eines Eintrags
+        """
+        super().__init__(ordner, tuple(f".{format}" for format in FORMATE), max_megabyte, max_alter_tage)
+
+    def hole(self, schluessel: str) -> bytes | None:
+        """Gibt die gecachten Bytes zurück oder None (Fehlschlag)."""
+        return self._zaehle(self._lies(self.ordner / schluessel))
+
+    def lege_ab(self, schluessel: str, daten: bytes) -> None:
+        """Speichert ein Dokument (atomar) und räumt ggf. auf."""
+        self._schreibe(self.ordner / schluessel, daten)
@@ -7,31 +7,179 @@ Strategie:
   - Nutzt docxtpl (Jinja2-Templates im DOCX) für exaktes Layout
   - Das Template-DOCX wird vom Recruiter bereitgestellt (hochgeladen)
   - Nach der Template-Analyse werden die Jinja2-Variablen eingefügt
+  - Geladene Templates werden prozessweit gecacht (template_cache.py)
+  - Platzhalter-Prüfung über den Template-Index (template_index.py),
+    ohne die DOCX zu öffnen
+  - Der Kontext enthält nur die Variablen, die das Template verwendet;
+    Listen sind Sichten auf die Pydantic-Objekte statt kopierter Dicts.
+    Platzhalter ohne Kontextwert bleiben leer und werden als Warnung
+    gemeldet (mit streng=True: FehlendeVariablenFehler vor dem Rendern).
+    Erkannt werden sie wie in docxtpl selbst (template_cache.py).
+  - Optional liefert ein ArtefaktCache (artefakt_cache.py) bereits
+    gerenderte Dokumente für dasselbe Template und Profil direkt zurück
 
 WICHTIG: Die render()-Methode und die Template-Variablen werden
 nach der Analyse der hochgeladenen Profile vervollständigt.
 """
 
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from docxtpl import DocxTemplate
+import io
+from src.generator.artefakt_cache import ArtefaktCache, artefakt_schluessel
+from src.generator.template_cache import template_cache
+from src.generator.template_index import hole_index
 from src.models.profile import Kandidatenprofil
+from src.telemetrie import telemetrie
 import datetime
 
 
+class FehlendeVariablenFehler(ValueError):
+    """Das Template verwendet Platzhalter, für die es keinen Kontextwert gibt."""
+
+    def __init__(self, template: str, variablen):
+        self.variablen = sorted(variablen)
+        super().__init__(
+            f"Template {template} verwendet unbekannte Platzhalter: {', '.join(self.variablen)}"
+        )
+
+
+class _Ansicht(Mapping):
+    """
+    Schreibgeschützte Sicht auf einen Eintrag (Erfahrung, Ausbildung, ...).
+    Felder werden erst beim Zugriff aus dem Pydantic-Objekt gelesen; None
+    erscheint wie bisher als "".
+    """
+
+    __slots__ = ("_objekt",)
+
+    def __init__(self, objekt):
+        self._objekt = objekt
+
+    def __getitem__(self, feld: str):
+        if feld not in type(self._objekt).model_fields:
+            raise KeyError(feld)
+        wert = getattr(self._objekt, feld)
+        return "" if wert is None else wert
+
+    def __iter__(self):
+        return iter(type(self._objekt).model_fields)
+
+    def __len__(self) -> int:
+        return len(type(self._objekt).model_fields)
+
+
+class _Liste(Sequence):
+    """Sicht auf eine Profil-Liste, liefert die Einträge als _Ansicht."""
+
+    __slots__ = ("_eintraege",)
+
+    def __init__(self, eintraege: list):
+        self._eintraege = eintraege
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_Ansicht(e) for e in self._eintraege[index]]
+        return _Ansicht(self._eintraege[index])
+
+    def __len__(self) -> int:
+        return len(self._eintraege)
+
+
+def _heute() -> str:
+    return datetime.date.today().strftime("%d.%m.%Y")
+
+
+# ------------------------------------------------------------------
+# Template-Kontext: Variable → Wert aus dem Profil
+# ANPASSEN nach Template-Analyse der hochgeladenen Profile
+# ------------------------------------------------------------------
+
+_KONTEXT = {
+    # Persönliche Daten
+    "vorname": lambda p: p.vorname,
+    "nachname": lambda p: p.nachname,
+    "vollname": lambda p: p.vollname(),
+    "titel": lambda p: p.titel or "",
+    "standort": lambda p: p.standort or "",
+    "verfuegbarkeit": lambda p: p.verfuegbarkeit or "",
+    "stundensatz": lambda p: p.stundensatz or "",
+
+    # Profil-Text
+    "zusammenfassung": lambda p: p.zusammenfassung or "",
+
+    # Skills
+    "kernkompetenzen": lambda p: p.kernkompetenzen,
+    "technische_skills": lambda p: p.technische_skills,
+
+    # Erfahrung, Ausbildung, Zertifikate, Sprachen
+    "berufserfahrung": lambda p: _Liste(p.berufserfahrung),
+    "projekte": lambda p: _Liste(p.projekte),
+    "ausbildung": lambda p: _Liste(p.ausbildung),
+    "zertifikate": lambda p: _Liste(p.zertifikate),
+    "sprachen": lambda p: _Liste(p.sprachen),
+
+    # Metadaten
+    "erstellt_datum": lambda p: _heute(),
+    "version": lambda p: p.version,
+    "modus": lambda p: p.modus,
+}
+
+
 class DocxGenerator:
-    def __init__(self, template_pfad: str | Path):
+    # Variablen, die _erstelle_kontext() bereitstellt
+    KONTEXT_VARIABLEN = frozenset(_KONTEXT)
+
+    def __init__(
+        self,
+        template_pfad: str | Path,
+        artefakt_cache: ArtefaktCache | None = None,
+        streng: bool = False,
+    ):
         """
         Args:
             template_pfad: Pfad zum DOCX-Template mit Jinja2-Variablen.
                            Muss vom Recruiter bereitgestellt werden.
+            artefakt_cache: Optionaler Cache für fertige DOCX-Bytes
+                            (siehe generiere_bytes)
+            streng: Unbekannte Platzhalter als Fehler behandeln statt sie
+                    leer zu rendern (Warnungen stehen in self.warnungen)
         """
         self.template_pfad = Path(template_pfad)
+        self.artefakt_cache = artefakt_cache
+        self.streng = streng
+        # Warnungen des letzten Rendervorgangs (z.B. unbekannte Platzhalter)
+        self.warnungen: list[str] = []
         if not self.template_pfad.exists():
             raise FileNotFoundError(
                 f"Template nicht gefunden: {self.template_pfad}\n"
                 "Bitte ein DOCX-Template hochladen."
             )
 
+    @property
+    def metadaten(self) -> dict:
+        """Template-Index (Hash, Platzhalter, Schleifen, Styles, Vorschau)."""
+        return hole_index(self.template_pfad)
+
+    def validiere(self) -> list[str]:
+        """
+        Prüft die Platzhalter des Templates gegen den Kontext.
+
+        Liest nur den Template-Index; dessen Platzhalter stammen aus
+        derselben docxtpl-Erkennung, die auch beim Rendern gilt.
+
+        Returns:
+            Unbekannte Platzhalter (werden leer gerendert) und Syntaxfehler
+            — leere Liste, wenn das Template passt
+        """
+        index = self.metadaten
+        probleme = [
+            f"Unbekannter Platzhalter: {name}"
+            for name in index["platzhalter"]
+            if name not in self.KONTEXT_VARIABLEN
+        ]
+        probleme.extend(f"Syntaxfehler: {fehler}" for fehler in index["syntaxfehler"])
+        return probleme
+
     def generiere(
         self,
         profil: Kandidatenprofil,
@@ -48,104 +196,92 @@ class DocxGenerator:
         Returns:
             Pfad zur generierten DOCX-Datei
         """
-        tpl = DocxTemplate(str(self.template_pfad))
-        kontext = self._erstelle_kontext(profil)
-        tpl.render(kontext)
+        with telemetrie.stufe("render", template=self.template_pfad.name) as stufe:
+            tpl = self._rendere(profil)
 
-        if ausgabe_pfad is None:
-            ausgabe_pfad = self._standard_ausgabepfad(profil)
+            if ausgabe_pfad is None:
+                ausgabe_pfad = self._standard_ausgabepfad(profil)
 
-        ausgabe_pfad = Path(ausgabe_pfad)
-        ausgabe_pfad.parent.mkdir(parents=True, exist_ok=True)
-        tpl.save(str(ausgabe_pfad))
+            ausgabe_pfad = Path(ausgabe_pfad)
+            ausgabe_pfad.parent.mkdir(parents=True, exist_ok=True)
+            tpl.save(str(ausgabe_pfad))
+            if telemetrie.aktiv:
+                stufe.setze(ausgabe_bytes=ausgabe_pfad.stat().st_size)
         return ausgabe_pfad
 
-    # ------------------------------------------------------------------
-    # Template-Kontext
-    # ANPASSEN nach Template-Analyse der hochgeladenen Profile
-    # ------------------------------------------------------------------
+    def generiere_stream(self, profil: Kandidatenprofil) -> io.BytesIO:
+        """
+        Rendert das Profil in einen Speicherpuffer, ohne es auf die Platte zu schreiben.
+
+        Returns:
+            BytesIO mit dem DOCX-Inhalt, Position auf 0
+        """
+        with telemetrie.stufe("render", template=self.template_pfad.name) as stufe:
+            tpl = self._rendere(profil)
+            puffer = io.BytesIO()
+            tpl.save(puffer)
+            stufe.setze(ausgabe_bytes=puffer.tell())
+        puffer.seek(0)
+        return puffer
+
+    def generiere_bytes(self, profil: Kandidatenprofil) -> bytes:
+        """
+        Wie generiere_stream(), gibt aber direkt die DOCX-Bytes zurück.
+        Mit Artefakt-Cache wird dasselbe Profil im selben Template nur einmal gerendert.
+        """
+        if self.artefakt_cache is None:
+            return self.generiere_stream(profil).getvalue()
+
+        schluessel = self.artefakt_schluessel(profil)
+        daten = self.artefakt_cache.hole(schluessel)
+        if daten is not None:
+            self._pruefe(template_cache.hole(self.template_pfad))
+            with telemetrie.stufe("render", template=self.template_pfad.name, cache="treffer") as stufe:
+                stufe.setze(ausgabe_bytes=len(daten))
+            return daten
+        daten = self.generiere_stream(profil).getvalue()
+        self.artefakt_cache.lege_ab(schluessel, daten)
+        return daten
+
+    def artefakt_schluessel(self, profil: Kandidatenprofil, format: str = "docx") -> str:
+        """
+        Cache-Schlüssel für das Dokument dieses Profils (Template-Hash,
+        Profil-Hash, Format; das Datum nur, wenn das Template erstellt_datum verwendet).
+        """
+        vorlage = template_cache.hole(self.template_pfad)
+        datum = _heute() if "erstellt_datum" in vorlage.platzhalter else None
+        return artefakt_schluessel(vorlage.inhalt_hash, profil, format, datum)
+
+    def dateiname(self, profil: Kandidatenprofil) -> str:
+        """Vorgeschlagener Dateiname, z.B. für Downloads: <vollname>_<modus>_<timestamp>.docx"""
+        return self._standard_ausgabepfad(profil).name
 
-    def _erstelle_kontext(self, profil: Kandidatenprofil) -> dict:
+    def _rendere(self, profil: Kandidatenprofil):
+        vorlage = template_cache.hole(self.template_pfad)
+        fehlend = self._pruefe(vorlage)
+        kontext = self._erstelle_kontext(profil, vorlage.platzhalter)
+        # Unbekannte Platzhalter leer rendern (wie bisher), aber gemeldet
+        kontext.update(dict.fromkeys(fehlend, ""))
+        return vorlage.rendere(kontext)
+
+    def _pruefe(self, vorlage) -> frozenset[str]:
+        """Setzt self.warnungen; im strengen Modus Abbruch bei unbekannten Platzhaltern."""
+        fehlend = vorlage.platzhalter - self.KONTEXT_VARIABLEN
+        if fehlend and self.streng:
+            raise FehlendeVariablenFehler(self.template_pfad.name, fehlend)
+        self.warnungen = [f"Unbekannter Platzhalter (bleibt leer): {name}" for name in sorted(fehlend)]
+        return fehlend
+
+    def _erstelle_kontext(self, profil: Kandidatenprofil, variablen=None) -> dict:
         """
         Baut den Jinja2-Kontext für das Template.
 
-        HINWEIS: Diese Variablen müssen mit den Platzhaltern im
-        DOCX-Template übereinstimmen. Wird nach der Template-Analyse
-        angepasst und vervollständigt.
+        Args:
+            variablen: Vom Template verwendete Variablen; nur diese werden
+                       befüllt (None = alle aus KONTEXT_VARIABLEN)
         """
-        return {
-            # Persönliche Daten
-            "vorname": profil.vorname,
-            "nachname": profil.nachname,
-            "vollname": profil.vollname(),
-            "titel": profil.titel or "",
-            "standort": profil.standort or "",
-            "verfuegbarkeit": profil.verfuegbarkeit or "",
-            "stundensatz": profil.stundensatz or "",
-
-            # Profil-Text
-            "zusammenfassung": profil.zusammenfassung or "",
-
-            # Skills
-            "kernkompetenzen": profil.kernkompetenzen,
-            "technische_skills": profil.technische_skills,
-
-            # Erfahrung
-            "berufserfahrung": [
-                {
-                    "titel": e.titel,
-                    "unternehmen": e.unternehmen or "",
-                    "zeitraum": e.zeitraum or "",
-                    "beschreibung": e.beschreibung or "",
-                    "technologien": e.technologien,
-                    "highlights": e.highlights,
-                }
-                for e in profil.berufserfahrung
-            ],
-            "projekte": [
-                {
-                    "titel": p.titel,
-                    "unternehmen": p.unternehmen or "",
-                    "zeitraum": p.zeitraum or "",
-                    "beschreibung": p.beschreibung or "",
-                    "technologien": p.technologien,
-                    "highlights": p.highlights,
-                }
-                for p in profil.projekte
-            ],
-
-            # Ausbildung
-            "ausbildung": [
-                {
-                    "abschluss": a.abschluss,
-                    "institution": a.institution,
-                    "zeitraum": a.zeitraum or "",
-                    "zusatz": a.zusatz or "",
-                }
-                for a in profil.ausbildung
-            ],
-
-            # Zertifikate
-            "zertifikate": [
-                {
-                    "name": z.name,
-                    "aussteller": z.aussteller or "",
-                    "jahr": z.jahr or "",
-                }
-                for z in profil.zertifikate
-            ],
-
-            # Sprachen
-            "sprachen": [
-                {"sprache": s.sprache, "niveau": s.niveau}
-                for s in profil.sprachen
-            ],
-
-            # Metadaten
-            "erstellt_datum": datetime.date.today().strftime("%d.%m.%Y"),
-            "version": profil.version,
-            "modus": profil.modus,
-        }
+        namen = self.KONTEXT_VARIABLEN if variablen is None else self.KONTEXT_VARIABLEN & variablen
+        return {name: _KONTEXT[name](profil) for name in namen}
 
     def _standard_ausgabepfad(self, profil: Kandidatenprofil) -> Path:
         zeitstempel = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -0,0 +1,288 @@
+"""
+LibreOffice-Dienst
+
+Hält eine headless LibreOffice-Instanz dauerhaft warm und spricht sie
+über UNO (Socket-Listener) an. Dadurch entfällt der Kaltstart von
+2–5 Sekunden pro Konvertierung — es bleibt nur die reine Renderzeit.
+
+Voraussetzung: Das Python-UNO-Modul (`import uno`), z.B.
+  - Linux: `sudo apt install python3-uno`
+  - Mac/Windows: das mit LibreOffice ausgelieferte Python verwenden
+
+Ist UNO nicht verfügbar, fällt der PdfConverter automatisch auf den
+Einzelaufruf per `soffice --headless --convert-to` zurück. Ebenso nach
+einem gescheiterten Start: Der Dienst gilt dann für startfehler_pause
+Sekunden als nicht verfügbar, statt bei jeder Konvertierung erneut bis
+zum start_timeout zu warten.
+"""
+
+from pathlib import Path
+import atexit
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+from src.generator.pdf_converter import libreoffice_befehl
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    UNO_VERFUEGBAR = True
+except ImportError:
+    UNO_VERFUEGBAR = False
+
+
+class LibreOfficeDienst:
+    """
+    Langlebige LibreOffice-Instanz mit Health-Check und automatischem Neustart.
+
+    Konvertierungen werden serialisiert, da eine soffice-Instanz
+    Dokumente nicht zuverlässig parallel laden kann.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int | None = None,
+        start_timeout: float = 30.0,
+        startfehler_pause: float = 300.0,
+    ):
+        """
+        Args:
+            host: Adresse, auf der der UNO-Listener lauscht
+            port: TCP-Port des Listeners. Standard: freier Port
+            start_timeout: Maximale Wartezeit (Sekunden) bis LibreOffice bereit ist
+            startfehler_pause: Nach einem gescheiterten Start so viele Sekunden
+                               keinen neuen Versuch unternehmen
+        """
+        if not UNO_VERFUEGBAR:
+            raise ImportError(
+                "Python-UNO ist nicht installiert. "
+                "Bitte 'python3-uno' installieren oder das LibreOffice-Python verwenden."
+            )
+        self.host = host
+        self.port = port or self._freier_port()
+        self.start_timeout = start_timeout
+        self.startfehler_pause = startfehler_pause
+        # time.monotonic(), ab dem nach einem Startfehler wieder gestartet wird
+        self._gesperrt_bis = 0.0
+
+        self._prozess: subprocess.Popen | None = None
+        self._desktop = None
+        self._profil_ordner: tempfile.TemporaryDirectory | None = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Öffentliche Methoden
+    # ------------------------------------------------------------------
+
+    def starte(self) -> None:
+        """Startet LibreOffice (falls nicht schon aktiv) und verbindet sich per UNO."""
+        with self._lock:
+            self._sicherstellen()
+
+    def stoppe(self) -> None:
+        """Beendet die LibreOffice-Instanz und räumt das Benutzerprofil auf."""
+        with self._lock:
+            self._beende_prozess()
+
+    @property
+    def verfuegbar(self) -> bool:
+        """False, solange nach einem gescheiterten Start die Pause läuft."""
+        return time.monotonic() >= self._gesperrt_bis
+
+    def ist_gesund(self) -> bool:
+        """Health-Check: Prozess läuft und die UNO-Verbindung antwortet."""
+        if self._prozess is None or self._prozess.poll() is not None:
+            return False
+        if self._desktop is None:
+            return False
+        try:
+            # Billiger Roundtrip über die UNO-Bridge
+            self._desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def konvertiere(self, docx_pfad: str | Path, pdf_pfad: str | Path) -> Path:
+        """
+        Konvertiert eine DOCX-Datei über die laufende Instanz in PDF.
+        Stürzt LibreOffice dabei ab, wird einmal neu gestartet und wiederholt.
+
+        Raises:
+            RuntimeError: wenn die Konvertierung auch nach Neustart scheitert
+        """
+        docx_pfad = Path(docx_pfad).resolve()
+        pdf_pfad = Path(pdf_pfad).resolve()
+        pdf_pfad.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            letzter_fehler: Exception | None = None
+            for _ in range(2):
+                self._sicherstellen()
+                try:
+                    self._konvertiere_uno(docx_pfad, pdf_pfad)
+                    return pdf_pfad
+                except Exception as e:
+                    letzter_fehler = e
+                    if self.ist_gesund():
+                        # Dokumentfehler, kein Absturz — Neustart hilft nicht
+                        break
+                    self._beende_prozess()
+
+        raise RuntimeError(
+            f"LibreOffice-Dienst: Konvertierung fehlgeschlagen:\n{letzter_fehler}"
+        )
+
+    # ------------------------------------------------------------------
+    # Private Methoden
+    # ------------------------------------------------------------------
+
+    def _sicherstellen(self) -> None:
+        """Startet bzw. startet neu, wenn die Instanz nicht gesund ist."""
+        if self.ist_gesund():
+            return
+        if not self.verfuegbar:
+            raise RuntimeError(
+                "LibreOffice-Dienst nach gescheitertem Start pausiert "
+                f"(neuer Versuch in {self._gesperrt_bis - time.monotonic():.0f} s)."
+            )
+        self._beende_prozess()
+        try:
+            self._starte_prozess()
+            self._desktop = self._verbinde()
+        except Exception as e:
+            self._beende_prozess()
+            self._gesperrt_bis = time.monotonic() + self.startfehler_pause
+            if isinstance(e, RuntimeError):
+                raise
+            # z.B. OSError aus Popen — der PdfConverter fällt bei RuntimeError zurück
+            raise RuntimeError(f"LibreOffice-Dienst konnte nicht starten: {e}") from e
+        self._gesperrt_bis = 0.0
+
+    def _starte_prozess(self) -> None:
+        befehl = libreoffice_befehl()
+        if befehl is None:
+            raise RuntimeError(
+                "LibreOffice nicht gefunden.\n"
+                "Bitte LibreOffice installieren: https://www.libreoffice.org/download/"
+            )
+        # Eigenes Benutzerprofil, damit eine offene LibreOffice-Sitzung
+        # des Nutzers (oder der Subprozess-Fallback) nicht blockiert wird
+        self._profil_ordner = tempfile.TemporaryDirectory(prefix="lo_dienst_")
+        profil_url = Path(self._profil_ordner.name).as_uri()
+        self._prozess = subprocess.Popen(
+            [
+                befehl,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"-env:UserInstallation={profil_url}",
+                f"--accept=socket,host={self.host},port={self.port};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _verbinde(self):
+        lokaler_kontext = uno.getComponentContext()
+        resolver = lokaler_kontext.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", lokaler_kontext
+        )
+        url = f"uno:socket,host={self.host},port={self.port};urp;StarOffice.ComponentContext"
+
+        frist = time.monotonic() + self.start_timeout
+        letzter_fehler: Exception | None = None
+        while time.monotonic() < frist:
+            if self._prozess is not None and self._prozess.poll() is not None:
+                raise RuntimeError(
+                    f"LibreOffice-Dienst ist beim Start beendet worden (Code {self._prozess.returncode})."
+                )
+            try:
+                kontext = resolver.resolve(url)
+                return kontext.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", kontext
+                )
+            except Exception as e:
+                letzter_fehler = e
+                time.sleep(0.2)
+
+        self._beende_prozess()
+        raise RuntimeError(
+            f"LibreOffice-Dienst antwortet nicht nach {self.start_timeout:.0f} s: {letzter_fehler}"
+        )
+
+    def _konvertiere_uno(self, docx_pfad: Path, pdf_pfad: Path) -> None:
+        dokument = self._desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(docx_pfad)),
+            "_blank",
+            0,
+            (self._eigenschaft("Hidden", True), self._eigenschaft("ReadOnly", True)),
+        )
+        if dokument is None:
+            raise RuntimeError(f"Dokument konnte nicht geladen werden: {docx_pfad}")
+        try:
+            dokument.storeToURL(
+                uno.systemPathToFileUrl(str(pdf_pfad)),
+                (self._eigenschaft("FilterName", "writer_pdf_Export"),),
+            )
+        finally:
+            dokument.close(True)
+
+    def _beende_prozess(self) -> None:
+        if self._desktop is not None:
+            try:
+                self._desktop.terminate()
+            except Exception:
+                pass
+            self._desktop = None
+        if self._prozess is not None:
+            if self._prozess.poll() is None:
+                self._prozess.terminate()
+                try:
+                    self._prozess.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._prozess.kill()
+            self._prozess = None
+        if self._profil_ordner is not None:
+            self._profil_ordner.cleanup()
+            self._profil_ordner = None
+
+    @staticmethod
+    def _eigenschaft(name: str, wert) -> "PropertyValue":
+        eigenschaft = PropertyValue()
+        eigenschaft.Name = name
+        eigenschaft.Value = wert
+        return eigenschaft
+
+    @staticmethod
+    def _freier_port() -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
+
+
+# ------------------------------------------------------------------
+# Prozessweite Instanz
+# ------------------------------------------------------------------
+
+_dienst: LibreOfficeDienst | None = None
+_dienst_lock = threading.Lock()
+
+
+def hole_dienst() -> LibreOfficeDienst:
+    """
+    Gibt die prozessweit geteilte Dienst-Instanz zurück (beim ersten Aufruf
+    erzeugt). LibreOffice selbst startet erst mit starte() bzw. konvertiere().
+    """
+    global _dienst
+    with _dienst_lock:
+        if _dienst is None:
+            _dienst = LibreOfficeDienst()
+            atexit.register(_dienst.stoppe)
+        return _dienst
@@ -7,14 +7,51 @@ oder LibreOffice auf Linux).
 
 Das Layout bleibt dadurch exakt erhalten — es wird keine eigene
 PDF-Rendering-Engine benötigt.
+
+Im Dauerbetrieb (dauerbetrieb=True) werden Dokumente an eine warm
+gehaltene LibreOffice-Instanz geschickt (siehe libreoffice_dienst.py).
+Der Einzelaufruf per Subprozess bleibt als Fallback erhalten.
+
+Welche Konverter installiert sind, wird einmal pro Prozess ermittelt
+(PdfConverter.erkenne_neu() setzt das zurück, z.B. nach einer Installation).
 """
 
+from functools import lru_cache
 from pathlib import Path
 import subprocess
 import shutil
+import tempfile
+
+from src.telemetrie import telemetrie
+
+# Maximale Anzahl Dateien pro soffice-Aufruf (Länge der Kommandozeile)
+MAX_DATEIEN_PRO_AUFRUF = 100
+
+
+@lru_cache(maxsize=1)
+def libreoffice_befehl() -> str | None:
+    """Pfad zu libreoffice bzw. soffice (None, wenn nicht installiert)."""
+    return shutil.which("libreoffice") or shutil.which("soffice")
+
+
+@lru_cache(maxsize=1)
+def _docx2pdf_installiert() -> bool:
+    try:
+        import docx2pdf  # noqa: F401
+        return True
+    except ImportError:
+        return False
 
 
 class PdfConverter:
+    def __init__(self, dauerbetrieb: bool = False):
+        """
+        Args:
+            dauerbetrieb: Konvertierungen an einen dauerhaft laufenden
+                          LibreOffice-Dienst schicken statt pro Datei
+                          soffice neu zu starten.
+        """
+        self.dauerbetrieb = dauerbetrieb
 
     def konvertiere(self, docx_pfad: str | Path, pdf_pfad: str | Path | None = None) -> Path:
         """
@@ -36,19 +73,75 @@ class PdfConverter:
             pdf_pfad = docx_pfad.with_suffix(".pdf")
         pdf_pfad = Path(pdf_pfad)
 
-        if self._libreoffice_verfuegbar():
-            return self._konvertiere_libreoffice(docx_pfad, pdf_pfad)
-        elif self._docx2pdf_verfuegbar():
-            return self._konvertiere_docx2pdf(docx_pfad, pdf_pfad)
-        else:
-            raise RuntimeError(
-                "Kein PDF-Konverter gefunden.\n"
-                "Bitte LibreOffice installieren: https://www.libreoffice.org/download/\n"
-                "Oder: pip install docx2pdf (benötigt Microsoft Word)"
-            )
+        ergebnis = self._konvertiere_paare([(docx_pfad, pdf_pfad)])[docx_pfad]
+        if isinstance(ergebnis, Exception):
+            raise ergebnis
+        return ergebnis
+
+    def konvertiere_bytes(self, docx_bytes: bytes, dateiname: str = "dokument.docx") -> bytes:
+        """
+        Konvertiert DOCX-Bytes in PDF-Bytes.
+        Arbeitet in einem privaten temporären Ordner, nicht in output/.
+
+        Args:
+            docx_bytes: Inhalt der DOCX-Datei
+            dateiname:  Name der temporären Datei (beeinflusst den PDF-Titel)
+
+        Returns:
+            Inhalt der PDF-Datei
+        """
+        with tempfile.TemporaryDirectory(prefix="pdf_konv_") as tmp_ordner:
+            docx_pfad = Path(tmp_ordner) / Path(dateiname).name
+            docx_pfad.write_bytes(docx_bytes)
+            return self.konvertiere(docx_pfad).read_bytes()
+
+    def konvertiere_batch(
+        self,
+        docx_pfade: list[str | Path],
+        ausgabe_ordner: str | Path,
+    ) -> dict[Path, Path | Exception]:
+        """
+        Konvertiert mehrere DOCX-Dateien in möglichst wenigen LibreOffice-Aufrufen.
+
+        Args:
+            docx_pfade: Pfade zu den DOCX-Quelldateien
+            ausgabe_ordner: Zielordner für die PDFs (<dateiname>.pdf)
+
+        Returns:
+            Dict Quelldatei → PDF-Pfad bzw. Exception, falls die Datei
+            nicht konvertiert werden konnte
+
+        Raises:
+            RuntimeError: wenn kein Konverter verfügbar ist
+        """
+        ausgabe_ordner = Path(ausgabe_ordner)
+        ausgabe_ordner.mkdir(parents=True, exist_ok=True)
+
+        paare: list[tuple[Path, Path]] = []
+        vergeben: set[str] = set()
+        for docx_pfad in map(Path, docx_pfade):
+            # Gleiche Dateinamen aus verschiedenen Ordnern nicht überschreiben
+            name = docx_pfad.stem
+            zaehler = 2
+            while name in vergeben:
+                name = f"{docx_pfad.stem}_{zaehler}"
+                zaehler += 1
+            vergeben.add(name)
+            paare.append((docx_pfad, ausgabe_ordner / f"{name}.pdf"))
+
+        ergebnisse = self._konvertiere_paare(paare)
+        return {docx_pfad: ergebnisse[docx_pfad] for docx_pfad, _ in paare}
+
+    @staticmethod
+    def erkenne_neu() -> None:
+        """Verwirft die gemerkte Konverter-Erkennung."""
+        libreoffice_befehl.cache_clear()
+        _docx2pdf_installiert.cache_clear()
 
     def verfuegbare_methode(self) -> str:
-        if self._libreoffice_verfuegbar():
+        if self._dienst_verfuegbar():
+            return "LibreOffice (Dienst)"
+        elif self._libreoffice_verfuegbar():
             return "LibreOffice"
         elif self._docx2pdf_verfuegbar():
             return "docx2pdf"
@@ -58,42 +151,148 @@ class PdfConverter:
     # Private Methoden
     # ------------------------------------------------------------------
 
+    def _konvertiere_paare(
+        self, paare: list[tuple[Path, Path]]
+    ) -> dict[Path, Path | Exception]:
+        with telemetrie.stufe("pdf", dateien=len(paare)) as stufe:
+            ergebnisse = self._konvertiere_paare_mit(paare, stufe)
+            if telemetrie.aktiv:
+                stufe.setze(
+                    eingabe_bytes=sum(d.stat().st_size for d, _ in paare if d.exists()),
+                    fehler_dateien=sum(isinstance(e, Exception) for e in ergebnisse.values()),
+                )
+        return ergebnisse
+
+    def _konvertiere_paare_mit(
+        self, paare: list[tuple[Path, Path]], stufe
+    ) -> dict[Path, Path | Exception]:
+        ergebnisse: dict[Path, Path | Exception] = {}
+        offen = paare
+
+        if self._dienst_verfuegbar():
+            stufe.setze(methode="LibreOffice (Dienst)")
+            offen = []
+            for docx_pfad, pdf_pfad in paare:
+                try:
+                    ergebnisse[docx_pfad] = self._konvertiere_dienst(docx_pfad, pdf_pfad)
+                except RuntimeError:
+                    # Fallback: Subprozess-Aufruf
+                    offen.append((docx_pfad, pdf_pfad))
+
+        if not offen:
+            return ergebnisse
+        if self._libreoffice_verfuegbar():
+            stufe.setze(methode="LibreOffice")
+            ergebnisse.update(self._konvertiere_libreoffice(offen))
+        elif self._docx2pdf_verfuegbar():
+            stufe.setze(methode="docx2pdf")
+            for docx_pfad, pdf_pfad in offen:
+                try:
+                    ergebnisse[docx_pfad] = self._konvertiere_docx2pdf(docx_pfad, pdf_pfad)
+                except Exception as e:
+                    ergebnisse[docx_pfad] = e
+        else:
+            raise RuntimeError(
+                "Kein PDF-Konverter gefunden.\n"
+                "Bitte LibreOffice installieren: https://www.libreoffice.org/download/\n"
+                "Oder: pip install docx2pdf (benötigt Microsoft Word)"
+            )
+        return ergebnisse
+
     def _libreoffice_verfuegbar(self) -> bool:
-        return (
-            shutil.which("libreoffice") is not None
-            or shutil.which("soffice") is not None
-        )
+        return libreoffice_befehl() is not None
 
-    def _docx2pdf_verfuegbar(self) -> bool:
-        try:
-            import docx2pdf  # noqa: F401
-            return True
-        except ImportError:
+    def _dienst_verfuegbar(self) -> bool:
+        if not self.dauerbetrieb or not self._libreoffice_verfuegbar():
             return False
+        from src.generator.libreoffice_dienst import UNO_VERFUEGBAR, hole_dienst
+        # Nach einem gescheiterten Start direkt den Subprozess nehmen
+        return UNO_VERFUEGBAR and hole_dienst().verfuegbar
+
+    def _docx2pdf_verfuegbar(self) -> bool:
+        return _docx2pdf_installiert()
+
+    def _konvertiere_dienst(self, docx_pfad: Path, pdf_pfad: Path) -> Path:
+        from src.generator.libreoffice_dienst import hole_dienst
+        return hole_dienst().konvertiere(docx_pfad, pdf_pfad)
+
+    def _konvertiere_libreoffice(
+        self, paare: list[tuple[Path, Path]]
+    ) -> dict[Path, Path | Exception]:
+        """
+        Konvertiert alle Dateien mit so wenigen soffice-Aufrufen wie möglich.
+        LibreOffice schreibt in einen temporären Ordner (originaler Dateiname
+        + .pdf); danach wird jede Datei an ihr Ziel verschoben.
+        """
+        ergebnisse: dict[Path, Path | Exception] = {}
+        for gruppe in self._gruppiere_aufrufe(paare):
+            with tempfile.TemporaryDirectory(prefix="lo_batch_") as tmp_ordner:
+                tmp_ordner = Path(tmp_ordner)
+                try:
+                    stderr = self._starte_libreoffice(
+                        [docx_pfad for docx_pfad, _ in gruppe], tmp_ordner
+                    )
+                except (RuntimeError, subprocess.TimeoutExpired) as e:
+                    for docx_pfad, _ in gruppe:
+                        ergebnisse[docx_pfad] = RuntimeError(
+                            f"LibreOffice-Konvertierung fehlgeschlagen:\n{e}"
+                        )
+                    continue
+
+                for docx_pfad, pdf_pfad in gruppe:
+                    lo_output = tmp_ordner / (docx_pfad.stem + ".pdf")
+                    if not lo_output.exists():
+                        ergebnisse[docx_pfad] = RuntimeError(
+                            f"LibreOffice hat keine PDF für {docx_pfad.name} erzeugt:\n{stderr}"
+                        )
+                        continue
+                    pdf_pfad.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        lo_output.replace(pdf_pfad)
+                    except OSError:
+                        # Anderes Dateisystem
+                        shutil.copyfile(lo_output, pdf_pfad)
+                    ergebnisse[docx_pfad] = pdf_pfad
+        return ergebnisse
 
-    def _konvertiere_libreoffice(self, docx_pfad: Path, pdf_pfad: Path) -> Path:
-        befehl = shutil.which("libreoffice") or shutil.which("soffice")
+    def _starte_libreoffice(self, docx_pfade: list[Path], outdir: Path) -> str:
         ergebnis = subprocess.run(
             [
-                befehl,
+                libreoffice_befehl(),
                 "--headless",
                 "--convert-to", "pdf",
-                "--outdir", str(pdf_pfad.parent),
-                str(docx_pfad),
+                "--outdir", str(outdir),
+                *(str(p) for p in docx_pfade),
             ],
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=60 + 15 * len(docx_pfade),
         )
         if ergebnis.returncode != 0:
-            raise RuntimeError(
-                f"LibreOffice-Konvertierung fehlgeschlagen:\n{ergebnis.stderr}"
-            )
-        # LibreOffice speichert mit dem originalen Dateinamen + .pdf
-        lo_output = docx_pfad.parent / (docx_pfad.stem + ".pdf")
-        if lo_output != pdf_pfad:
-            lo_output.rename(pdf_pfad)
-        return pdf_pfad
+            raise RuntimeError(ergebnis.stderr)
+        return ergebnis.stderr
+
+    @staticmethod
+    def _gruppiere_aufrufe(
+        paare: list[tuple[Path, Path]]
+    ) -> list[list[tuple[Path, Path]]]:
+        """
+        Teilt die Dateien so auf, dass pro Aufruf jeder Dateiname nur einmal
+        vorkommt (LibreOffice benennt die Ausgabe nach dem Quellnamen).
+        """
+        gruppen: list[list[tuple[Path, Path]]] = []
+        namen: list[set[str]] = []
+        for paar in paare:
+            stem = paar[0].stem
+            for gruppe, gruppen_namen in zip(gruppen, namen):
+                if stem not in gruppen_namen and len(gruppe) < MAX_DATEIEN_PRO_AUFRUF:
+                    gruppe.append(paar)
+                    gruppen_namen.add(stem)
+                    break
+            else:
+                gruppen.append([paar])
+                namen.append({stem})
+        return gruppen
 
     def _konvertiere_docx2pdf(self, docx_pfad: Path, pdf_pfad: Path) -> Path:
         import docx2pdf
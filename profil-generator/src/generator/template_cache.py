@@ -0,0 +1,170 @@
+"""
+Template-Cache
+
+Prozessweiter Cache für DOCX-Templates. Pro Template werden gehalten:
+  - der Dateiinhalt (kein erneutes Lesen von der Platte)
+  - das geladene python-docx-Dokument (kein erneutes Entpacken und
+    XML-Parsen); jedes Rendern arbeitet auf einer copy.deepcopy davon
+  - das von docxtpl vorbereitete XML (patch_xml)
+  - die kompilierten Jinja2-Templates für Body, Header und Footer
+  - die nicht deklarierten Jinja2-Variablen (einmal beim ersten Bedarf)
+
+Schlüssel ist der Template-Pfad; ändert sich mtime/Größe der Datei
+(z.B. weil ein Template in templates/ ersetzt wurde), wird der
+Inhalts-Hash neu berechnet und der Eintrag bei Bedarf verworfen.
+"""
+
+from collections import OrderedDict
+from functools import cached_property
+from pathlib import Path
+import copy
+import hashlib
+import io
+import threading
+
+from docx import Document
+from docxtpl import DocxTemplate
+from jinja2 import Environment
+
+
+class _CachendeUmgebung(Environment):
+    """Jinja2-Umgebung, die kompilierte Templates pro Quelltext wiederverwendet."""
+
+    def __init__(self):
+        super().__init__()
+        self._kompiliert: dict[str, object] = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None or not isinstance(source, str):
+            return super().from_string(source, globals, template_class)
+        template = self._kompiliert.get(source)
+        if template is None:
+            template = super().from_string(source)
+            self._kompiliert[source] = template
+        return template
+
+
+class _VorlagenDokument(DocxTemplate):
+    """
+    DocxTemplate, das Dokument und vorbereitetes XML aus dem Cache-Eintrag
+    bezieht. Das Dokument ist eine Kopie — render() ersetzt Body, Kopf- und
+    Fußzeilen und darf das geladene Original nicht verändern.
+    """
+
+    def __init__(self, vorlage: "KompiliertesTemplate"):
+        super().__init__(io.BytesIO(vorlage.inhalt))
+        self._vorlage = vorlage
+        # init_docx() lädt nur, wenn noch kein Dokument gesetzt ist
+        self.docx = copy.deepcopy(vorlage.dokument)
+
+    def patch_xml(self, src_xml: str) -> str:
+        gepatcht = self._vorlage._gepatcht.get(src_xml)
+        if gepatcht is None:
+            gepatcht = super().patch_xml(src_xml)
+            self._vorlage._gepatcht[src_xml] = gepatcht
+        return gepatcht
+
+
+class KompiliertesTemplate:
+    """Ein geladenes Template samt vorbereitetem XML und kompiliertem Jinja2."""
+
+    def __init__(self, pfad: Path, inhalt: bytes, inhalt_hash: str, signatur: tuple[int, int]):
+        self.pfad = pfad
+        self.inhalt = inhalt
+        self.inhalt_hash = inhalt_hash
+        self.signatur = signatur
+        self.jinja_env = _CachendeUmgebung()
+        self._gepatcht: dict[str, str] = {}
+
+    @cached_property
+    def dokument(self):
+        """Das einmal geladene Dokument (nur lesen — gerendert wird eine Kopie)."""
+        return Document(io.BytesIO(self.inhalt))
+
+    @cached_property
+    def platzhalter(self) -> frozenset[str]:
+        """
+        Variablen, die das Template aus dem Kontext erwartet (Body, Header,
+        Footer). Schleifen- und set-Variablen sowie Jinja-Globale zählen nicht.
+        """
+        variablen = _VorlagenDokument(self).get_undeclared_template_variables(jinja_env=self.jinja_env)
+        return frozenset(variablen).difference(self.jinja_env.globals)
+
+    def rendere(self, kontext: dict) -> DocxTemplate:
+        """
+        Rendert den Kontext in eine frische Dokument-Instanz.
+        Die Instanz gehört dem Aufrufer (z.B. für save()); der Cache-Eintrag
+        selbst wird nicht verändert und kann parallel genutzt werden.
+        """
+        tpl = _VorlagenDokument(self)
+        tpl.render(kontext, jinja_env=self.jinja_env)
+        return tpl
+
+
+class TemplateCache:
+    def __init__(self, max_eintraege: int = 8):
+        """
+        Args:
+            max_eintraege: Anzahl Templates, die gleichzeitig gehalten werden (LRU)
+        """
+        self.max_eintraege = max_eintraege
+        self._eintraege: OrderedDict[Path, KompiliertesTemplate] = OrderedDict()
+        self._lock = threading.Lock()
+        self.treffer = 0
+        self.fehlschlaege = 0
+
+    def hole(self, pfad: str | Path) -> KompiliertesTemplate:
+        """
+        Gibt das (ggf. frisch geladene) Template für den Pfad zurück.
+
+        Raises:
+            FileNotFoundError: wenn die Template-Datei nicht existiert
+        """
+        pfad = Path(pfad).resolve()
+        stat = pfad.stat()
+        signatur = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            eintrag = self._eintraege.get(pfad)
+            if eintrag is not None and eintrag.signatur == signatur:
+                self._eintraege.move_to_end(pfad)
+                self.treffer += 1
+                return eintrag
+
+        inhalt = pfad.read_bytes()
+        inhalt_hash = hashlib.sha256(inhalt).hexdigest()
+
+        with self._lock:
+            eintrag = self._eintraege.get(pfad)
+            if eintrag is not None and eintrag.inhalt_hash == inhalt_hash:
+                # Datei nur angefasst, Inhalt unverändert
+                eintrag.signatur = signatur
+                self.treffer += 1
+            else:
+                eintrag = KompiliertesTemplate(pfad, inhalt, inhalt_hash, signatur)
+                self.fehlschlaege += 1
+            self._eintraege[pfad] = eintrag
+            self._eintraege.move_to_end(pfad)
+            while len(self._eintraege) > self.max_eintraege:
+                self._eintraege.popitem(last=False)
+            return eintrag
+
+    def entferne(self, pfad: str | Path) -> None:
+        with self._lock:
+            self._eintraege.pop(Path(pfad).resolve(), None)
+
+    def leeren(self) -> None:
+        with self._lock:
+            self._eintraege.clear()
+
+    def statistik(self) -> dict:
+        with self._lock:
+            return {
+                "eintraege": len(self._eintraege),
+                "treffer": self.treffer,
+                "fehlschlaege": self.fehlschlaege,
+            }
+
+
+# Prozessweite Instanz (geteilt von allen DocxGenerator-Objekten)
+template_cache = TemplateCache()
@@ -0,0 +1,201 @@
+"""
+Template-Index
+
+Zu jedem Template in templates/ liegt eine kleine Metadaten-Datei
+(vorlage.docx → vorlage.meta.json). Sie wird beim Speichern eines Templates
+einmal mit dem DocxParser erzeugt und enthält:
+  - Inhalts-Hash sowie Größe/mtime der DOCX (zur Gültigkeitsprüfung)
+  - verwendete Jinja-Platzhalter (dieselbe docxtpl-Erkennung wie beim
+    Rendern, siehe KompiliertesTemplate.platzhalter) und Schleifen
+    (inkl. genutzter Felder)
+  - Style-Info, Seitenränder, Struktur-Übersicht und eine Textvorschau
+
+Template-Liste, Analyse-Anzeige und DocxGenerator-Validierung lesen nur
+noch diese Datei (ein stat() + ein kleines JSON) statt die DOCX zu öffnen.
+Passen Größe/mtime nicht mehr, wird der Hash verglichen und der Index bei
+geändertem Inhalt neu erzeugt.
+
+Verwendung:
+    index = hole_index("templates/vorlage.docx")
+    index["platzhalter"]   # ["berufserfahrung", "vollname", ...]
+    index["schleifen"]     # [{"variable": "e", "liste": "berufserfahrung", "felder": ["titel"]}]
+"""
+
+from pathlib import Path
+import datetime
+import hashlib
+import json
+import os
+import re
+import zipfile
+
+from jinja2 import Environment, TemplateSyntaxError, meta
+from lxml import etree
+
+from src.generator.template_cache import template_cache
+from src.parser.docx_parser import W_NS, DocxParser
+
+INDEX_VERSION = 2
+INDEX_ENDUNG = ".meta.json"
+VORSCHAU_ZEICHEN = 1500
+
+# docxtpl-Tags: {{p ...}}, {{r ...}}, {%p ...%}, {%tr ...%}, {%tc ...%}, {%r ...%}
+_AUSDRUCK = re.compile(r"\{\{(?:[pr](?=\s))?-?(.*?)-?\}\}", re.S)
+_ANWEISUNG = re.compile(r"\{%(?:(?:p|tr|tc|r)(?=\s))?-?(.*?)-?%\}", re.S)
+_FOR = re.compile(r"^for\s+(.+?)\s+in\s+(.+?)(?:\s+recursive)?$", re.S)
+_SET = re.compile(r"^set\s+(\w+)\s*=\s*(.+)$", re.S)
+_NAME = re.compile(r"[A-Za-z_]\w*")
+
+_umgebung = Environment()
+
+
+def index_pfad(template_pfad: str | Path) -> Path:
+    return Path(template_pfad).with_suffix(INDEX_ENDUNG)
+
+
+def erstelle_index(template_pfad: str | Path) -> dict:
+    """Analysiert das Template (DocxParser + Kopf-/Fußzeilen) und schreibt den Index."""
+    template_pfad = Path(template_pfad)
+    inhalt = template_pfad.read_bytes()
+    stat = template_pfad.stat()
+
+    parser = DocxParser(template_pfad)
+    styles = parser.extrahiere_style_info()
+    text = parser.extrahiere_text()
+    vorlagen_text = "\n".join([text, *_kopf_fuss_texte(template_pfad)])
+    schleifen, fehler = analysiere_schleifen(vorlagen_text)
+    try:
+        platzhalter = sorted(template_cache.hole(template_pfad).platzhalter)
+    except TemplateSyntaxError as e:
+        platzhalter = []
+        fehler.insert(0, f"Zeile {e.lineno}: {e.message}")
+
+    index = {
+        "version": INDEX_VERSION,
+        "datei": template_pfad.name,
+        "inhalt_hash": hashlib.sha256(inhalt).hexdigest(),
+        "groesse": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "erstellt": datetime.datetime.now().isoformat(timespec="seconds"),
+        "platzhalter": platzhalter,
+        "schleifen": schleifen,
+        "syntaxfehler": fehler,
+        "styles": {k: v for k, v in styles.items() if k != "seitenraender"},
+        "seitenraender": styles["seitenraender"],
+        "struktur": {
+            abschnitt: len(eintraege)
+            for abschnitt, eintraege in parser.extrahiere_struktur().items()
+            if abschnitt != "_header"
+        },
+        "vorschau": text[:VORSCHAU_ZEICHEN],
+        "zeichen": len(text),
+    }
+
+    ziel = index_pfad(template_pfad)
+    tmp_pfad = ziel.with_name(ziel.name + ".tmp")
+    tmp_pfad.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_pfad, ziel)
+    return index
+
+
+def lade_index(template_pfad: str | Path) -> dict | None:
+    """
+    Liest den Index, ohne die DOCX zu öffnen. None, wenn er fehlt, aus einer
+    älteren Version stammt oder der Inhalt der DOCX sich geändert hat.
+    """
+    template_pfad = Path(template_pfad)
+    try:
+        index = json.loads(index_pfad(template_pfad).read_text(encoding="utf-8"))
+        stat = template_pfad.stat()
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != INDEX_VERSION:
+        return None
+    if (index.get("groesse"), index.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+        return index
+
+    # Datei angefasst: nur bei geändertem Inhalt ungültig
+    if hashlib.sha256(template_pfad.read_bytes()).hexdigest() != index.get("inhalt_hash"):
+        return None
+    index["groesse"], index["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+    return index
+
+
+def hole_index(template_pfad: str | Path) -> dict:
+    """Gültiger Index aus der Metadaten-Datei, sonst frisch erzeugt."""
+    return lade_index(template_pfad) or erstelle_index(template_pfad)
+
+
+def entferne_index(template_pfad: str | Path) -> None:
+    index_pfad(template_pfad).unlink(missing_ok=True)
+
+
+def analysiere_schleifen(text: str) -> tuple[list[dict], list[str]]:
+    """
+    Findet die Schleifen eines Template-Texts samt der Felder, die auf die
+    Schleifenvariable zugegriffen werden (nur zur Anzeige — welche
+    Platzhalter der Kontext liefern muss, bestimmt docxtpl selbst).
+
+    Jeder Tag wird einzeln ausgewertet — die Reihenfolge von Absätzen und
+    Tabellenzeilen im Parser-Text spielt damit keine Rolle.
+
+    Returns:
+        (Schleifen [{"variable", "liste", "felder"}], Syntaxfehler einzelner Tags)
+    """
+    schleifen: list[dict] = []
+    ausdruecke: list[str] = []
+    fehler: list[str] = []
+
+    def wurzeln(ausdruck: str) -> set[str]:
+        try:
+            return meta.find_undeclared_variables(_umgebung.parse(f"{{{{ {ausdruck} }}}}"))
+        except TemplateSyntaxError as e:
+            fehler.append(f"{ausdruck.strip()}: {e.message}")
+            return set()
+
+    for treffer in _AUSDRUCK.finditer(text):
+        ausdruck = treffer.group(1).strip()
+        ausdruecke.append(ausdruck)
+        wurzeln(ausdruck)
+
+    for treffer in _ANWEISUNG.finditer(text):
+        anweisung = treffer.group(1).strip()
+        schluesselwort = anweisung.split(maxsplit=1)[0] if anweisung else ""
+        if schluesselwort == "for" and (teile := _FOR.match(anweisung)):
+            iterierbar = teile.group(2)
+            ausdruecke.append(iterierbar)
+            liste = sorted(wurzeln(iterierbar))
+            for ziel in _NAME.findall(teile.group(1)):
+                schleifen.append({"variable": ziel, "liste": liste[0] if liste else None, "felder": []})
+        elif schluesselwort in ("if", "elif"):
+            ausdruck = anweisung[len(schluesselwort):]
+            ausdruecke.append(ausdruck)
+            wurzeln(ausdruck)
+        elif schluesselwort == "set" and (teile := _SET.match(anweisung)):
+            ausdruecke.append(teile.group(2))
+            wurzeln(teile.group(2))
+
+    # Felder, die auf Schleifenvariablen zugegriffen werden (e.titel, e["titel"])
+    for schleife in schleifen:
+        muster = re.compile(rf"\b{re.escape(schleife['variable'])}(?:\.(\w+)|\[['\"](\w+)['\"]\])")
+        felder = {a or b for ausdruck in ausdruecke for a, b in muster.findall(ausdruck)}
+        schleife["felder"] = sorted(felder)
+
+    return schleifen, fehler
+
+
+# ------------------------------------------------------------------
+# Private Hilfsfunktionen
+# ------------------------------------------------------------------
+
+def _kopf_fuss_texte(template_pfad: Path) -> list[str]:
+    """Absatztexte aus Kopf- und Fußzeilen (docxtpl rendert auch dort)."""
+    texte = []
+    with zipfile.ZipFile(template_pfad) as archiv:
+        for name in archiv.namelist():
+            if not re.fullmatch(r"word/(header|footer)\d*\.xml", name):
+                continue
+            wurzel = etree.fromstring(archiv.read(name))
+            for absatz in wurzel.iter(f"{{{W_NS}}}p"):
+                texte.append("".join(t.text or "" for t in absatz.iter(f"{{{W_NS}}}t")))
+    return texte
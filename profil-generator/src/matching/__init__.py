@@ -0,0 +1,3 @@
+from .skill_matcher import SkillMatcher, normalisiere_skill
+
+__all__ = ["SkillMatcher", "normalisiere_skill"]
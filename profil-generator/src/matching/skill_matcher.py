@@ -0,0 +1,275 @@
+"""
+Skill-Matcher
+
+Deterministischer, lokaler Abgleich eines Kandidatenprofils mit
+Projektanforderungen — ohne Claude:
+  - Skill-Namen werden normalisiert (Groß-/Kleinschreibung, Versionen,
+    Leerzeichen) und über eine Synonymtabelle vereinheitlicht ("K8s" = "Kubernetes")
+  - Erfahrungen werden gewichtet bewertet: Pflicht-Skills zählen mehr als
+    Wunsch-Skills, ein Treffer in den Technologien mehr als im Fließtext
+  - Abdeckung pro gefordertem Skill (wo im Profil belegt?)
+
+Einsatz:
+  - schnell_zuschneiden(): sofortiges Tailoring ohne API-Aufruf (nur Sortierung)
+  - relevanz(): Vorsortierung bzw. Fokussierung der Eingabe vor dem Claude-Aufruf
+  - abdeckung(): Anzeige, wie gut das Profil die Anforderungen abdeckt
+"""
+
+from functools import lru_cache
+import re
+
+from src.models.profile import Erfahrung, Kandidatenprofil, ProjektAnforderungen
+
+GEWICHT_PFLICHT = 3.0
+GEWICHT_WUNSCH = 1.0
+# Für Skills, die nur aus dem Ausschreibungstext erkannt wurden
+GEWICHT_ERKANNT = 2.0
+
+# Wo ein Skill in einer Erfahrung vorkommt → Faktor
+FAKTOR_TECHNOLOGIE = 1.0
+FAKTOR_TITEL = 0.8
+FAKTOR_TEXT = 0.6
+
+# Kanonischer Name → Schreibweisen, die dasselbe meinen (alles kleingeschrieben)
+SYNONYME: dict[str, tuple[str, ...]] = {
+    "kubernetes": ("k8s", "kube"),
+    "javascript": ("js", "ecmascript"),
+    "typescript": ("ts",),
+    "postgresql": ("postgres", "psql"),
+    "aws": ("amazon web services",),
+    "gcp": ("google cloud", "google cloud platform"),
+    "azure": ("microsoft azure",),
+    "c#": ("csharp", "c sharp"),
+    ".net": ("dotnet", ".net core", "dotnet core"),
+    "go": ("golang",),
+    "node.js": ("nodejs", "node js"),
+    "react": ("reactjs", "react.js"),
+    "vue": ("vuejs", "vue.js"),
+    "angular": ("angularjs",),
+    "ci/cd": ("cicd", "ci-cd", "continuous integration", "continuous delivery"),
+    "machine learning": ("ml",),
+    "spring boot": ("springboot",),
+    "sql server": ("mssql", "microsoft sql server"),
+    "elasticsearch": ("elastic search",),
+    "kafka": ("apache kafka",),
+}
+
+# Nur abgesetzte Versionen ("Python 3.11", "Java v17") — "S3", "EC2" bleiben ganz
+# Schreibweisen bis zu dieser Länge ("go", "js", "ml") zählen nur als ganzes
+# Token — auch ein Bindestrich trennt nicht ("Go-Live" ist kein Go)
+KURZE_FORM = 3
+
+_VERSION = re.compile(r"\s+v?\d+(\.\d+)*$")
+_LEERRAUM = re.compile(r"\s+")
+
+
+def _baue_alias_tabelle(synonyme: dict[str, tuple[str, ...]]) -> dict[str, str]:
+    tabelle = {}
+    for kanonisch, aliase in synonyme.items():
+        tabelle[kanonisch] = kanonisch
+        for alias in aliase:
+            tabelle[alias] = kanonisch
+    return tabelle
+
+
+_ALIASE = _baue_alias_tabelle(SYNONYME)
+
+
+def normalisiere_skill(skill: str) -> str:
+    """Vergleichsform eines Skills, z.B. "K8s" → "kubernetes", "Java 17" → "java"."""
+    wert = _LEERRAUM.sub(" ", skill.casefold()).strip()
+    ohne_version = _VERSION.sub("", wert)
+    if ohne_version:
+        wert = ohne_version
+    return _ALIASE.get(wert, wert)
+
+
+@lru_cache(maxsize=1024)
+def _muster(kanonisch: str) -> re.Pattern:
+    """Regex, die den Skill mit allen Schreibweisen als eigenes Wort findet."""
+    formen = {kanonisch, *SYNONYME.get(kanonisch, ())}
+
+    def alternativen(auswahl: set[str]) -> str:
+        return "|".join(re.escape(f) for f in sorted(auswahl, key=len, reverse=True))
+
+    lang = {f for f in formen if len(f) > KURZE_FORM}
+    kurz = formen - lang
+    teile = []
+    if lang:
+        teile.append(rf"(?<![\w#+.])(?:{alternativen(lang)})(?![\w#+])")
+    if kurz:
+        teile.append(rf"(?<![\w#+.-])(?:{alternativen(kurz)})(?![\w#+-])")
+    return re.compile("|".join(teile), re.IGNORECASE)
+
+
+class SkillMatcher:
+    def gewichtete_skills(
+        self,
+        anforderungen: ProjektAnforderungen,
+        profil: Kandidatenprofil | None = None,
+    ) -> dict[str, tuple[str, float]]:
+        """
+        Geforderte Skills: kanonischer Name → (Anzeigename, Gewicht).
+        Ohne Pflicht-/Wunsch-Skills werden die Skills des Profils gesucht,
+        die im Ausschreibungstext vorkommen (ohne Profil: keine).
+        """
+        skills: dict[str, tuple[str, float]] = {}
+        for name in anforderungen.wunsch_skills:
+            skills[normalisiere_skill(name)] = (name, GEWICHT_WUNSCH)
+        for name in anforderungen.pflicht_skills:
+            skills[normalisiere_skill(name)] = (name, GEWICHT_PFLICHT)
+        if skills:
+            return skills
+
+        text = " ".join(
+            t for t in (anforderungen.titel, anforderungen.beschreibung, anforderungen.rohe_ausschreibung) if t
+        )
+        for name in self._vokabular(profil):
+            kanonisch = normalisiere_skill(name)
+            if kanonisch not in skills and _muster(kanonisch).search(text):
+                skills[kanonisch] = (name, GEWICHT_ERKANNT)
+        return skills
+
+    def relevanz(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+    ) -> dict[str, list[float]]:
+        """Relevanz pro Eintrag in berufserfahrung und projekte (Originalreihenfolge)."""
+        skills = self.gewichtete_skills(anforderungen, profil)
+        return {
+            "berufserfahrung": [self._bewerte(e, skills) for e in profil.berufserfahrung],
+            "projekte": [self._bewerte(e, skills) for e in profil.projekte],
+        }
+
+    def abdeckung(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+    ) -> dict:
+        """
+        Wie gut deckt das Profil die geforderten Skills ab?
+
+        Returns:
+            {"skills": [{"skill", "gewicht", "abdeckung" (0..1), "fundstellen"}],
+             "gesamt": gewichteter Mittelwert (0..1)}
+        """
+        skills = self.gewichtete_skills(anforderungen, profil)
+        skill_liste = {
+            normalisiere_skill(s)
+            for s in profil.kernkompetenzen + [s for werte in profil.technische_skills.values() for s in werte]
+        }
+
+        ergebnis = []
+        for kanonisch, (name, gewicht) in skills.items():
+            fundstellen = []
+            abdeckung = 0.0
+            if kanonisch in skill_liste:
+                fundstellen.append("Skills")
+                abdeckung = 1.0
+            for liste in ("berufserfahrung", "projekte"):
+                for e in getattr(profil, liste):
+                    faktor = self._faktor(e, kanonisch)
+                    if faktor:
+                        fundstellen.append(" @ ".join(t for t in (e.titel, e.unternehmen) if t))
+                        abdeckung = max(abdeckung, 1.0 if faktor == FAKTOR_TECHNOLOGIE else 0.5)
+            if abdeckung < 1.0 and profil.zusammenfassung and _muster(kanonisch).search(profil.zusammenfassung):
+                fundstellen.append("Zusammenfassung")
+                abdeckung = max(abdeckung, 0.5)
+            ergebnis.append({
+                "skill": name,
+                "gewicht": gewicht,
+                "abdeckung": abdeckung,
+                "fundstellen": fundstellen,
+            })
+
+        summe_gewichte = sum(s["gewicht"] for s in ergebnis)
+        gesamt = (
+            sum(s["gewicht"] * s["abdeckung"] for s in ergebnis) / summe_gewichte
+            if summe_gewichte else 0.0
+        )
+        return {"skills": ergebnis, "gesamt": round(gesamt, 3)}
+
+    def schnell_zuschneiden(
+        self,
+        profil: Kandidatenprofil,
+        anforderungen: ProjektAnforderungen,
+    ) -> Kandidatenprofil:
+        """
+        Tailoring ohne API-Aufruf: sortiert Erfahrungen, Highlights, Kernkompetenzen
+        und Skill-Kategorien nach Relevanz. Texte bleiben unverändert.
+
+        Returns:
+            Angepasstes Profil (neues Objekt, Original bleibt unverändert)
+        """
+        skills = self.gewichtete_skills(anforderungen, profil)
+        neu = profil.model_copy(deep=True)
+
+        for liste in ("berufserfahrung", "projekte"):
+            eintraege = getattr(neu, liste)
+            werte = [self._bewerte(e, skills) for e in eintraege]
+            # sorted() ist stabil: bei Gleichstand bleibt die Originalreihenfolge
+            reihenfolge = sorted(range(len(eintraege)), key=lambda i: -werte[i])
+            setattr(neu, liste, [eintraege[i] for i in reihenfolge])
+            for e in eintraege:
+                e.highlights = self._sortiere_texte(e.highlights, skills)
+
+        neu.kernkompetenzen = self._sortiere_skills(neu.kernkompetenzen, skills)
+        kategorien = sorted(
+            neu.technische_skills,
+            key=lambda k: -sum(skills.get(normalisiere_skill(s), ("", 0.0))[1] for s in neu.technische_skills[k]),
+        )
+        neu.technische_skills = {
+            k: self._sortiere_skills(neu.technische_skills[k], skills) for k in kategorien
+        }
+
+        neu.modus = "tailored"
+        neu.projekt_referenz = anforderungen.titel
+        return neu
+
+    # ------------------------------------------------------------------
+    # Private Hilfsmethoden
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _vokabular(profil: Kandidatenprofil | None) -> list[str]:
+        """
+        Skills des Kandidaten, nach denen im Ausschreibungstext gesucht wird.
+        Die Synonymtabelle gehört bewusst nicht dazu: Einträge wie "go" oder
+        "ml" würden sonst Treffer für Skills erzeugen, die das Profil gar
+        nicht hat.
+        """
+        if profil is None:
+            return []
+        namen = (
+            profil.kernkompetenzen
+            + [s for werte in profil.technische_skills.values() for s in werte]
+            + [t for e in profil.berufserfahrung + profil.projekte for t in e.technologien]
+        )
+        return list(dict.fromkeys(namen))
+
+    @staticmethod
+    def _faktor(erfahrung: Erfahrung, kanonisch: str) -> float:
+        """Stärkster Beleg des Skills in einer Erfahrung (0 = kein Treffer)."""
+        if any(normalisiere_skill(t) == kanonisch for t in erfahrung.technologien):
+            return FAKTOR_TECHNOLOGIE
+        muster = _muster(kanonisch)
+        if muster.search(erfahrung.titel):
+            return FAKTOR_TITEL
+        texte = [erfahrung.beschreibung or ""] + erfahrung.highlights
+        if any(muster.search(t) for t in texte):
+            return FAKTOR_TEXT
+        return 0.0
+
+    def _bewerte(self, erfahrung: Erfahrung, skills: dict[str, tuple[str, float]]) -> float:
+        return sum(gewicht * self._faktor(erfahrung, k) for k, (_, gewicht) in skills.items())
+
+    @staticmethod
+    def _sortiere_texte(texte: list[str], skills: dict[str, tuple[str, float]]) -> list[str]:
+        def wert(text: str) -> float:
+            return sum(g for k, (_, g) in skills.items() if _muster(k).search(text))
+        return sorted(texte, key=lambda t: -wert(t))
+
+    @staticmethod
+    def _sortiere_skills(werte: list[str], skills: dict[str, tuple[str, float]]) -> list[str]:
+        return sorted(werte, key=lambda s: -skills.get(normalisiere_skill(s), ("", 0.0))[1])
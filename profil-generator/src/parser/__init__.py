@@ -1,4 +1,5 @@
 from .docx_parser import DocxParser
 from .pdf_parser import PdfParser
+from .normalisierung import normalisiere
 
-__all__ = ["DocxParser", "PdfParser"]
+__all__ = ["DocxParser", "PdfParser", "normalisiere"]
@@ -7,80 +7,104 @@ Extrahiert:
   - Dokumentstruktur (Überschriften, Abschnitte, Tabellen)
   - Styles/Formatting-Metadaten (Fonts, Farben, Layout)
 
+Alle Informationen entstehen in einem einzigen Durchlauf, der mit lxml
+über word/document.xml streamt (ohne python-docx-Proxyobjekte). Das
+Ergebnis wird am Parser gemerkt — weitere Aufrufe kosten nichts.
+
 HINWEIS: Die genauen Sektions-Namen und Felder werden nach der
 Template-Analyse der hochgeladenen Profile verfeinert.
 """
 
+from functools import cached_property
 from pathlib import Path
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 import json
+import posixpath
+import zipfile
+
+from docx import Document
+from docx.styles import BabelFish
+from lxml import etree
+
+from src.telemetrie import telemetrie
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+# 1 Twip = 635 EMU, 1 cm = 360000 EMU
+TWIPS_PRO_CM = 360000 / 635
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+def _w_attr(element, name: str) -> str | None:
+    return element.get(_w(name)) if element is not None else None
 
 
 class DocxParser:
     def __init__(self, pfad: str | Path):
         self.pfad = Path(pfad)
-        self.doc = Document(str(self.pfad))
         self._struktur: dict = {}
+        self._analyse: dict | None = None
+
+    @cached_property
+    def doc(self):
+        """python-docx-Dokument (wird nur bei Bedarf geladen)."""
+        return Document(str(self.pfad))
 
     # ------------------------------------------------------------------
     # Öffentliche Methoden
     # ------------------------------------------------------------------
 
+    def analysiere(self) -> dict:
+        """
+        Analysiert das Dokument in einem Durchlauf und merkt sich das Ergebnis.
+
+        Returns:
+            Dict mit text, struktur, tabellen, schriftarten, farben,
+            absatz_styles, seitenraender und anzahl_abschnitte
+        """
+        if self._analyse is None:
+            with telemetrie.stufe("parse_docx") as stufe:
+                self._analyse = self._analysiere_xml()
+                if telemetrie.aktiv:
+                    stufe.setze(
+                        eingabe_bytes=self.pfad.stat().st_size,
+                        zeichen=len(self._analyse["text"]),
+                    )
+        return self._analyse
+
     def extrahiere_text(self) -> str:
         """Gibt den vollständigen Text des Dokuments zurück (für Claude API)."""
-        zeilen = []
-        for absatz in self.doc.paragraphs:
-            if absatz.text.strip():
-                zeilen.append(absatz.text.strip())
-        for tabelle in self.doc.tables:
-            for zeile in tabelle.rows:
-                row_text = " | ".join(
-                    zelle.text.strip() for zelle in zeile.cells if zelle.text.strip()
-                )
-                if row_text:
-                    zeilen.append(row_text)
-        return "\n".join(zeilen)
+        return self.analysiere()["text"]
 
     def extrahiere_struktur(self) -> dict:
         """
         Analysiert die Dokumentstruktur (Überschriften → Abschnitte).
         Gibt ein Dict zurück: { "abschnitt_name": ["Inhalt", ...] }
         """
-        struktur = {}
-        aktueller_abschnitt = "_header"
-        struktur[aktueller_abschnitt] = []
-
-        for absatz in self.doc.paragraphs:
-            text = absatz.text.strip()
-            if not text:
-                continue
+        self._struktur = self.analysiere()["struktur"]
+        return self._struktur
 
-            stil = absatz.style.name if absatz.style else ""
-
-            if stil.startswith("Heading") or self._ist_ueberschrift(absatz):
-                aktueller_abschnitt = text
-                struktur[aktueller_abschnitt] = []
-            else:
-                struktur[aktueller_abschnitt].append(text)
-
-        self._struktur = struktur
-        return struktur
+    def extrahiere_tabellen(self) -> list[list[list[str]]]:
+        """Extrahiert Tabellen als Zeilen → Zellentexte (wie PdfParser)."""
+        return self.analysiere()["tabellen"]
 
     def extrahiere_style_info(self) -> dict:
         """
         Extrahiert Formatierungs-Metadaten für spätere Template-Nutzung.
         Wichtig um das exakte Layout zu reproduzieren.
         """
+        analyse = self.analysiere()
         style_info = {
-            "seitenraender": self._get_seitenraender(),
-            "schriftarten": self._get_schriftarten(),
-            "farben": self._get_farben(),
-            "absatz_styles": self._get_absatz_styles(),
-            "hat_tabellen": len(self.doc.tables) > 0,
-            "anzahl_tabellen": len(self.doc.tables),
-            "anzahl_abschnitte": len(self.doc.sections),
+            "seitenraender": analyse["seitenraender"],
+            "schriftarten": analyse["schriftarten"],
+            "farben": analyse["farben"],
+            "absatz_styles": analyse["absatz_styles"],
+            "hat_tabellen": len(analyse["tabellen"]) > 0,
+            "anzahl_tabellen": len(analyse["tabellen"]),
+            "anzahl_abschnitte": analyse["anzahl_abschnitte"],
         }
         return style_info
 
@@ -99,53 +123,203 @@ class DocxParser:
     # Private Hilfsmethoden
     # ------------------------------------------------------------------
 
-    def _ist_ueberschrift(self, absatz) -> bool:
+    def _analysiere_xml(self) -> dict:
+        with zipfile.ZipFile(self.pfad) as archiv:
+            dokument_pfad = self._hauptdokument_pfad(archiv)
+            stil_namen, standard_stil = self._lade_absatz_stile(archiv, dokument_pfad)
+
+            zeilen: list[str] = []
+            tabellen_zeilen: list[str] = []
+            tabellen: list[list[list[str]]] = []
+            struktur: dict[str, list[str]] = {"_header": []}
+            aktueller_abschnitt = "_header"
+            fonts: set[str] = set()
+            farben: set[str] = set()
+            absatz_styles: list[dict] = []
+            gesehene_styles: set[str] = set()
+            sektionen: list = []
+
+            with archiv.open(dokument_pfad) as datei:
+                for _, element in etree.iterparse(
+                    datei, events=("end",), tag=(_w("p"), _w("tbl"), _w("sectPr"))
+                ):
+                    body = element.getparent()
+                    if body is None or body.tag != _w("body"):
+                        continue
+
+                    if element.tag == _w("p"):
+                        text = self._absatz_text(element).strip()
+                        stil = stil_namen.get(
+                            _w_attr(element.find(f"{_w('pPr')}/{_w('pStyle')}"), "val"),
+                            standard_stil,
+                        )
+                        runs = element.findall(_w("r"))
+                        for run in runs:
+                            rpr = run.find(_w("rPr"))
+                            if rpr is None:
+                                continue
+                            font = _w_attr(rpr.find(_w("rFonts")), "ascii")
+                            if font:
+                                fonts.add(font)
+                            farbe = _w_attr(rpr.find(_w("color")), "val")
+                            if farbe and farbe != "auto":
+                                farben.add(farbe.upper())
+
+                        if stil not in gesehene_styles:
+                            gesehene_styles.add(stil)
+                            absatz_styles.append({"name": stil})
+
+                        sektion = element.find(f"{_w('pPr')}/{_w('sectPr')}")
+                        if sektion is not None:
+                            sektionen.append(self._seitenraender(sektion))
+
+                        if text:
+                            zeilen.append(text)
+                            if stil.startswith("Heading") or self._ist_ueberschrift(runs, text):
+                                aktueller_abschnitt = text
+                                struktur[aktueller_abschnitt] = []
+                            else:
+                                struktur[aktueller_abschnitt].append(text)
+
+                    elif element.tag == _w("tbl"):
+                        tabelle = []
+                        for zeile in element.iterchildren(_w("tr")):
+                            zellen = [
+                                "\n".join(
+                                    self._absatz_text(p) for p in zelle.iterchildren(_w("p"))
+                                ).strip()
+                                for zelle in zeile.iterchildren(_w("tc"))
+                            ]
+                            tabelle.append(zellen)
+                            row_text = " | ".join(z for z in zellen if z)
+                            if row_text:
+                                tabellen_zeilen.append(row_text)
+                        tabellen.append(tabelle)
+
+                    else:
+                        sektionen.append(self._seitenraender(element))
+
+                    # Verarbeitete Elemente freigeben (konstanter Speicher)
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del body[0]
+
+        leere_raender = {"oben_cm": None, "unten_cm": None, "links_cm": None, "rechts_cm": None}
+        return {
+            # Wie bisher: erst alle Absätze, dann alle Tabellenzeilen
+            "text": "\n".join(zeilen + tabellen_zeilen),
+            "struktur": struktur,
+            "tabellen": tabellen,
+            "schriftarten": sorted(fonts),
+            "farben": sorted(farben),
+            "absatz_styles": absatz_styles,
+            "seitenraender": sektionen[0] if sektionen else leere_raender,
+            "anzahl_abschnitte": len(sektionen),
+        }
+
+    def _ist_ueberschrift(self, runs: list, text: str) -> bool:
         """Heuristik: Erkennt Überschriften auch ohne Heading-Style."""
-        if not absatz.runs:
+        if not runs:
             return False
-        erster_run = absatz.runs[0]
-        ist_fett = erster_run.bold
-        ist_gross = (
-            erster_run.font.size and erster_run.font.size >= Pt(12)
-        )
-        ist_kurz = len(absatz.text.strip()) < 60
+        rpr = runs[0].find(_w("rPr"))
+        ist_fett = self._ist_fett(rpr)
+        groesse = _w_attr(rpr.find(_w("sz")) if rpr is not None else None, "val")
+        # sz in halben Punkten: 24 = 12 pt
+        ist_gross = groesse is not None and groesse.isdigit() and int(groesse) >= 24
+        ist_kurz = len(text) < 60
         return bool(ist_fett and ist_kurz) or bool(ist_gross and ist_kurz and ist_fett)
 
-    def _get_seitenraender(self) -> dict:
-        sektion = self.doc.sections[0]
+    @staticmethod
+    def _ist_fett(rpr) -> bool:
+        fett = rpr.find(_w("b")) if rpr is not None else None
+        if fett is None:
+            return False
+        return _w_attr(fett, "val") not in ("0", "false", "off")
+
+    @staticmethod
+    def _absatz_text(absatz) -> str:
+        """Text eines w:p wie python-docx: direkte Runs und Hyperlinks."""
+        teile = []
+        for kind in absatz:
+            if kind.tag == _w("r"):
+                runs = (kind,)
+            elif kind.tag == _w("hyperlink"):
+                runs = kind.iterchildren(_w("r"))
+            else:
+                continue
+            for run in runs:
+                for e in run:
+                    if e.tag == _w("t"):
+                        teile.append(e.text or "")
+                    elif e.tag in (_w("tab"), _w("ptab")):
+                        teile.append("\t")
+                    elif e.tag == _w("cr") or (
+                        e.tag == _w("br") and _w_attr(e, "type") in (None, "textWrapping")
+                    ):
+                        teile.append("\n")
+                    elif e.tag == _w("noBreakHyphen"):
+                        teile.append("-")
+        return "".join(teile)
+
+    @staticmethod
+    def _seitenraender(sektion) -> dict:
+        raender = sektion.find(_w("pgMar"))
+
+        def in_cm(name: str) -> float | None:
+            wert = _w_attr(raender, name)
+            if wert is None:
+                return None
+            return round(int(wert) / TWIPS_PRO_CM, 2)
+
         return {
-            "oben_cm": round(sektion.top_margin.cm, 2) if sektion.top_margin else None,
-            "unten_cm": round(sektion.bottom_margin.cm, 2) if sektion.bottom_margin else None,
-            "links_cm": round(sektion.left_margin.cm, 2) if sektion.left_margin else None,
-            "rechts_cm": round(sektion.right_margin.cm, 2) if sektion.right_margin else None,
+            "oben_cm": in_cm("top"),
+            "unten_cm": in_cm("bottom"),
+            "links_cm": in_cm("left"),
+            "rechts_cm": in_cm("right"),
         }
 
-    def _get_schriftarten(self) -> list[str]:
-        fonts = set()
-        for absatz in self.doc.paragraphs:
-            for run in absatz.runs:
-                if run.font.name:
-                    fonts.add(run.font.name)
-        return sorted(fonts)
-
-    def _get_farben(self) -> list[str]:
-        farben = set()
-        for absatz in self.doc.paragraphs:
-            for run in absatz.runs:
-                if run.font.color and run.font.color.type is not None:
-                    try:
-                        rgb = run.font.color.rgb
-                        farben.add(str(rgb))
-                    except Exception:
-                        pass
-        return sorted(farben)
-
-    def _get_absatz_styles(self) -> list[dict]:
-        styles = []
-        gesehen = set()
-        for absatz in self.doc.paragraphs:
-            stil_name = absatz.style.name if absatz.style else "Normal"
-            if stil_name not in gesehen:
-                gesehen.add(stil_name)
-                styles.append({"name": stil_name})
-        return styles
+    @staticmethod
+    def _hauptdokument_pfad(archiv: zipfile.ZipFile) -> str:
+        try:
+            rels = etree.fromstring(archiv.read("_rels/.rels"))
+        except KeyError:
+            return "word/document.xml"
+        for rel in rels.iterchildren(f"{{{REL_NS}}}Relationship"):
+            if rel.get("Type", "").endswith("/officeDocument"):
+                return rel.get("Target").lstrip("/")
+        return "word/document.xml"
+
+    @staticmethod
+    def _lade_absatz_stile(
+        archiv: zipfile.ZipFile, dokument_pfad: str
+    ) -> tuple[dict[str, str], str]:
+        """Liest styles.xml: Style-ID → Anzeigename, plus Standard-Absatzstil."""
+        ordner, name = posixpath.split(dokument_pfad)
+        styles_pfad = posixpath.join(ordner, "styles.xml")
+        try:
+            rels = etree.fromstring(archiv.read(posixpath.join(ordner, "_rels", f"{name}.rels")))
+            for rel in rels.iterchildren(f"{{{REL_NS}}}Relationship"):
+                if rel.get("Type", "").endswith("/styles"):
+                    styles_pfad = posixpath.normpath(posixpath.join(ordner, rel.get("Target")))
+        except KeyError:
+            pass
+
+        namen: dict[str, str] = {}
+        standard = "Normal"
+        try:
+            styles = etree.fromstring(archiv.read(styles_pfad))
+        except KeyError:
+            return namen, standard
+
+        for stil in styles.iterchildren(_w("style")):
+            if _w_attr(stil, "type") != "paragraph":
+                continue
+            stil_id = _w_attr(stil, "styleId")
+            name_element = stil.find(_w("name"))
+            anzeige = BabelFish.internal2ui(
+                _w_attr(name_element, "val") if name_element is not None else stil_id
+            )
+            namen[stil_id] = anzeige
+            if _w_attr(stil, "default") in ("1", "true", "on"):
+                standard = anzeige
+        return namen, standard
@@ -0,0 +1,239 @@
+"""
+Text-Normalisierung
+
+Bereinigt den Rohtext der Parser, bevor er an Claude geht. Entfernt wird
+nur, was keine Profilinformation trägt:
+  - Kopf- und Fußzeilen, die sich auf (fast) jeder Seite wiederholen — ab
+    dem zweiten Vorkommen; das erste bleibt stehen (oft Name und Titel)
+  - Seitenzahlen ("Seite 3 von 7", "- 3 -"; "3/7" und "3" nur als erste
+    oder letzte Zeile einer Seite)
+  - Direkt aufeinanderfolgende doppelte Zeilen
+  - Wiederholte Kontaktzeilen (E-Mail, Web, Telefon mit "+49"/"Tel" o.ä.)
+    und wiederholte Zeilenblöcke am Seitenrand bzw. aus Kontaktzeilen
+    (z.B. Firmen-Boilerplate auf jeder Seite) — inhaltliche Blöcke wie
+    "Rolle: / Backend-Entwickler / Aufgaben:" bleiben stehen
+  - Überzählige Leerzeichen, Tabs und Leerzeilen
+
+Zeilen mit Jahreszahl oder Datum ("2015", "10/2020", "01/2019 - 12/2021")
+werden nie entfernt, auch wenn sie sich wiederholen.
+
+Jeder Aufruf liefert einen Bericht mit der geschätzten Token-Ersparnis
+(~4 Zeichen pro Token).
+
+Verwendung:
+    text, bericht = normalisiere(PdfParser(pfad).extrahiere_seiten())
+    text, bericht = normalisiere(DocxParser(pfad).extrahiere_text())
+"""
+
+import math
+import re
+
+from src.telemetrie import telemetrie
+
+ZEICHEN_PRO_TOKEN = 4
+
+# Zeilen am Seitenanfang/-ende, die als Kopf-/Fußzeile in Frage kommen
+RAND_ZEILEN = 3
+# Anteil der Seiten, auf denen eine Randzeile an gleicher Position vorkommen
+# muss (bis 3 Seiten: auf allen)
+ANTEIL_WIEDERHOLUNG = 0.6
+# Mindestlänge eines wiederholten Zeilenblocks
+BLOCK_ZEILEN = 3
+
+_LEERRAUM = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u3000]+")
+# Eindeutige Seitenmarken (überall): "Seite 3", "Page 3 of 7", "- 3 -"
+_SEITENZAHL = re.compile(
+    r"^(?:(?:seite|page|s\.)\s*\d{1,3}(?:\s*(?:/|von|of|aus)\s*\d{1,3})?"
+    r"|[-–—]\s*\d{1,3}\s*[-–—])$",
+    re.IGNORECASE,
+)
+# Nackte Seitenzahl "3" bzw. "3 / 7" — nur am oberen oder unteren Seitenrand
+_SEITENZAHL_RAND = re.compile(r"^([1-9]\d{0,2})(?:\s*/\s*([1-9]\d{0,2}))?$")
+_KONTAKT = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.-]+"                         # E-Mail
+    r"|(?:https?://|www\.)\S+"                          # Web
+    r"|(?:tel|telefon|mobil|phone|fax)\b\.?:?"          # Telefon-Label
+    r"|(?<![\w+])(?:\+|00)\d{1,3}[\d ()/-]{6,}\d",       # Nummer mit Ländervorwahl
+    re.IGNORECASE,
+)
+# Jahreszahlen und Datumsangaben (Zeiträume, Abschlüsse, Zertifikate)
+_DATUM = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)|\b\d{1,2}\.\d{1,2}\.\d{2}\b")
+_ZIFFERN = re.compile(r"\d+")
+
+
+def schaetze_tokens(text: str) -> int:
+    """Grobe Token-Schätzung (~4 Zeichen pro Token)."""
+    return math.ceil(len(text) / ZEICHEN_PRO_TOKEN)
+
+
+def normalisiere(seiten: list[str] | str) -> tuple[str, dict]:
+    """
+    Normalisiert den Text eines Profils.
+
+    Args:
+        seiten: Text pro Seite (z.B. PdfParser.extrahiere_seiten()) oder ein
+                einzelner Text. Kopf-/Fußzeilen werden nur bei mehreren
+                Seiten erkannt; Seitenumbrüche (\\f) in einem Text zählen mit.
+
+    Returns:
+        (normalisierter Text, Bericht mit zeichen_vorher/-nachher,
+         tokens_vorher/-nachher, tokens_gespart und entfernten Zeilen pro Regel)
+    """
+    if isinstance(seiten, str):
+        seiten = seiten.split("\f")
+
+    with telemetrie.stufe("normalisierung", seiten=len(seiten)) as stufe:
+        original = "\n\n".join(seiten)
+        entfernt = dict.fromkeys(
+            ("kopf_fusszeilen", "seitenzahlen", "duplikate", "kontaktzeilen", "bloecke"), 0
+        )
+
+        seiten_zeilen = [[_LEERRAUM.sub(" ", z).strip() for z in s.splitlines()] for s in seiten]
+        seiten_zeilen = _entferne_raender(seiten_zeilen, entfernt)
+
+        zeilen: list[str] = []
+        # Indizes in zeilen, die zu den ersten/letzten RAND_ZEILEN ihrer Seite gehören
+        seitenrand: set[int] = set()
+        for nr, seite in enumerate(seiten_zeilen):
+            if nr:
+                zeilen.append("")
+            gefuellt = [i for i, z in enumerate(seite) if z]
+            rand = {gefuellt[0], gefuellt[-1]} if gefuellt else set()
+            behalten = []
+            for i, zeile in enumerate(seite):
+                if zeile and _ist_seitenzahl(zeile, i in rand):
+                    entfernt["seitenzahlen"] += 1
+                    continue
+                behalten.append(zeile)
+            gefuellt = [i for i, z in enumerate(behalten) if z]
+            seitenrand.update(len(zeilen) + i for i in gefuellt[:RAND_ZEILEN] + gefuellt[-RAND_ZEILEN:])
+            zeilen.extend(behalten)
+
+        zeilen = _entferne_wiederholungen(zeilen, seitenrand, entfernt)
+        text = re.sub(r"\n{3,}", "\n\n", "\n".join(zeilen)).strip()
+
+        bericht = {
+            "zeichen_vorher": len(original),
+            "zeichen_nachher": len(text),
+            "tokens_vorher": schaetze_tokens(original),
+            "tokens_nachher": schaetze_tokens(text),
+            "entfernt": entfernt,
+        }
+        bericht["tokens_gespart"] = bericht["tokens_vorher"] - bericht["tokens_nachher"]
+        stufe.setze(tokens_gespart=bericht["tokens_gespart"])
+    return text, bericht
+
+
+# ------------------------------------------------------------------
+# Private Hilfsfunktionen
+# ------------------------------------------------------------------
+
+def _ist_seitenzahl(zeile: str, am_rand: bool) -> bool:
+    if _SEITENZAHL.match(zeile):
+        return True
+    treffer = _SEITENZAHL_RAND.match(zeile) if am_rand else None
+    # "3 / 7": Seite nicht hinter der Gesamtzahl
+    return bool(treffer) and (treffer.group(2) is None or int(treffer.group(1)) <= int(treffer.group(2)))
+
+
+def _muster(zeile: str) -> str:
+    """Vergleichsform einer Randzeile: Ziffern egal ("Seite 2" == "Seite 3")."""
+    return _ZIFFERN.sub("#", zeile.casefold())
+
+
+def _randzeilen(zeilen: list[str]) -> dict[int, set[tuple]]:
+    """
+    Erste und letzte RAND_ZEILEN nicht-leere Zeilen einer Seite:
+    Index → Schlüssel (Position vom oberen bzw. unteren Rand, Muster).
+    """
+    gefuellt = [i for i, z in enumerate(zeilen) if z]
+    raender: dict[int, set[tuple]] = {}
+    for position, i in enumerate(gefuellt[:RAND_ZEILEN]):
+        raender.setdefault(i, set()).add(("oben", position, _muster(zeilen[i])))
+    for position, i in enumerate(reversed(gefuellt[-RAND_ZEILEN:])):
+        raender.setdefault(i, set()).add(("unten", position, _muster(zeilen[i])))
+    return raender
+
+
+def _entferne_raender(seiten: list[list[str]], entfernt: dict) -> list[list[str]]:
+    """
+    Entfernt Randzeilen, die auf den meisten Seiten an gleicher Stelle stehen.
+    Das erste Vorkommen bleibt — eine Kopfzeile "Max Mustermann / Senior
+    Developer" ist sonst nirgends mehr im Text.
+    """
+    if len(seiten) < 2:
+        return seiten
+
+    raender_pro_seite = [_randzeilen(zeilen) for zeilen in seiten]
+    haeufigkeit: dict[tuple, int] = {}
+    for raender in raender_pro_seite:
+        for schluessel in set().union(*raender.values()):
+            haeufigkeit[schluessel] = haeufigkeit.get(schluessel, 0) + 1
+
+    if len(seiten) <= 3:
+        schwelle = len(seiten)
+    else:
+        schwelle = max(3, math.ceil(len(seiten) * ANTEIL_WIEDERHOLUNG))
+    wiederholt = {k for k, n in haeufigkeit.items() if n >= schwelle}
+    if not wiederholt:
+        return seiten
+
+    ergebnis = []
+    gesehen: set[tuple] = set()
+    for zeilen, raender in zip(seiten, raender_pro_seite):
+        weg = set()
+        for i, schluessel in raender.items():
+            treffer = schluessel & wiederholt
+            if treffer & gesehen and not _DATUM.search(zeilen[i]):
+                weg.add(i)
+            gesehen |= treffer
+        entfernt["kopf_fusszeilen"] += len(weg)
+        ergebnis.append([z for i, z in enumerate(zeilen) if i not in weg])
+    return ergebnis
+
+
+def _entferne_wiederholungen(zeilen: list[str], seitenrand: set[int], entfernt: dict) -> list[str]:
+    """
+    Entfernt direkte Duplikate, erneut auftauchende Kontaktzeilen und
+    Zeilenblöcke (BLOCK_ZEILEN Zeilen), die es vorher schon gab — Blöcke nur,
+    wenn jede Zeile am Seitenrand steht oder eine Kontaktzeile ist, und zwar
+    beim früheren wie beim erneuten Vorkommen.
+    Andere wiederholte Zeilen und Blöcke (z.B. "Rolle: / Backend-Entwickler /
+    Aufgaben:" pro Projekt) und Zeilen mit Datum bleiben stehen.
+    """
+    gefuellt = [i for i, z in enumerate(zeilen) if z]
+    # Blöcke, die schon einmal als Boilerplate (Seitenrand/Kontakt) vorkamen
+    bloecke: set[tuple[str, ...]] = set()
+    zu_entfernen: set[int] = set()
+    for pos in range(len(gefuellt) - BLOCK_ZEILEN + 1):
+        indizes = gefuellt[pos:pos + BLOCK_ZEILEN]
+        if not all(i in seitenrand or _KONTAKT.search(zeilen[i]) for i in indizes):
+            continue
+        block = tuple(zeilen[i].casefold() for i in indizes)
+        if block in bloecke:
+            zu_entfernen.update(indizes)
+        else:
+            bloecke.add(block)
+
+    ergebnis: list[str] = []
+    kontakte: set[str] = set()
+    letzte = None
+    for i, zeile in enumerate(zeilen):
+        if not zeile:
+            ergebnis.append(zeile)
+            continue
+        vergleich = zeile.casefold()
+        if _DATUM.search(zeile):
+            ergebnis.append(zeile)
+        elif i in zu_entfernen:
+            entfernt["bloecke"] += 1
+        elif vergleich == letzte:
+            entfernt["duplikate"] += 1
+        elif _KONTAKT.search(zeile) and vergleich in kontakte:
+            entfernt["kontaktzeilen"] += 1
+        else:
+            if _KONTAKT.search(zeile):
+                kontakte.add(vergleich)
+            ergebnis.append(zeile)
+        letzte = vergleich
+    return ergebnis
@@ -6,12 +6,20 @@ Extrahiert rohen Text für:
   - Weitergabe an Claude API (Profildaten verstehen)
   - Konvertierung in das DOCX-Template-Format
 
+Die Datei wird einmal geöffnet; Text und Tabellen entstehen in einem
+gemeinsamen Durchlauf pro Seite. Lange PDFs können optional seitenweise
+auf mehrere Prozesse verteilt werden (parallel=True).
+
 HINWEIS: PDFs können keine 1:1 Layouts liefern. Das Layout
 kommt immer vom DOCX-Template. Der PDF-Parser ist für
 Dateneingabe (Inhalt lesen), nicht für Layout-Reproduktion.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import os
+
+from src.telemetrie import telemetrie
 
 try:
     import pdfplumber
@@ -19,34 +27,102 @@ try:
 except ImportError:
     PDF_VERFUEGBAR = False
 
+# Ab dieser Seitenzahl lohnt sich die Verteilung auf mehrere Prozesse
+MIN_SEITEN_PARALLEL = 20
+
 
 class PdfParser:
-    def __init__(self, pfad: str | Path):
+    def __init__(
+        self,
+        pfad: str | Path,
+        parallel: bool = False,
+        max_prozesse: int | None = None,
+    ):
+        """
+        Args:
+            pfad: Pfad zur PDF-Datei
+            parallel: Seitenbereiche langer PDFs (ab MIN_SEITEN_PARALLEL Seiten)
+                      in einem Prozess-Pool verarbeiten
+            max_prozesse: Obergrenze für den Pool. Standard: Anzahl CPUs
+        """
         if not PDF_VERFUEGBAR:
             raise ImportError(
                 "pdfplumber ist nicht installiert. Bitte 'pip install pdfplumber' ausführen."
             )
         self.pfad = Path(pfad)
+        self.parallel = parallel
+        self.max_prozesse = max_prozesse or os.cpu_count() or 1
+        self._seiten: list[tuple[str, list]] | None = None
 
     def extrahiere_text(self) -> str:
         """Gibt den vollständigen Text des PDFs zurück."""
-        with pdfplumber.open(str(self.pfad)) as pdf:
-            seiten_texte = []
-            for seite in pdf.pages:
-                text = seite.extract_text()
-                if text:
-                    seiten_texte.append(text)
-        return "\n\n".join(seiten_texte)
+        return "\n\n".join(self.extrahiere_seiten())
+
+    def extrahiere_seiten(self) -> list[str]:
+        """Text pro Seite (leere Seiten werden ausgelassen)."""
+        return [text for text, _ in self._analysiere() if text]
 
     def extrahiere_tabellen(self) -> list[list[list[str]]]:
         """Extrahiert Tabellen aus dem PDF (falls vorhanden)."""
         alle_tabellen = []
-        with pdfplumber.open(str(self.pfad)) as pdf:
-            for seite in pdf.pages:
-                tabellen = seite.extract_tables()
-                alle_tabellen.extend(tabellen)
+        for _, tabellen in self._analysiere():
+            alle_tabellen.extend(tabellen)
         return alle_tabellen
 
     def seitenanzahl(self) -> int:
-        with pdfplumber.open(str(self.pfad)) as pdf:
-            return len(pdf.pages)
+        return len(self._analysiere())
+
+    # ------------------------------------------------------------------
+    # Private Hilfsmethoden
+    # ------------------------------------------------------------------
+
+    def _analysiere(self) -> list[tuple[str, list]]:
+        """Einmaliger Durchlauf über alle Seiten; Ergebnis wird gemerkt."""
+        if self._seiten is not None:
+            return self._seiten
+
+        with telemetrie.stufe("parse_pdf") as stufe:
+            with pdfplumber.open(str(self.pfad)) as pdf:
+                anzahl = len(pdf.pages)
+                parallel = self.parallel and anzahl >= MIN_SEITEN_PARALLEL and self.max_prozesse >= 2
+                if not parallel:
+                    self._seiten = [_analysiere_seite(seite) for seite in pdf.pages]
+
+            if parallel:
+                self._seiten = self._analysiere_parallel(anzahl)
+            if telemetrie.aktiv:
+                stufe.setze(
+                    eingabe_bytes=self.pfad.stat().st_size,
+                    seiten=anzahl,
+                    parallel=parallel,
+                )
+        return self._seiten
+
+    def _analysiere_parallel(self, anzahl: int) -> list[tuple[str, list]]:
+        prozesse = min(self.max_prozesse, anzahl // (MIN_SEITEN_PARALLEL // 2))
+        groesse = -(-anzahl // prozesse)   # aufrunden
+        bereiche = [(start, min(start + groesse, anzahl)) for start in range(0, anzahl, groesse)]
+
+        with ProcessPoolExecutor(max_workers=len(bereiche)) as pool:
+            teile = pool.map(
+                _analysiere_bereich,
+                [str(self.pfad)] * len(bereiche),
+                [start for start, _ in bereiche],
+                [ende for _, ende in bereiche],
+            )
+            # map() liefert in Eingabereihenfolge → Seiten bleiben sortiert
+            return [seite for teil in teile for seite in teil]
+
+
+def _analysiere_seite(seite) -> tuple[str, list]:
+    """Text und Tabellen einer Seite; Seiten-Cache danach freigeben."""
+    text = seite.extract_text() or ""
+    tabellen = seite.extract_tables()
+    seite.flush_cache()
+    return text, tabellen
+
+
+def _analysiere_bereich(pfad: str, start: int, ende: int) -> list[tuple[str, list]]:
+    """Worker für den Prozess-Pool: verarbeitet die Seiten [start, ende)."""
+    with pdfplumber.open(pfad) as pdf:
+        return [_analysiere_seite(pdf.pages[i]) for i in range(start, ende)]
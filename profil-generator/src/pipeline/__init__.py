@@ -0,0 +1,5 @@
+from .batch import BatchVerarbeitung
+from .jobs import Job, JobQueue
+from .projekte import ProjektFanout
+
+__all__ = ["BatchVerarbeitung", "Job", "JobQueue", "ProjektFanout"]
@@ -0,0 +1,293 @@
+"""
+Batch-Verarbeitung
+
+Konvertiert einen ganzen Ordner mit Kandidatenprofilen (DOCX/PDF) ohne UI:
+  Parser → Normalisierung → ProfilTailoring.extrahiere_profil → DocxGenerator → PdfConverter
+
+  - Parsen und Rendern (CPU-lastig) laufen in einem Prozess-Pool
+  - Die Claude-Extraktion läuft async mit begrenzter Parallelität
+  - Die PDF-Konvertierung erfolgt gesammelt (konvertiere_batch)
+  - Fortschritt wird nach jeder Datei in <ausgabe>/.fortschritt.jsonl
+    protokolliert; ein erneuter Start überspringt fertige Dateien
+
+Ergebnisse, Fortschritt und Fehler sind nach dem Eingabepfad geschlüsselt;
+der Inhalts-Hash dient nur dazu, beim Neustart geänderte Dateien zu erkennen.
+Die Stufen, die im Prozess-Pool laufen (Parser, Normalisierung, Render),
+werden im Worker gemessen und an den Elternprozess zurückgegeben.
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import os
+import statistics
+import time
+
+from src.ai.tailoring import ProfilTailoring
+from src.generator.pdf_converter import PdfConverter
+from src.models.profile import Kandidatenprofil
+from src.telemetrie import telemetrie
+
+UNTERSTUETZTE_ENDUNGEN = (".docx", ".pdf")
+
+
+# ------------------------------------------------------------------
+# Worker-Funktionen (laufen im Prozess-Pool, müssen picklebar sein)
+# ------------------------------------------------------------------
+
+def _parse_datei(pfad: str) -> str:
+    from src.parser.normalisierung import normalisiere
+    if pfad.lower().endswith(".docx"):
+        from src.parser.docx_parser import DocxParser
+        return normalisiere(DocxParser(pfad).extrahiere_text())[0]
+    from src.parser.pdf_parser import PdfParser
+    return normalisiere(PdfParser(pfad).extrahiere_seiten())[0]
+
+
+def _rendere(template_pfad: str, profil_json: str, ziel: str) -> str:
+    from src.generator.docx_generator import DocxGenerator
+    profil = Kandidatenprofil.model_validate_json(profil_json)
+    return str(DocxGenerator(template_pfad).generiere(profil, ziel))
+
+
+def _mit_telemetrie(funktion, lauf_id: str, *args) -> tuple:
+    """
+    Führt funktion im Worker aus und gibt (Ergebnis, gemessene Stufen) zurück —
+    die Telemetrie-Instanz des Worker-Prozesses sieht der Elternprozess nicht.
+    Ein Worker bearbeitet immer nur einen Auftrag, daher genügt leeren().
+    """
+    telemetrie.leeren()
+    telemetrie.aktiviere_im_kontext(True)
+    with telemetrie.lauf(lauf_id):
+        ergebnis = funktion(*args)
+    return ergebnis, telemetrie.eintraege()
+
+
+class Fortschritt:
+    """
+    Append-only Protokoll fertiger Dateien (überlebt Abstürze), geschlüsselt
+    nach Eingabepfad. Der gespeicherte Inhalts-Hash erkennt geänderte Dateien.
+    """
+
+    def __init__(self, pfad: Path):
+        self.pfad = pfad
+        self.eintraege: dict[str, dict] = {}
+        if pfad.exists():
+            for zeile in pfad.read_text(encoding="utf-8").splitlines():
+                try:
+                    eintrag = json.loads(zeile)
+                except json.JSONDecodeError:
+                    continue    # halb geschriebene letzte Zeile nach Absturz
+                if "eingabe" in eintrag:
+                    self.eintraege.setdefault(eintrag["eingabe"], {}).update(eintrag)
+
+    def ist_fertig(self, eingabe: str, datei_hash: str, mit_pdf: bool) -> bool:
+        if self.docx_von(eingabe, datei_hash) is None:
+            return False
+        pdf = self.eintraege[eingabe].get("pdf")
+        return not mit_pdf or bool(pdf) and Path(pdf).exists()
+
+    def docx_von(self, eingabe: str, datei_hash: str) -> Path | None:
+        eintrag = self.eintraege.get(eingabe)
+        if eintrag and eintrag.get("hash") == datei_hash and eintrag.get("docx") and Path(eintrag["docx"]).exists():
+            return Path(eintrag["docx"])
+        return None
+
+    def markiere(self, eingabe: str, **felder) -> None:
+        eintrag = {"eingabe": eingabe, **felder}
+        self.eintraege.setdefault(eingabe, {}).update(eintrag)
+        with open(self.pfad, "a", encoding="utf-8") as f:
+            f.write(json.dumps(eintrag, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class BatchVerarbeitung:
+    def __init__(
+        self,
+        template_pfad: str | Path,
+        ausgabe_ordner: str | Path = "output/batch",
+        max_prozesse: int | None = None,
+        max_parallel_llm: int = 5,
+        mit_pdf: bool = True,
+        tailoring: ProfilTailoring | None = None,
+        bei_datei: Callable[[Path, Path | None, str | None], None] | None = None,
+    ):
+        """
+        Args:
+            template_pfad: DOCX-Template für alle Profile
+            ausgabe_ordner: Zielordner für DOCX/PDF und das Fortschrittsprotokoll
+            max_prozesse: Größe des Prozess-Pools für Parsen/Rendern. Standard: CPUs
+            max_parallel_llm: Gleichzeitige Claude-Anfragen
+            mit_pdf: Zusätzlich PDFs erzeugen
+            tailoring: Eigene ProfilTailoring-Instanz (z.B. mit Cache)
+            bei_datei: Wird nach jeder Datei mit (Eingabe, DOCX-Pfad, Fehler)
+                       aufgerufen — DOCX-Pfad bzw. Fehler ist jeweils None
+        """
+        self.template_pfad = Path(template_pfad)
+        if not self.template_pfad.exists():
+            raise FileNotFoundError(f"Template nicht gefunden: {self.template_pfad}")
+        self.ausgabe_ordner = Path(ausgabe_ordner)
+        self.ausgabe_ordner.mkdir(parents=True, exist_ok=True)
+        self.max_prozesse = max_prozesse or os.cpu_count() or 1
+        self.max_parallel_llm = max_parallel_llm
+        self.mit_pdf = mit_pdf
+        self.tailoring = tailoring or ProfilTailoring()
+        self.bei_datei = bei_datei
+        self.fortschritt = Fortschritt(self.ausgabe_ordner / ".fortschritt.jsonl")
+
+        self._dauern: dict[str, list[float]] = {}
+        self._fehler: dict[str, str] = {}
+        self._ziel_namen: dict[Path, str] = {}
+
+    # ------------------------------------------------------------------
+    # Öffentliche Methoden
+    # ------------------------------------------------------------------
+
+    def verarbeite_ordner(self, eingabe_ordner: str | Path) -> dict:
+        """
+        Verarbeitet alle DOCX/PDF-Dateien im Ordner.
+
+        Returns:
+            Zusammenfassung (Anzahl, Fehler, Durchsatz, Latenzen pro Stufe)
+        """
+        dateien = sorted(
+            p.resolve() for p in Path(eingabe_ordner).iterdir()
+            if p.is_file() and p.suffix.lower() in UNTERSTUETZTE_ENDUNGEN
+        )
+        start = time.perf_counter()
+
+        stems = [p.stem for p in dateien]
+        self._ziel_namen = {
+            # profil.docx und profil.pdf nicht auf dieselbe Ausgabe schreiben
+            p: p.stem if stems.count(p.stem) == 1 else f"{p.stem}_{p.suffix[1:].lower()}"
+            for p in dateien
+        }
+
+        offen: list[tuple[Path, str]] = []
+        uebersprungen = 0
+        for pfad in dateien:
+            datei_hash = hashlib.sha256(pfad.read_bytes()).hexdigest()
+            if self.fortschritt.ist_fertig(str(pfad), datei_hash, self.mit_pdf):
+                uebersprungen += 1
+            else:
+                offen.append((pfad, datei_hash))
+
+        docx_pfade = asyncio.run(self._verarbeite_alle(offen))
+        if self.mit_pdf and docx_pfade:
+            self._konvertiere_pdfs(docx_pfade)
+
+        return self._zusammenfassung(len(dateien), uebersprungen, time.perf_counter() - start)
+
+    # ------------------------------------------------------------------
+    # Private Methoden
+    # ------------------------------------------------------------------
+
+    async def _verarbeite_alle(self, offen: list[tuple[Path, str]]) -> dict[Path, Path]:
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_parallel_llm)
+        with ProcessPoolExecutor(max_workers=self.max_prozesse) as pool:
+            ergebnisse = await asyncio.gather(
+                *(
+                    self._verarbeite_datei(loop, pool, semaphore, pfad, datei_hash)
+                    for pfad, datei_hash in offen
+                )
+            )
+        return {pfad: docx for (pfad, _), docx in zip(offen, ergebnisse) if docx is not None}
+
+    async def _verarbeite_datei(
+        self, loop, pool, semaphore, pfad: Path, datei_hash: str
+    ) -> Path | None:
+        # DOCX bereits fertig (Absturz vor der PDF-Stufe) → nur noch konvertieren
+        fertiges_docx = self.fortschritt.docx_von(str(pfad), datei_hash)
+        if fertiges_docx is not None:
+            return fertiges_docx
+
+        # Ein Lauf pro Datei (der Task hat seinen eigenen Kontext)
+        lauf_id = f"{pfad.name}:{datei_hash[:8]}"
+        try:
+            t = time.perf_counter()
+            rohtext = await self._im_pool(loop, pool, lauf_id, _parse_datei, str(pfad))
+            self._messe("parse", t)
+
+            async with semaphore:
+                t = time.perf_counter()
+                with telemetrie.lauf(lauf_id):
+                    profil = await self.tailoring.extrahiere_profil_async(rohtext)
+                self._messe("extraktion", t)
+
+            t = time.perf_counter()
+            ziel = self.ausgabe_ordner / f"{self._ziel_namen[pfad]}.docx"
+            docx_pfad = Path(
+                await self._im_pool(
+                    loop, pool, lauf_id,
+                    _rendere, str(self.template_pfad), profil.model_dump_json(), str(ziel),
+                )
+            )
+            self._messe("render", t)
+        except Exception as e:
+            self._fehler[str(pfad)] = f"{type(e).__name__}: {e}"
+            if self.bei_datei:
+                self.bei_datei(pfad, None, self._fehler[str(pfad)])
+            return None
+
+        # pdf=None: ein PDF aus einem früheren Lauf gehört zum alten Inhalt
+        self.fortschritt.markiere(str(pfad), hash=datei_hash, docx=str(docx_pfad), pdf=None)
+        if self.bei_datei:
+            self.bei_datei(pfad, docx_pfad, None)
+        return docx_pfad
+
+    def _konvertiere_pdfs(self, docx_pfade: dict[Path, Path]) -> None:
+        t = time.perf_counter()
+        try:
+            ergebnisse = PdfConverter().konvertiere_batch(
+                list(docx_pfade.values()), self.ausgabe_ordner
+            )
+        except RuntimeError as e:
+            for pfad in docx_pfade:
+                self._fehler[str(pfad)] = str(e)
+            return
+        self._messe("pdf_batch", t)
+
+        for pfad, docx_pfad in docx_pfade.items():
+            ergebnis = ergebnisse[docx_pfad]
+            if isinstance(ergebnis, Exception):
+                self._fehler[str(pfad)] = str(ergebnis)
+            else:
+                self.fortschritt.markiere(str(pfad), pdf=str(ergebnis))
+
+    async def _im_pool(self, loop, pool, lauf_id: str, funktion, *args):
+        """Führt funktion im Prozess-Pool aus und übernimmt die dort gemessenen Stufen."""
+        ergebnis, stufen = await loop.run_in_executor(pool, _mit_telemetrie, funktion, lauf_id, *args)
+        for eintrag in stufen:
+            # Eigener Name: "parse"/"render" oben messen die Wartezeit auf den Pool mit
+            self._dauern.setdefault(f"worker:{eintrag['stufe']}", []).append(eintrag["dauer_s"])
+        telemetrie.uebernimm(stufen)
+        return ergebnis
+
+    def _messe(self, stufe: str, start: float) -> None:
+        self._dauern.setdefault(stufe, []).append(time.perf_counter() - start)
+
+    def _zusammenfassung(self, gesamt: int, uebersprungen: int, dauer_s: float) -> dict:
+        verarbeitet = gesamt - uebersprungen - len(self._fehler)
+        stufen = {}
+        for stufe, werte in self._dauern.items():
+            sortiert = sorted(werte)
+            stufen[stufe] = {
+                "anzahl": len(werte),
+                "p50_s": round(statistics.median(sortiert), 3),
+                "p95_s": round(sortiert[min(len(sortiert) - 1, int(len(sortiert) * 0.95))], 3),
+                "max_s": round(sortiert[-1], 3),
+            }
+        return {
+            "dateien": gesamt,
+            "verarbeitet": verarbeitet,
+            "uebersprungen": uebersprungen,
+            "fehler": dict(self._fehler),
+            "dauer_s": round(dauer_s, 2),
+            "dateien_pro_minute": round(verarbeitet / dauer_s * 60, 1) if dauer_s else 0.0,
+            "stufen": stufen,
+        }
@@ -0,0 +1,168 @@
+"""
+Hintergrund-Aufträge
+
+Lange Schritte (Parsen, Extraktion, Tailoring, Rendern, PDF-Konvertierung)
+laufen in einem Worker-Pool statt im Streamlit-Skript-Thread. Die UI reicht
+einen Auftrag ein, bekommt eine Job-ID und fragt Status, Fortschritt und
+Ergebnis ab — ein Rerun durch einen Widget-Klick bricht die Arbeit nicht
+mehr ab, und mehrere Profile können gleichzeitig in der Warteschlange stehen.
+
+Threads statt Prozesse: Die Arbeit wartet überwiegend auf Claude bzw.
+LibreOffice, und Ergebnisse (Pydantic-Objekte, Bytes) sowie Telemetrie
+bleiben im Prozess. CPU-lastiges PDF-Parsen verteilt PdfParser selbst auf
+Prozesse. Jeder Auftrag ist ein eigener Telemetrie-Lauf (Lauf-ID = Job-ID)
+und läuft im Kontext des Einreichers (z.B. dessen Telemetrie-Einstellung).
+
+Verwendung:
+    queue = JobQueue(max_worker=4)
+    job_id = queue.einreichen("Extraktion", funktion, rohtext)   # funktion(job, rohtext)
+    job = queue.hole(job_id)
+    job.status, job.fortschritt, job.meldung, job.ergebnis, job.fehler
+
+Die Funktion bekommt den Job als erstes Argument und meldet darüber
+Fortschritt: job.melde(0.5, "Rendere Dokument...", vorschau=teilprofil).
+Sie darf nicht auf UI-Zustand (st.session_state) zugreifen; alles Nötige
+wird als Argument übergeben, das Ergebnis übernimmt die UI.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+import threading
+import time
+import uuid
+
+from src.telemetrie import telemetrie
+
+WARTEND = "wartend"
+LAEUFT = "läuft"
+FERTIG = "fertig"
+FEHLER = "fehler"
+ABGEBROCHEN = "abgebrochen"
+
+
+class Job:
+    def __init__(self, job_id: str, name: str):
+        self.id = job_id
+        self.name = name
+        self.status = WARTEND
+        self.fortschritt = 0.0
+        self.meldung = ""
+        # Zwischenstand für die Anzeige (z.B. Teilprofil beim Streaming)
+        self.vorschau = None
+        self.ergebnis = None
+        self.fehler: str | None = None
+        self.erstellt = time.time()
+        self.gestartet: float | None = None
+        self.beendet: float | None = None
+        self._future: Future | None = None
+
+    @property
+    def abgeschlossen(self) -> bool:
+        return self.status in (FERTIG, FEHLER, ABGEBROCHEN)
+
+    @property
+    def dauer_s(self) -> float:
+        if self.gestartet is None:
+            return 0.0
+        return (self.beendet or time.time()) - self.gestartet
+
+    def melde(self, fortschritt: float | None = None, meldung: str | None = None, vorschau=None) -> None:
+        """Fortschritt (0..1), Statustext und optional einen Zwischenstand melden."""
+        if fortschritt is not None:
+            self.fortschritt = min(1.0, max(0.0, fortschritt))
+        if meldung is not None:
+            self.meldung = meldung
+        if vorschau is not None:
+            self.vorschau = vorschau
+
+
+class JobQueue:
+    def __init__(self, max_worker: int = 4, max_jobs: int = 200):
+        """
+        Args:
+            max_worker: Gleichzeitig laufende Aufträge
+            max_jobs: Gehaltene Aufträge; darüber werden die ältesten
+                      abgeschlossenen (samt Ergebnis) verworfen
+        """
+        self.max_jobs = max_jobs
+        self._pool = ThreadPoolExecutor(max_workers=max_worker, thread_name_prefix="profil-job")
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def einreichen(self, name: str, funktion, *args, **kwargs) -> str:
+        """
+        Stellt einen Auftrag in die Warteschlange.
+
+        Args:
+            name: Anzeigename (z.B. "Extraktion: lebenslauf.pdf")
+            funktion: Wird als funktion(job, *args, **kwargs) im Worker ausgeführt;
+                      der Rückgabewert landet in job.ergebnis
+
+        Returns:
+            Job-ID
+        """
+        job = Job(uuid.uuid4().hex[:12], name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._begrenze()
+        kontext = contextvars.copy_context()
+        job._future = self._pool.submit(kontext.run, self._fuehre_aus, job, funktion, args, kwargs)
+        return job.id
+
+    def hole(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, job_ids: list[str] | None = None) -> list[Job]:
+        """Alle bzw. die genannten (noch vorhandenen) Aufträge, in Reihenfolge der IDs."""
+        with self._lock:
+            if job_ids is None:
+                return list(self._jobs.values())
+            return [self._jobs[i] for i in job_ids if i in self._jobs]
+
+    def abbrechen(self, job_id: str) -> bool:
+        """Bricht einen noch wartenden Auftrag ab (laufende werden zu Ende geführt)."""
+        job = self.hole(job_id)
+        if job is None or job._future is None or not job._future.cancel():
+            return False
+        job.status = ABGEBROCHEN
+        job.beendet = time.time()
+        return True
+
+    def entferne(self, job_id: str) -> None:
+        """Verwirft einen abgeschlossenen Auftrag samt Ergebnis."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.abgeschlossen:
+                del self._jobs[job_id]
+
+    def beende(self, warten: bool = True) -> None:
+        self._pool.shutdown(wait=warten, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Private Methoden
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _fuehre_aus(job: Job, funktion, args: tuple, kwargs: dict) -> None:
+        job.status = LAEUFT
+        job.gestartet = time.time()
+        try:
+            with telemetrie.lauf(job.id):
+                job.ergebnis = funktion(job, *args, **kwargs)
+            job.fortschritt = 1.0
+            job.status = FERTIG
+        except Exception as e:
+            job.fehler = str(e) or type(e).__name__
+            job.status = FEHLER
+        finally:
+            job.vorschau = None
+            job.beendet = time.time()
+
+    def _begrenze(self) -> None:
+        """Hält höchstens max_jobs Aufträge (nur abgeschlossene werden verworfen)."""
+        ueberzahl = len(self._jobs) - self.max_jobs
+        if ueberzahl <= 0:
+            return
+        for job_id in [i for i, j in self._jobs.items() if j.abgeschlossen][:ueberzahl]:
+            del self._jobs[job_id]
@@ -0,0 +1,123 @@
+"""
+Projekt-Fan-out
+
+Schneidet einen Kandidaten auf mehrere Projekte gleichzeitig zu und liefert
+alle Dokumente als ein ZIP:
+  ProfilTailoring.tailore_fuer_projekte → DocxGenerator (je Projekt)
+  → optional PdfConverter.konvertiere_batch (ein Aufruf für alle) → ZIP
+
+Die Claude-Anfragen laufen parallel und teilen sich das Profil-JSON über
+das Prompt-Caching; das Template wird nur einmal geladen (template_cache).
+"""
+
+from pathlib import Path
+import io
+import json
+import re
+import tempfile
+import zipfile
+
+from src.ai.tailoring import ProfilTailoring
+from src.generator.docx_generator import DocxGenerator
+from src.generator.pdf_converter import PdfConverter
+from src.models.profile import Kandidatenprofil, ProjektAnforderungen
+
+
+class ProjektFanout:
+    def __init__(
+        self,
+        template_pfad: str | Path,
+        tailoring: ProfilTailoring | None = None,
+        max_parallel: int = 5,
+        patch: bool = False,
+        mit_pdf: bool = False,
+    ):
+        """
+        Args:
+            template_pfad: DOCX-Template für alle Dokumente
+            tailoring: Eigene ProfilTailoring-Instanz
+            max_parallel: Gleichzeitige Claude-Anfragen
+            patch: Patch-Tailoring (nur Änderungslisten) statt vollständiger Profile
+            mit_pdf: Zusätzlich PDFs ins ZIP legen
+        """
+        self.generator = DocxGenerator(template_pfad)
+        self.tailoring = tailoring or ProfilTailoring()
+        self.max_parallel = max_parallel
+        self.patch = patch
+        self.mit_pdf = mit_pdf
+
+    def erstelle_zip(
+        self,
+        profil: Kandidatenprofil,
+        projekte: list[ProjektAnforderungen],
+    ) -> tuple[bytes, dict]:
+        """
+        Tailoring für alle Projekte, Rendern aller Dokumente, Verpacken als ZIP.
+
+        Args:
+            profil: Extrahiertes Kandidatenprofil
+            projekte: Projektanforderungen (Reihenfolge = Nummerierung im ZIP)
+
+        Returns:
+            (ZIP-Bytes, Bericht mit dateien, fehler pro Projekt und Token-Nutzung
+            dieses Aufrufs)
+        """
+        # nutzung() summiert über alle Anfragen der Instanz → Differenz bilden
+        nutzung_vorher = self.tailoring.nutzung()
+        ergebnisse = self.tailoring.tailore_fuer_projekte(
+            profil, projekte, self.max_parallel, self.patch
+        )
+
+        fehler: dict[str, str] = {}
+        dateien: list[str] = []
+        puffer = io.BytesIO()
+        with tempfile.TemporaryDirectory(prefix="profil_projekte_") as tmp, \
+                zipfile.ZipFile(puffer, "w", zipfile.ZIP_DEFLATED) as archiv:
+            docx_pfade: list[Path] = []
+            for nr, (projekt, ergebnis) in enumerate(zip(projekte, ergebnisse), start=1):
+                name = self._dateiname(nr, projekt, profil)
+                if isinstance(ergebnis, Exception):
+                    fehler[name] = f"{type(ergebnis).__name__}: {ergebnis}"
+                    continue
+                try:
+                    docx_pfade.append(self.generator.generiere(ergebnis, Path(tmp) / f"{name}.docx"))
+                except Exception as e:
+                    fehler[name] = f"{type(e).__name__}: {e}"
+
+            pdfs: dict[Path, Path | Exception] = {}
+            if self.mit_pdf and docx_pfade:
+                try:
+                    pdfs = PdfConverter().konvertiere_batch(docx_pfade, tmp)
+                except RuntimeError as e:
+                    fehler["pdf"] = str(e)
+
+            for docx_pfad in docx_pfade:
+                archiv.write(docx_pfad, docx_pfad.name)
+                dateien.append(docx_pfad.name)
+                pdf = pdfs.get(docx_pfad)
+                if isinstance(pdf, Path):
+                    archiv.write(pdf, pdf.name)
+                    dateien.append(pdf.name)
+                elif isinstance(pdf, Exception):
+                    fehler[docx_pfad.stem] = f"PDF: {pdf}"
+
+            bericht = {
+                "projekte": len(projekte),
+                "erfolgreich": len(docx_pfade),
+                "dateien": dateien,
+                "fehler": fehler,
+                "nutzung": {
+                    feld: wert - nutzung_vorher.get(feld, 0)
+                    for feld, wert in self.tailoring.nutzung().items()
+                },
+            }
+            if fehler:
+                archiv.writestr("fehler.json", json.dumps(fehler, ensure_ascii=False, indent=2))
+        return puffer.getvalue(), bericht
+
+    @staticmethod
+    def _dateiname(nr: int, projekt: ProjektAnforderungen, profil: Kandidatenprofil) -> str:
+        """z.B. 01_Max_Mustermann_Senior_Java_Developer"""
+        teile = [profil.vollname(), projekt.titel or f"Projekt {nr}"]
+        slug = re.sub(r"[^\w-]+", "_", " ".join(t for t in teile if t)).strip("_")
+        return f"{nr:02d}_{slug[:60]}"
@@ -0,0 +1,237 @@
+"""
+Telemetrie
+
+Leichtgewichtige Messung der Pipeline-Stufen (Parser, Claude, Generator,
+Konverter). Pro Stufe werden Laufzeit und Attribute erfasst, z.B.
+Token-Verbrauch, stop_reason, Dokumentgrößen oder die Konvertierungsmethode.
+
+Aktivierung: Umgebungsvariable PROFIL_TELEMETRIE=1 oder telemetrie.aktiviere()
+(prozessweit). telemetrie.aktiviere_im_kontext(True/False) überschreibt das
+nur für den aktuellen Kontext, z.B. eine Streamlit-Sitzung; JobQueue gibt
+den Kontext an ihre Aufträge weiter. Deaktiviert liefert stufe() einen
+geteilten No-Op-Kontext — der Overhead beschränkt sich auf eine
+Attribut- und eine ContextVar-Abfrage.
+
+Export: als_jsonl() (ein Eintrag pro Stufe) und als_prometheus() (Textformat).
+
+Verwendung:
+    with telemetrie.lauf():
+        with telemetrie.stufe("render", template="vorlage.docx") as stufe:
+            ...
+            stufe.setze(ausgabe_bytes=len(daten))
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+
+_aktueller_lauf: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "profil_lauf", default=None
+)
+# Einstellung für den aktuellen Kontext; None = prozessweite Einstellung
+_kontext_aktiv: contextvars.ContextVar[bool | None] = contextvars.ContextVar(
+    "profil_telemetrie_aktiv", default=None
+)
+
+
+class _Stufe:
+    __slots__ = ("_telemetrie", "name", "lauf_id", "zeitpunkt", "_start", "dauer_s", "attribute")
+
+    def __init__(self, telemetrie: "Telemetrie", name: str, attribute: dict):
+        self._telemetrie = telemetrie
+        self.name = name
+        self.lauf_id = _aktueller_lauf.get()
+        self.attribute = attribute
+        self.dauer_s = 0.0
+
+    def setze(self, **attribute) -> None:
+        self.attribute.update(attribute)
+
+    def __enter__(self) -> "_Stufe":
+        self.zeitpunkt = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, typ, wert, tb) -> bool:
+        self.dauer_s = time.perf_counter() - self._start
+        if typ is not None:
+            self.attribute["fehler"] = typ.__name__
+        self._telemetrie._erfasse(self)
+        return False
+
+
+class _KeineStufe:
+    """No-Op-Ersatz, wenn die Telemetrie deaktiviert ist."""
+    __slots__ = ()
+
+    def setze(self, **attribute) -> None:
+        pass
+
+    def __enter__(self) -> "_KeineStufe":
+        return self
+
+    def __exit__(self, typ, wert, tb) -> bool:
+        return False
+
+
+_KEINE_STUFE = _KeineStufe()
+
+
+class Telemetrie:
+    def __init__(self, max_eintraege: int = 10_000):
+        """
+        Args:
+            max_eintraege: Anzahl der zuletzt erfassten Stufen, die gehalten werden.
+                           Die Prometheus-Zähler laufen unabhängig davon weiter.
+        """
+        # Prozessweite Einstellung (Umgebungsvariable bzw. aktiviere())
+        self.standard_aktiv = os.environ.get("PROFIL_TELEMETRIE", "") not in ("", "0", "false")
+        self._eintraege: deque[dict] = deque(maxlen=max_eintraege)
+        self._summen: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def aktiv(self) -> bool:
+        """Ob im aktuellen Kontext erfasst wird."""
+        wert = _kontext_aktiv.get()
+        return self.standard_aktiv if wert is None else wert
+
+    def aktiviere(self) -> None:
+        self.standard_aktiv = True
+
+    def deaktiviere(self) -> None:
+        self.standard_aktiv = False
+
+    def aktiviere_im_kontext(self, aktiv: bool) -> None:
+        """
+        Schaltet die Erfassung nur für den aktuellen Kontext (Thread bzw.
+        Streamlit-Lauf) und daraus eingereichte Aufträge — andere Sitzungen
+        und die prozessweite Einstellung bleiben unberührt.
+        """
+        _kontext_aktiv.set(aktiv)
+
+    def stufe(self, name: str, **attribute):
+        """Kontextmanager, der Laufzeit und Attribute einer Stufe erfasst."""
+        if not self.aktiv:
+            return _KEINE_STUFE
+        return _Stufe(self, name, attribute)
+
+    @contextmanager
+    def lauf(self, lauf_id: str | None = None):
+        """Fasst alle Stufen innerhalb des Blocks zu einem Pipeline-Lauf zusammen."""
+        lauf_id = lauf_id or uuid.uuid4().hex[:12]
+        token = _aktueller_lauf.set(lauf_id)
+        try:
+            yield lauf_id
+        finally:
+            _aktueller_lauf.reset(token)
+
+    def eintraege(self, lauf_id: str | None = None) -> list[dict]:
+        with self._lock:
+            eintraege = list(self._eintraege)
+        if lauf_id is not None:
+            eintraege = [e for e in eintraege if e["lauf"] == lauf_id]
+        return eintraege
+
+    def uebernimm(self, eintraege: list[dict]) -> None:
+        """
+        Erfasst Stufen, die in einem anderen Prozess gemessen wurden
+        (z.B. von Prozess-Pool-Workern, siehe BatchVerarbeitung).
+        """
+        if not self.aktiv:
+            return
+        for eintrag in eintraege:
+            self._verbuche(dict(eintrag))
+
+    def leeren(self) -> None:
+        with self._lock:
+            self._eintraege.clear()
+            self._summen.clear()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def als_jsonl(self, lauf_id: str | None = None) -> str:
+        return "".join(
+            json.dumps(e, ensure_ascii=False, default=str) + "\n"
+            for e in self.eintraege(lauf_id)
+        )
+
+    def als_prometheus(self) -> str:
+        with self._lock:
+            summen = dict(self._summen)
+
+        metriken = {
+            "profil_stufe_dauer_sekunden": ("summary", "Laufzeit pro Pipeline-Stufe"),
+            "profil_tokens_total": ("counter", "Claude-Tokens pro Stufe und Art"),
+            "profil_dokument_bytes_total": ("counter", "Verarbeitete Dokumentgröße in Bytes"),
+            "profil_stop_reason_total": ("counter", "Claude-Antworten nach stop_reason"),
+            "profil_konvertierungen_total": ("counter", "PDF-Konvertierungen nach Methode"),
+            "profil_json_reparaturen_total": ("counter", "Reparierte Claude-Antworten nach Reparatur"),
+            "profil_fortsetzungen_total": ("counter", "Nachgeforderte Antwortreste bei max_tokens"),
+            "profil_verschwendete_tokens_total": ("counter", "Ausgabe-Tokens unbrauchbarer Antworten"),
+        }
+        zeilen = []
+        for metrik, (typ, hilfe) in metriken.items():
+            passende = sorted(
+                (schluessel, wert) for schluessel, wert in summen.items() if schluessel[0] == metrik
+            )
+            if not passende:
+                continue
+            zeilen.append(f"# HELP {metrik} {hilfe}")
+            zeilen.append(f"# TYPE {metrik} {typ}")
+            for (_, suffix, labels), wert in passende:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                zeilen.append(f"{metrik}{suffix}{{{label_text}}} {wert:g}")
+        return "\n".join(zeilen) + "\n"
+
+    # ------------------------------------------------------------------
+    # Private Methoden
+    # ------------------------------------------------------------------
+
+    def _erfasse(self, stufe: _Stufe) -> None:
+        self._verbuche({
+            "lauf": stufe.lauf_id,
+            "stufe": stufe.name,
+            "zeitpunkt": stufe.zeitpunkt,
+            "dauer_s": round(stufe.dauer_s, 6),
+            **stufe.attribute,
+        })
+
+    def _verbuche(self, eintrag: dict) -> None:
+        a = eintrag
+        name = (("stufe", eintrag["stufe"]),)
+        with self._lock:
+            self._eintraege.append(eintrag)
+            self._addiere("profil_stufe_dauer_sekunden", "_sum", name, eintrag["dauer_s"])
+            self._addiere("profil_stufe_dauer_sekunden", "_count", name, 1)
+            for art in ("input_tokens", "output_tokens", "cache_read_input_tokens", "cache_creation_input_tokens"):
+                if a.get(art):
+                    self._addiere("profil_tokens_total", "", name + (("art", art),), a[art])
+            for groesse in ("eingabe_bytes", "ausgabe_bytes"):
+                if a.get(groesse):
+                    self._addiere("profil_dokument_bytes_total", "", name + (("richtung", groesse),), a[groesse])
+            if a.get("stop_reason"):
+                self._addiere("profil_stop_reason_total", "", name + (("stop_reason", a["stop_reason"]),), 1)
+            for reparatur in a.get("reparaturen") or ():
+                self._addiere("profil_json_reparaturen_total", "", name + (("art", reparatur),), 1)
+            if a.get("fortsetzungen"):
+                self._addiere("profil_fortsetzungen_total", "", name, a["fortsetzungen"])
+            if a.get("verschwendete_tokens"):
+                self._addiere("profil_verschwendete_tokens_total", "", name, a["verschwendete_tokens"])
+            if a.get("methode"):
+                self._addiere("profil_konvertierungen_total", "", (("methode", a["methode"]),), a.get("dateien", 1))
+
+    def _addiere(self, metrik: str, suffix: str, labels: tuple, wert: float) -> None:
+        schluessel = (metrik, suffix, labels)
+        self._summen[schluessel] = self._summen.get(schluessel, 0) + wert
+
+
+# Prozessweite Instanz
+telemetrie = Telemetrie()